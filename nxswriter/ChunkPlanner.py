@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Planner of chunk shapes for created H5 fields """
+
+import numpy
+
+from .Types import nptype
+
+
+class ChunkPlanner(object):
+
+    """ planner of chunk shapes
+    """
+
+    def __init__(self, chunkbytes=None, maxsteps=None, framedim=None):
+        """ constructor
+
+        :param chunkbytes: target chunk size in bytes
+        :type chunkbytes: :obj:`int`
+        :param maxsteps: maximal number of steps in one chunk
+        :type maxsteps: :obj:`int`
+        :param framedim: chunk length of dimensions with unknown size
+        :type framedim: :obj:`int`
+        """
+        #: (:obj:`int`) target chunk size in bytes
+        self.chunkbytes = chunkbytes or 512 * 1024
+        #: (:obj:`int`) maximal number of steps in one chunk
+        self.maxsteps = maxsteps or 1024
+        #: (:obj:`int`) chunk length of dimensions with unknown size
+        self.framedim = framedim or 256
+
+    @classmethod
+    def itemsize(cls, dtype):
+        """ provides size of one item in bytes
+
+        :param dtype: nexus or numpy type of the field
+        :type dtype: :obj:`str`
+        :returns: item size, variable length strings take 16 bytes
+        :rtype: :obj:`int`
+        """
+        try:
+            size = numpy.dtype(nptype(dtype)).itemsize
+        except Exception:
+            size = 0
+        return size if size > 0 else 16
+
+    def plan(self, shape, dtype, grows=None, nsteps=0, chunks=None):
+        """ provides chunk shape of the field
+
+        :brief: The frame, i.e. the dimensions without the growing one,
+                is split by halving its longest dimension until it fits
+                into the target chunk size. The growing dimension gets
+                as many steps as fit into the rest of the target size
+                but not more than the expected number of steps.
+        :param shape: field shape with 0 for growing or unknown dimensions
+        :type shape: :obj:`list` <:obj:`int`>
+        :param dtype: nexus or numpy type of the field
+        :type dtype: :obj:`str`
+        :param grows: growing dimension counted from 1, None if not growing
+        :type grows: :obj:`int`
+        :param nsteps: expected number of steps, 0 if not known
+        :type nsteps: :obj:`int`
+        :param chunks: requested chunk shape, its 0 items are planned
+        :type chunks: :obj:`list` <:obj:`int`>
+        :returns: chunk shape
+        :rtype: :obj:`list` <:obj:`int`>
+        """
+        if not shape:
+            return []
+        gdim = grows - 1 if grows and grows <= len(shape) else None
+        chunk = [(s if s > 0 else self.framedim) for s in shape]
+        fixed = [False] * len(shape)
+        if chunks and len(chunks) == len(shape):
+            for i, ch in enumerate(chunks):
+                if ch > 0:
+                    chunk[i] = ch
+                    fixed[i] = True
+
+        frame = [i for i in range(len(shape)) if i != gdim]
+        fbytes = self.itemsize(dtype)
+        for i in frame:
+            fbytes *= chunk[i]
+        while fbytes > self.chunkbytes:
+            free = [i for i in frame if not fixed[i] and chunk[i] > 1]
+            if not free:
+                break
+            longest = max(free, key=lambda i: chunk[i])
+            fbytes = fbytes // chunk[longest]
+            chunk[longest] = (chunk[longest] + 1) // 2
+            fbytes *= chunk[longest]
+
+        if gdim is not None and not fixed[gdim]:
+            steps = min(max(self.chunkbytes // max(fbytes, 1), 1),
+                        self.maxsteps)
+            if nsteps and nsteps > 0:
+                steps = min(steps, nsteps)
+            chunk[gdim] = steps
+        return chunk
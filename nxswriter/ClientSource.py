@@ -47,6 +47,8 @@ class ClientSource(DataSource):
         #: (:obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>)
         #: the current dynamic JSON object
         self.__localJSON = None
+        #: (:class:`nxswriter.DataSourcePool.DataSourcePool`) datasource pool
+        self.__pool = None
 
     def setup(self, xml):
         """ sets the parrameters up from xml
@@ -93,6 +95,23 @@ class ClientSource(DataSource):
         self.__globalJSON = globalJSON
         self.__localJSON = localJSON
 
+    def setDataSources(self, pool):
+        """ sets the datasources
+
+        :param pool: datasource pool
+        :type pool: :class:`nxswriter.DataSourcePool.DataSourcePool`
+        """
+        self.__pool = pool
+
+    def usesJSONContext(self):
+        """ checks if the datasource reads JSON objects
+            from the JSON context of its datasource pool
+
+        :returns: True if JSON objects do not need to be set by setJSON
+        :rtype: :obj:`bool`
+        """
+        return hasattr(self.__pool, "jsoncontext")
+
     def getData(self):
         """ provides access to the data
 
@@ -104,4 +123,30 @@ class ClientSource(DataSource):
         names = [self.name]
         if self.name:
             names.append(self.name.lower())
+        context = getattr(self.__pool, "jsoncontext", None)
+        if context is not None:
+            return self._getJSONData(
+                names, context.globalJSON, context.localJSON)
         return self._getJSONData(names, self.__globalJSON, self.__localJSON)
+
+    def getBatchData(self, globalJSON, localJSONs):
+        """ provides access to the data of many steps
+
+        :param globalJSON: static JSON string
+        :type globalJSON: :obj:`dict` \
+        :                 <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        :param localJSONs: dynamic JSON strings of the steps
+        :type localJSONs: :obj:`list` <:obj:`dict` \
+                          <:obj:`str`, :obj:`dict` <:obj:`str`, any>>>
+        :returns: list of dictionaries with collected data
+        :rtype: :obj:`list` <{'rank': :obj:`str`, 'value': any, \
+        :        'tangoDType': :obj:`str`, 'shape': :obj:`list` <int>, \
+        :        'encoding': :obj:`str`, 'decoders': :obj:`str`}>
+        """
+        names = [self.name]
+        if self.name:
+            names.append(self.name.lower())
+        self.__globalJSON = globalJSON
+        self.__localJSON = localJSONs[-1] if localJSONs else None
+        return [self._getJSONData(names, globalJSON, localJSON)
+                for localJSON in localJSONs]
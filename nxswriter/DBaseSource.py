@@ -22,6 +22,10 @@
 import xml.etree.ElementTree as et
 from lxml.etree import XMLParser
 import sys
+import time
+import threading
+
+import numpy
 
 from .Types import NTP
 
@@ -61,11 +65,286 @@ except ImportError:
     # sys.stdout.flush()
 
 
+class DBConnectionPool(object):
+
+    """ pool of open database connections shared by DB datasources
+    """
+
+    #: (:obj:`dict` <:obj:`str`, :obj:`str`>) queries validating
+    #:    connections with respect to database types
+    validationQueries = {"ORACLE": "SELECT 1 FROM DUAL"}
+
+    def __init__(self, maxidle=4, validatetime=10.):
+        """ constructor
+
+        :param maxidle: maximal number of idle connections of one database
+        :type maxidle: :obj:`int`
+        :param validatetime: time in seconds after which idle connections
+                             are validated before their use
+        :type validatetime: :obj:`float`
+        """
+        #: (:obj:`int`) maximal number of idle connections of one database
+        self.maxidle = maxidle
+        #: (:obj:`float`) time in seconds after which idle connections
+        #:     are validated before their use
+        self.validatetime = validatetime
+        #: (:obj:`int`) number of opened connections
+        self.opened = 0
+        #: (:obj:`int`) number of reused connections
+        self.reused = 0
+        #: (:obj:`dict` <:obj:`tuple`, :obj:`list` <:obj:`tuple`>>) \
+        #:     idle connections with their release time
+        self.__idle = {}
+        #: (:class:`threading.Lock`) threading lock
+        self.__lock = threading.Lock()
+
+    def acquire(self, key, connect):
+        """ provides an open connection
+
+        :param key: database key, i.e. (dbtype, host, port, dbname,
+                    user, dsn)
+        :type key: :obj:`tuple` <:obj:`str`>
+        :param connect: function opening a new connection
+        :type connect: :obj:`callable`
+        :returns: open database connection
+        :rtype: :obj:`any`
+        """
+        while True:
+            with self.__lock:
+                idle = self.__idle.get(key)
+                if not idle:
+                    break
+                db, released = idle.pop()
+            if time.time() - released < self.validatetime \
+                    or self.__validate(key, db):
+                with self.__lock:
+                    self.reused += 1
+                return db
+            self.__close(db)
+        db = connect()
+        with self.__lock:
+            self.opened += 1
+        return db
+
+    def release(self, key, db):
+        """ returns the connection into the pool
+
+        :brief: The current transaction is finished, so the next query
+                sees the current state of the database
+        :param key: database key, i.e. (dbtype, host, port, dbname,
+                    user, dsn)
+        :type key: :obj:`tuple` <:obj:`str`>
+        :param db: open database connection
+        :type db: :obj:`any`
+        """
+        try:
+            if hasattr(db, "rollback"):
+                db.rollback()
+        except Exception:
+            self.__close(db)
+            return
+        with self.__lock:
+            idle = self.__idle.setdefault(key, [])
+            if len(idle) < self.maxidle:
+                idle.append((db, time.time()))
+                db = None
+        if db is not None:
+            self.__close(db)
+
+    def discard(self, db):
+        """ closes the connection which failed
+
+        :param db: database connection
+        :type db: :obj:`any`
+        """
+        self.__close(db)
+
+    def close(self):
+        """ closes all idle connections
+        """
+        with self.__lock:
+            idle = self.__idle
+            self.__idle = {}
+        for connections in idle.values():
+            for db, _ in connections:
+                self.__close(db)
+
+    def __len__(self):
+        """ provides the number of idle connections
+
+        :returns: number of idle connections
+        :rtype: :obj:`int`
+        """
+        with self.__lock:
+            return sum(len(idle) for idle in self.__idle.values())
+
+    def __validate(self, key, db):
+        """ checks if the idle connection still works
+
+        :param key: database key, i.e. (dbtype, host, port, dbname,
+                    user, dsn)
+        :type key: :obj:`tuple` <:obj:`str`>
+        :param db: database connection
+        :type db: :obj:`any`
+        :returns: True if the connection works
+        :rtype: :obj:`bool`
+        """
+        try:
+            cursor = db.cursor()
+            try:
+                cursor.execute(
+                    self.validationQueries.get(key[0], "SELECT 1"))
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            if hasattr(db, "rollback"):
+                db.rollback()
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def __close(cls, db):
+        """ closes the connection ignoring errors
+
+        :param db: database connection
+        :type db: :obj:`any`
+        """
+        try:
+            db.close()
+        except Exception:
+            pass
+
+
+class DBQueryResult(object):
+
+    """ result of the query shared by DB datasources of one pool run
+    """
+
+    def __init__(self):
+        """ constructor
+        """
+        #: (:class:`threading.Event`) set when the query is finished
+        self.done = threading.Event()
+        #: (:obj:`dict` <:obj:`str`, any>) collected data
+        self.data = None
+        #: (:obj:`Exception`) error of the query
+        self.error = None
+
+
+class DBQueryCache(object):
+
+    """ cache of query results shared by DB datasources
+
+    :brief: Identical queries of one INIT, STEP or FINAL pool run are
+            executed only once. If ttl is positive results of INIT and
+            FINAL queries are also reused by the following entries
+            until they are older than ttl
+    """
+
+    def __init__(self, ttl=0.):
+        """ constructor
+
+        :param ttl: time in seconds of reusing INIT and FINAL results
+                    in the following entries, not reused if 0
+        :type ttl: :obj:`float`
+        """
+        #: (:obj:`float`) time in seconds of reusing INIT and FINAL
+        #:    results in the following entries, not reused if 0
+        self.ttl = ttl
+        #: (:obj:`int`) number of executed queries
+        self.executed = 0
+        #: (:obj:`int`) number of reused results
+        self.reused = 0
+        #: (:obj:`dict` <:obj:`tuple`, :class:`DBQueryResult`>) \
+        #:     results of the current pool run
+        self.__results = {}
+        #: (:obj:`dict` <:obj:`tuple`, :obj:`tuple`>) \
+        #:     INIT and FINAL results with their time
+        self.__stored = {}
+        #: (:class:`threading.Lock`) threading lock
+        self.__lock = threading.Lock()
+
+    def start(self):
+        """ starts a new pool run
+        """
+        with self.__lock:
+            self.__results = {}
+
+    def clear(self):
+        """ removes all results
+        """
+        with self.__lock:
+            self.__results = {}
+            self.__stored = {}
+
+    def fetch(self, key, query, counter=0):
+        """ provides the query result
+
+        :param key: query key, i.e. (connection key, query, format)
+        :type key: :obj:`tuple`
+        :param query: function executing the query
+        :type query: :obj:`callable`
+        :param counter: step counter, i.e. -1 for INIT, -2 for FINAL
+        :type counter: :obj:`int`
+        :returns: dictionary with collected data
+        :rtype: :obj:`dict` <:obj:`str`, any>
+        """
+        stored = self.ttl > 0 and counter < 0
+        with self.__lock:
+            result = self.__results.get(key)
+            owner = result is None
+            if owner and stored and (counter, key) in self.__stored:
+                rtime, data = self.__stored[(counter, key)]
+                if time.time() - rtime < self.ttl:
+                    self.reused += 1
+                    return dict(data)
+                self.__stored.pop((counter, key))
+            if owner:
+                result = DBQueryResult()
+                self.__results[key] = result
+                self.executed += 1
+            else:
+                self.reused += 1
+        if not owner:
+            result.done.wait()
+            if result.error is not None:
+                raise result.error
+            return dict(result.data)
+        try:
+            result.data = query()
+        except Exception as e:
+            result.error = e
+            with self.__lock:
+                if self.__results.get(key) is result:
+                    self.__results.pop(key)
+            raise
+        finally:
+            result.done.set()
+        if stored:
+            with self.__lock:
+                self.__stored[(counter, key)] = (time.time(), result.data)
+        return dict(result.data)
+
+
 class DBaseSource(DataSource):
 
     """ DataBase data source
     """
 
+    #: (:obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`any`, :obj:`str`>>) \
+    #:     numpy types of cursor description type codes
+    #:     with respect to database types
+    numpyTypes = {
+        "MYSQL": {1: "int64", 2: "int64", 3: "int64", 4: "float64",
+                  5: "float64", 8: "int64", 9: "int64", 13: "int64"},
+        "PGSQL": {20: "int64", 21: "int64", 23: "int64", 700: "float64",
+                  701: "float64"},
+    }
+
+    #: (:obj:`int`) number of rows fetched at once into numpy arrays
+    fetchsize = 1024
+
     def __init__(self, streams=None):
         """ constructor
 
@@ -96,6 +375,8 @@ class DBaseSource(DataSource):
         self.mycnf = '/etc/my.cnf'
         #: (:obj:`str`) record format, i.e. `SCALAR`, `SPECTRUM`, `IMAGE`
         self.format = None
+        #: (:class:`nxswriter.DataSourcePool.DataSourcePool`) datasource pool
+        self.__pool = None
 
         #: (:obj:`dict` <:obj:`str`, :obj:`instancemethod`>) map
         self.__dbConnect = {"MYSQL": self.__connectMYSQL,
@@ -222,18 +503,57 @@ class DBaseSource(DataSource):
 
         return cx_Oracle.connect(**args)
 
+    def setDataSources(self, pool):
+        """ sets the datasources
+
+        :param pool: datasource pool
+        :type pool: :class:`nxswriter.DataSourcePool.DataSourcePool`
+        """
+        self.__pool = pool
+
+    def __getKey(self):
+        """ provides the key of the database connection
+
+        :returns: (dbtype, hostname, port, dbname, user, dsn)
+        :rtype: :obj:`tuple` <:obj:`str`>
+        """
+        return (self.dbtype, self.hostname, self.port, self.dbname,
+                self.user, self.dsn)
+
     def getData(self):
         """ provides access to the data
 
+        :brief: Results of identical queries are shared by
+                the query cache of the datasource pool if it is set
+        :returns: dictionary with collected data
+        :rtype: :obj:`dict` <:obj:`str`, any>
+        """
+        queries = getattr(self.__pool, "dbqueries", None)
+        if queries is None:
+            return self.__query()
+        return queries.fetch(
+            (self.__getKey(), self.query, self.format), self.__query,
+            getattr(self.__pool, "counter", 0))
+
+    def __query(self):
+        """ executes the query
+
+        :brief: Connections are taken from the connection pool
+                of the datasource pool if it is set
         :returns: dictionary with collected data
         :rtype: :obj:`dict` <:obj:`str`, any>
         """
 
         db = None
+        connections = getattr(self.__pool, "dbconnections", None)
 
         if self.dbtype in self.__dbConnect.keys() \
                 and self.dbtype in DB_AVAILABLE:
-            db = self.__dbConnect[self.dbtype]()
+            if connections is not None:
+                db = connections.acquire(
+                    self.__getKey(), self.__dbConnect[self.dbtype])
+            else:
+                db = self.__dbConnect[self.dbtype]()
         else:
             if self._streams:
                 self._streams.error(
@@ -245,7 +565,30 @@ class DBaseSource(DataSource):
                 "Support for %s database not available" % self.dbtype)
 
         if db:
-            cursor = db.cursor()
+            try:
+                dh = self.__fetch(db)
+            except Exception:
+                if connections is not None:
+                    connections.discard(db)
+                else:
+                    db.close()
+                raise
+            if connections is not None:
+                connections.release(self.__getKey(), db)
+            else:
+                db.close()
+        return dh
+
+    def __fetch(self, db):
+        """ runs the query
+
+        :param db: open database connection
+        :type db: :obj:`any`
+        :returns: dictionary with collected data
+        :rtype: :obj:`dict` <:obj:`str`, any>
+        """
+        cursor = db.cursor()
+        try:
             cursor.execute(self.query)
             if not self.format or self.format == 'SCALAR':
                 #  data = copy.deepcopy(cursor.fetchone())
@@ -255,24 +598,97 @@ class DBaseSource(DataSource):
                       "tangoDType": (NTP.pTt[type(data[0]).__name__]),
                       "shape": [1, 0]}
             elif self.format == 'SPECTRUM':
-                data = cursor.fetchall()
-                # data = copy.deepcopy(cursor.fetchall())
-                if len(data[0]) == 1:
-                    ldata = list(el[0] for el in data)
+                dtype = self.__numpyType(cursor, True)
+                data = self.__fetchArray(cursor, dtype) \
+                    if dtype else cursor.fetchall()
+                if isinstance(data, numpy.ndarray):
+                    ldata = data.reshape(len(data))
+                    dtype = ldata.dtype.name
                 else:
-                    ldata = list(el for el in data[0])
+                    # data = copy.deepcopy(cursor.fetchall())
+                    if len(data[0]) == 1:
+                        ldata = list(el[0] for el in data)
+                    else:
+                        ldata = list(el for el in data[0])
+                    dtype = type(ldata[0]).__name__
                 dh = {"rank": "SPECTRUM",
                       "value": ldata,
-                      "tangoDType": (NTP.pTt[type(ldata[0]).__name__]),
+                      "tangoDType": (NTP.pTt[dtype]),
                       "shape": [len(ldata), 0]}
             else:
-                data = cursor.fetchall()
-                # data = copy.deepcopy(cursor.fetchall())
-                ldata = list(list(el) for el in data)
+                dtype = self.__numpyType(cursor)
+                data = self.__fetchArray(cursor, dtype) \
+                    if dtype else cursor.fetchall()
+                if isinstance(data, numpy.ndarray):
+                    ldata = data
+                    dtype = data.dtype.name
+                else:
+                    # data = copy.deepcopy(cursor.fetchall())
+                    ldata = list(list(el) for el in data)
+                    dtype = type(ldata[0][0]).__name__
                 dh = {"rank": "IMAGE",
                       "value": ldata,
-                      "tangoDType": NTP.pTt[type(ldata[0][0]).__name__],
+                      "tangoDType": NTP.pTt[dtype],
                       "shape": [len(ldata), len(ldata[0])]}
+        finally:
             cursor.close()
-            db.close()
         return dh
+
+    def __numpyType(self, cursor, column=False):
+        """ provides numpy type of the query result
+
+        :param cursor: cursor with the executed query
+        :type cursor: :obj:`any`
+        :param column: if True the result has to have only one column
+        :type column: :obj:`bool`
+        :returns: numpy type common to all columns or None if a column type
+                  is not known
+        :rtype: :class:`numpy.dtype`
+        """
+        codes = self.numpyTypes.get(self.dbtype)
+        description = getattr(cursor, "description", None)
+        if not codes or not description \
+                or (column and len(description) != 1):
+            return None
+        try:
+            return numpy.result_type(
+                *[codes[desc[1]] for desc in description])
+        except (KeyError, TypeError):
+            return None
+
+    def __fetchArray(self, cursor, dtype):
+        """ fetches rows of the query result into the numpy array
+
+        :brief: The rows are fetched by parts of fetchsize rows.
+                If the rows do not fit into the numpy type, e.g. because
+                of NULL values, all rows are returned as a list
+        :param cursor: cursor with the executed query
+        :type cursor: :obj:`any`
+        :param dtype: numpy type
+        :type dtype: :class:`numpy.dtype`
+        :returns: array with fetched rows or list of rows
+        :rtype: :class:`numpy.ndarray` or :obj:`list`
+        """
+        ncols = len(cursor.description)
+        rowcount = getattr(cursor, "rowcount", -1)
+        size = rowcount if rowcount and rowcount > 0 else self.fetchsize
+        array = numpy.empty((size, ncols), dtype=dtype)
+        nrows = 0
+        rows = cursor.fetchmany(self.fetchsize)
+        while rows:
+            end = nrows + len(rows)
+            if end > len(array):
+                larger = numpy.empty(
+                    (max(end, 2 * len(array)), ncols), dtype=dtype)
+                larger[:nrows] = array[:nrows]
+                array = larger
+            try:
+                array[nrows:end] = rows
+            except (TypeError, ValueError, OverflowError):
+                return array[:nrows].tolist() + list(rows) \
+                    + list(cursor.fetchall())
+            nrows = end
+            rows = cursor.fetchmany(self.fetchsize)
+        if not nrows:
+            return []
+        return array[:nrows]
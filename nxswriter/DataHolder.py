@@ -21,6 +21,7 @@
 
 import numpy
 import sys
+import threading
 
 from .Types import NTP, nptype
 
@@ -36,6 +37,14 @@ class DataHolder(object):
     """ Holder for passing data
     """
 
+    #: (:obj:`bool`) debug switch for counting arrays allocated by cast
+    debugCopies = False
+    #: (:obj:`dict` <:obj:`str`, :obj:`int`>) debug counters of casts,
+    #:     arrays allocated by cast and their bytes
+    copyCounter = {"casts": 0, "copies": 0, "bytes": 0}
+    #: (:class:`threading.Lock`) lock of debug counters
+    __counterLock = threading.Lock()
+
     def __init__(self, rank, value, tangoDType, shape,
                  encoding=None, decoders=None, streams=None):
         """ constructor
@@ -121,15 +130,51 @@ class DataHolder(object):
 
             raise ValueError("Encoding or Shape not defined")
 
+    @classmethod
+    def resetCopyCounter(cls):
+        """ resets the debug counters of cast
+
+        :returns: counters before the reset
+        :rtype: :obj:`dict` <:obj:`str`, :obj:`int`>
+        """
+        with cls.__counterLock:
+            counter = dict(cls.copyCounter)
+            cls.copyCounter = {"casts": 0, "copies": 0, "bytes": 0}
+        return counter
+
     def cast(self, dtype):
         """ casts the data into given type
 
+        :brief: NumPy arrays are returned without copying if they have
+                the required type, possibly with another byte order,
+                and converted by one vectorized operation otherwise
         :param dtype: given type of data
         :type dtype: :obj:`str`
         :returns: numpy array of defined type or list
                   for strings or value for SCALAR
         :rtype: :class:`numpy.ndarray`
 
+        """
+        value = self.__cast(dtype)
+        if self.debugCopies:
+            copied = isinstance(value, numpy.ndarray) and not (
+                isinstance(self.value, numpy.ndarray) and
+                numpy.may_share_memory(value, self.value))
+            with self.__counterLock:
+                self.copyCounter["casts"] += 1
+                if copied:
+                    self.copyCounter["copies"] += 1
+                    self.copyCounter["bytes"] += value.nbytes
+        return value
+
+    def __cast(self, dtype):
+        """ casts the data into given type
+
+        :param dtype: given type of data
+        :type dtype: :obj:`str`
+        :returns: numpy array of defined type or list
+                  for strings or value for SCALAR
+        :rtype: :class:`numpy.ndarray`
         """
         if str(self.format).split('.')[-1] == "SCALAR":
             if dtype in NTP.pTt.keys() \
@@ -147,15 +192,20 @@ class DataHolder(object):
                     return NTP.convert[dtype](self.value)
 
         else:
+            if isinstance(self.value, numpy.ndarray) \
+                    and self.value.dtype.kind != 'O':
+                return self.__castArray(self.value, dtype)
             if dtype in NTP.pTt.keys() \
                     and NTP.pTt[dtype] == str(self.tangoDType) \
                     and (dtype not in ['str', 'string', 'bytes']):
-                if type(self.value).__name__ == 'ndarray' and \
-                        self.value.dtype.name == dtype:
-                    return self.value
-                else:
-                    return numpy.array(self.value, dtype=dtype)
+                return numpy.array(self.value, dtype=dtype)
             elif dtype == "bool":
+                try:
+                    value = numpy.asarray(self.value)
+                except Exception:
+                    value = None
+                if value is not None and value.dtype.kind in 'biuf':
+                    return value.astype(dtype)
                 return numpy.array(
                     NTP().createArray(self.value, NTP.convert[dtype]),
                     dtype=dtype)
@@ -166,3 +216,32 @@ class DataHolder(object):
                     return numpy.array(
                         NTP().createArray(self.value, NTP.convert[dtype]),
                         dtype=nptype(dtype))
+
+    @classmethod
+    def __castArray(cls, value, dtype):
+        """ casts the numpy array into given type without needless copies
+
+        :param value: numpy array
+        :type value: :class:`numpy.ndarray`
+        :param dtype: given type of data
+        :type dtype: :obj:`str`
+        :returns: numpy array of defined type
+        :rtype: :class:`numpy.ndarray`
+        """
+        if value.dtype.name == nptype(dtype) or (
+                dtype in ['str', 'string', 'bytes'] and
+                value.dtype.kind == 'U'):
+            return value
+        if dtype == "bool" and value.dtype.kind in 'SU':
+            if value.dtype.kind == 'S' and sys.version_info > (3,):
+                return value != b''
+            lvalue = numpy.char.lower(numpy.char.strip(value))
+            if lvalue.dtype.kind == 'S':
+                return (lvalue != b'false') & (lvalue != b'0')
+            return (lvalue != 'false') & (lvalue != '0')
+        try:
+            return value.astype(nptype(dtype), copy=False)
+        except Exception:
+            return numpy.array(
+                NTP().createArray(value, NTP.convert[dtype]),
+                dtype=nptype(dtype))
@@ -95,6 +95,9 @@ class DataSourceFactory(Element):
         """
         self.__createDSource(self._tagAttrs)
         jxml = "".join(xml)
+        if hasattr(self.last.source, "deferred") \
+                and getattr(self.__dsPool, "deferproxies", False):
+            self.last.source.deferred = True
         self.last.source.setup(jxml)
         if hasattr(self.last.source, "setJSON") and globalJSON:
             self.last.source.setJSON(globalJSON)
@@ -28,6 +28,29 @@ from . import ClientSource
 from . import PyEvalSource
 
 
+class JSONContext(object):
+
+    """ JSON objects of the current step shared by datasources
+    """
+
+    def __init__(self, globalJSON=None, localJSON=None):
+        """ constructor
+
+        :param globalJSON: static JSON object
+        :type globalJSON: \
+        :     :obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>
+        :param localJSON: dynamic JSON object
+        :type localJSON: \
+        :     :obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>
+        """
+        #: (:obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>) \
+        #:     static JSON object
+        self.globalJSON = globalJSON
+        #: (:obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>) \
+        #:     dynamic JSON object
+        self.localJSON = localJSON
+
+
 class DataSourcePool(object):
 
     """ DataSource pool
@@ -53,11 +76,119 @@ class DataSourcePool(object):
         self.counter = 0
         #: (:obj:`bool`) can fail switch
         self.canfail = False
+        #: (:obj:`int`) expected number of steps, 0 if not known
+        self.nsteps = 0
+        #: (:obj:`int`) number of steps in write-behind buffers
+        #:    of growing fields, if < 2 steps are written directly
+        self.buffersize = 0
+        #: (:obj:`float`) maximal time in ms of buffering steps
+        self.buffertime = 0
+        #: (:class:`JSONContext`) JSON objects of the current step,
+        #:    if None datasources use JSON objects set by their setJSON
+        self.jsoncontext = None
+        #: (:obj:`bool`) set tango proxies up in parallel after parsing
+        self.deferproxies = True
+        #: (:obj:`bool`) read STEP tango attributes of the same device
+        #:    and trigger without group by one read_attributes() call
+        self.autogroup = False
+        #: (:obj:`bool`) read devices of tango groups
+        #:    by concurrent asynchronous calls
+        self.asynchgroups = False
+        #: (:obj:`float`) total time in seconds of setting a tango proxy up,
+        #:    the default of :class:`nxswriter.TangoSource.ProxyTools` if None
+        self.proxytimeout = None
         #: (:class:`nxswriter.FileWriter.FTGroup`) H5 file handle
         self.nxroot = None
+        #: (:class:`nxswriter.DBaseSource.DBConnectionPool`) open database
+        #:    connections shared by DB datasources
+        self.dbconnections = DBaseSource.DBConnectionPool()
+        #: (:class:`nxswriter.DBaseSource.DBQueryCache`) results of
+        #:    queries shared by DB datasources
+        self.dbqueries = DBaseSource.DBQueryCache()
+        #: (:class:`nxswriter.TangoSource.TgReadCache`) reads of tango
+        #:    members shared by TANGO datasources
+        self.tangoreads = TangoSource.TgReadCache()
+        #: (:class:`nxswriter.WorkerPool.WorkerPool`) worker threads
+        #:    fetching inputs of PYEVAL datasources, not used if None
+        self.inputworkers = None
         #: (:class:`threading.Lock`) pool lock
         self.lock = threading.Lock()
 
+    def setJSON(self, globalJSON, localJSON=None):
+        """ sets JSON objects of the current step shared by datasources
+
+        :param globalJSON: static JSON object
+        :type globalJSON: \
+        :     :obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>
+        :param localJSON: dynamic JSON object
+        :type localJSON: \
+        :     :obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>
+        """
+        self.jsoncontext = JSONContext(globalJSON, localJSON)
+
+    def setupProxies(self, numberOfThreads=None, streams=None):
+        """ sets proxies of deferred TANGO datasources up in parallel
+
+        :param numberOfThreads: maximal number of threads
+        :type numberOfThreads: :obj:`int`
+        :param streams: tango-like steamset class
+        :type streams: :class:`StreamSet` or :class:`PyTango.Device_4Impl`
+        """
+        with self.lock:
+            pending = self.common.pop('TANGO_PENDING', [])
+        if pending:
+            TangoSource.ProxyTools.setupProxies(
+                pending, numberOfThreads, self.proxytimeout, streams)
+
+    def subscribeEvents(self, streams=None):
+        """ subscribes events of TANGO datasources in the event mode
+
+        :brief: Attributes which cannot be subscribed are read
+                synchronously
+        :param streams: tango-like steamset class
+        :type streams: :class:`StreamSet` or :class:`PyTango.Device_4Impl`
+        """
+        with self.lock:
+            events = list(self.common.get('TANGO_EVENTS', {}).values())
+            health = self.common.get('TANGO_HEALTH', {})
+        for ev in events:
+            if ev.eventids:
+                continue
+            try:
+                if ev.device in health:
+                    proxy = health[ev.device].getProxy(streams)
+                else:
+                    proxy = TangoSource.ProxyTools.getProxy(
+                        ev.device, streams)
+                if proxy is not None:
+                    ev.subscribe(proxy, streams=streams)
+            except Exception as e:
+                if streams:
+                    streams.debug(
+                        "DataSourcePool::subscribeEvents() - "
+                        "%s/%s: %s" % (ev.device, ev.name, str(e)),
+                        False)
+
+    def unsubscribeEvents(self):
+        """ unsubscribes events of TANGO datasources in the event mode
+        """
+        with self.lock:
+            events = self.common.pop('TANGO_EVENTS', {})
+        for ev in events.values():
+            ev.unsubscribe()
+
+    def startRun(self):
+        """ starts a new run of datasources, i.e. an INIT, STEP
+            or FINAL pool run
+        """
+        self.dbqueries.start()
+        self.tangoreads.start()
+
+    def closeConnections(self):
+        """ closes open database connections of DB datasources
+        """
+        self.dbconnections.close()
+
     def appendUserDataSources(self, configJSON):
         """ loads user datasources
 
@@ -22,6 +22,8 @@
 from .Types import NTP
 import xml.etree.ElementTree as et
 import sys
+import threading
+import collections
 
 
 def _tostr(text):
@@ -45,6 +47,17 @@ class DataSource(object):
     """ Data source
     """
 
+    #: (:obj:`int`) maximal number of cached JSON key indexes
+    jsonIndexSize = 8
+    #: (:class:`collections.OrderedDict` <:obj:`int`, :obj:`tuple`>) \
+    #:     JSON dictionaries with their normalized key indexes
+    __jsonIndexes = collections.OrderedDict()
+    #: (:class:`threading.Lock`) lock of JSON key indexes
+    __jsonIndexLock = threading.Lock()
+    #: (:class:`threading.local`) thread data with the nested flag
+    #:    set while inputs of PYEVAL scripts are fetched
+    local = threading.local()
+
     def __init__(self, streams=None):
         """ constructor
 
@@ -70,6 +83,15 @@ class DataSource(object):
         """
         pass
 
+    def usesJSONContext(self):
+        """ checks if the datasource reads JSON objects
+            from the JSON context of its datasource pool
+
+        :returns: True if JSON objects do not need to be set by setJSON
+        :rtype: :obj:`bool`
+        """
+        return False
+
     def isValid(self):
         """ checks if the data is valid
 
@@ -118,6 +140,53 @@ class DataSource(object):
             replace("&gt;", ">").replace("&quot;", "\"").\
             replace("&amp;", "&")
 
+    @classmethod
+    def _normalizeKey(cls, name):
+        """ provides the normalized JSON data key
+
+        :param name: data key name
+        :type name: :obj:`str`
+        :returns: lower case key without the tango:// prefix
+        :rtype: :obj:`str`
+        """
+        key = str(name).lower()
+        if key.startswith("tango://"):
+            key = key[8:]
+        return key
+
+    @classmethod
+    def _getJSONIndex(cls, jsonobj):
+        """ provides the normalized key index of the JSON data
+
+        :brief: The index is built once for every JSON dictionary
+                and shared by all datasources
+        :param jsonobj: static or dynamic JSON object
+        :type jsonobj: \
+        :     :obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>
+        :returns: original data keys with respect to normalized keys
+        :rtype: :obj:`dict` <:obj:`str`, :obj:`str`>
+        """
+        if not jsonobj or 'data' not in jsonobj.keys() \
+                or not isinstance(jsonobj['data'], dict):
+            return {}
+        data = jsonobj['data']
+        with cls.__jsonIndexLock:
+            item = cls.__jsonIndexes.get(id(data))
+            if item is not None and item[0] is data \
+                    and item[1] == len(data):
+                return item[2]
+        index = {}
+        for name in data.keys():
+            key = cls._normalizeKey(name)
+            if key not in index:
+                index[key] = name
+        with cls.__jsonIndexLock:
+            cls.__jsonIndexes.pop(id(data), None)
+            cls.__jsonIndexes[id(data)] = (data, len(data), index)
+            while len(cls.__jsonIndexes) > max(cls.jsonIndexSize, 1):
+                cls.__jsonIndexes.popitem(last=False)
+        return index
+
     @classmethod
     def _getJSONData(cls, names, globalJSON, localJSON):
         """ provides access to the data
@@ -157,7 +226,9 @@ class DataSource(object):
         if rec is None:
             return
         ntp = NTP()
-        rank, shape, dtype = ntp.arrayRankShape(rec)
+        rank, shape, dtype, value = ntp.arrayRankShapeValue(rec)
+        if not getattr(DataSource.local, "nested", False):
+            rec = value
 
         if rank in NTP.rTf:
             if shape is None:
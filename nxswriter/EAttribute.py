@@ -55,6 +55,11 @@ class EAttribute(FElement):
         self.strategy = None
         #: (:obj:`str`) trigger for asynchronous writting
         self.trigger = None
+        #: (:class:`nxswriter.DataHolder.DataHolder`) data fetched \
+        #:    from the source and not written yet
+        self.__holder = None
+        #: (:obj:`bool`) True if the fetched data wait for writing
+        self.__fetched = False
 
     def store(self, xml=None, globalJSON=None):
         """ stores the tag content
@@ -97,41 +102,72 @@ class EAttribute(FElement):
         """ runner
 
         :brief: During its thread run it fetches the data from the source
+                and writes them into the H5 attribute
         """
+        self.fetch()
+        self.write()
+
+    def fetch(self):
+        """ fetches the data from the source
+
+        :brief: It reads the data without touching the H5 object
+        """
+        self.__holder = None
+        self.__fetched = False
         try:
-            if self.name:
-                if not self.h5Object:
-                    #: stored H5 file object (defined in base class)
-                    self.h5Object = self.last.h5Attribute(self.name)
-                if self.source:
-                    dt = self.source.getData()
-                    dh = None
-                    if dt:
-                        dh = DataHolder(streams=self._streams, **dt)
-                    if not dh:
-                        message = self.setMessage("Data without value")
-                        self.error = message
-                    elif not hasattr(self.h5Object, 'shape'):
-                        message = self.setMessage("PNI Object not created")
-                        if self._streams:
-                            self._streams.warn(
-                                "Attribute::run() - %s " % message[0])
-                        self.error = message
-                    else:
-                        self.h5Object[...] = dh.cast(self.h5Object.dtype)
+            if self.name and self.source:
+                dt = self.source.getData()
+                if dt:
+                    self.__holder = DataHolder(streams=self._streams, **dt)
+                self.__fetched = True
         except Exception:
             message = self.setMessage(sys.exc_info()[1].__str__())
             self.error = message
-        #            self.error = sys.exc_info()
         finally:
-            if self.error:
-                if self._streams:
-                    if self.canfail:
+            self.__reportError()
+
+    def write(self):
+        """ writes the fetched data into the H5 attribute
+        """
+        if not self.name:
+            return
+        dh = self.__holder
+        fetched = self.__fetched
+        self.__holder = None
+        self.__fetched = False
+        try:
+            if not self.h5Object:
+                #: stored H5 file object (defined in base class)
+                self.h5Object = self.last.h5Attribute(self.name)
+            if fetched:
+                if not dh:
+                    message = self.setMessage("Data without value")
+                    self.error = message
+                elif not hasattr(self.h5Object, 'shape'):
+                    message = self.setMessage("PNI Object not created")
+                    if self._streams:
                         self._streams.warn(
-                            "Attribute::run() - %s  " % str(self.error))
-                    else:
-                        self._streams.error(
-                            "Attribute::run() - %s  " % str(self.error))
+                            "Attribute::run() - %s " % message[0])
+                    self.error = message
+                else:
+                    self.h5Object[...] = dh.cast(self.h5Object.dtype)
+        except Exception:
+            message = self.setMessage(sys.exc_info()[1].__str__())
+            self.error = message
+        finally:
+            self.__reportError()
+
+    def __reportError(self):
+        """ reports the error message to the streams
+        """
+        if self.error:
+            if self._streams:
+                if self.canfail:
+                    self._streams.warn(
+                        "Attribute::run() - %s  " % str(self.error))
+                else:
+                    self._streams.error(
+                        "Attribute::run() - %s  " % str(self.error))
 
     def __fillMax(self):
         """ fills object with maximum value
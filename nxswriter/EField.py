@@ -20,12 +20,15 @@
 """ Definitions of field tag evaluation classes """
 
 import sys
+import time
 
 import numpy
 
+from .ChunkPlanner import ChunkPlanner
 from .DataHolder import DataHolder
+from .PreallocatedField import PreallocatedField
 from .FElement import FElementWithAttr
-from .Types import NTP
+from .Types import NTP, nptype
 from .Errors import (XMLSettingSyntaxError)
 
 from nxstools import filewriter as FileWriter
@@ -74,10 +77,40 @@ class EField(FElementWithAttr):
         self.rate = 2
         #: (:obj:`bool`) compression shuffle
         self.shuffle = True
+        #: (:obj:`list` < :obj:`int` >) requested chunk shape,
+        #:     its 0 items are planned
+        self.chunks = None
+        #: (:obj:`int`) target chunk size in bytes, default if 0
+        self.chunkbytes = 0
+        #: (:obj:`int`) expected number of steps, 0 if not known.
+        #:     Growing fields reserve their steps in advance if it is set
+        self.nsteps = 0
         #: (:obj:`bool`) grew flag
         self.__grew = True
         #: (:obj:`str`) data format
         self.__format = ''
+        #: (:class:`nxswriter.DataHolder.DataHolder`) data fetched \
+        #:    from the source and not written yet
+        self.__holder = None
+        #: (:obj:`bool`) True if the fetched data wait for writing
+        self.__fetched = False
+        #: (:class:`numpy.ndarray`) block of steps fetched by fetchBatch
+        self.__block = None
+        #: (:obj:`tuple`) write plan of growing data, i.e.
+        #:     ((format, shape), dtype, index builder)
+        self.__plan = None
+        #: (:obj:`int`) number of steps collected in the write-behind
+        #:     buffer before writing, if < 2 steps are written directly
+        self.buffersize = 0
+        #: (:obj:`float`) maximal time in ms of keeping steps
+        #:     in the write-behind buffer, if <= 0 it is not checked
+        self.buffertime = 0
+        #: (:class:`numpy.ndarray`) preallocated write-behind buffer
+        self.__buffer = None
+        #: (:obj:`int`) number of steps in the write-behind buffer
+        self.__buffered = 0
+        #: (:obj:`float`) time of the first step in the write-behind buffer
+        self.__bufferstart = 0
 
     def __isgrowing(self):
         """ checks if it is growing in extra dimension
@@ -132,6 +165,31 @@ class EField(FElementWithAttr):
                 shape = [0]
             return shape
 
+    def __planChunks(self, dtype, shape):
+        """ provides chunk shape of the created H5 object
+
+        :param dtype: object type
+        :type dtype: :obj:`str`
+        :param shape: object shape
+        :type shape: :obj:`list` <:obj:`int` >
+        :returns: chunk shape
+        :rtype: :obj:`list` <:obj:`int` >
+        """
+        if self.chunks and len(self.chunks) != len(shape):
+            if self._streams:
+                self._streams.warn(
+                    "EField::__planChunks() - "
+                    "Chunk shape %s does not match the field rank %s" %
+                    (self.chunks, len(shape)))
+            self.chunks = None
+        nsteps = self.nsteps
+        if self.__isbufferable(dtype):
+            nsteps = min(nsteps or self.__buffercapacity(),
+                         self.__buffercapacity())
+        return ChunkPlanner(self.chunkbytes).plan(
+            shape, dtype, self.grows if self.__extraD else None,
+            nsteps, self.chunks)
+
     def __createObject(self, dtype, name, shape):
         """ creates H5 object
 
@@ -153,7 +211,7 @@ class EField(FElementWithAttr):
                 f = self._lastObject().open(name)
                 return f
 
-        chunk = [s if s > 0 else 1 for s in shape]
+        chunk = self.__planChunks(dtype, shape)
         minshape = [1 if s > 0 else 0 for s in shape]
         datafilter = None
         # create Filter
@@ -277,6 +335,10 @@ class EField(FElementWithAttr):
         shape = self.__getShape()
         #: stored H5 file object (defined in base class)
         self.h5Object = self.__createObject(tp, nm, shape)
+        if self.nsteps > 0 and self.__extraD and self.grows == 1 \
+           and not self._reloadmode and hasattr(self.h5Object, "shape") \
+           and len(self.h5Object.shape) > 0:
+            self.h5Object = PreallocatedField(self.h5Object, self.nsteps)
         # create attributes
         self.__setAttributes()
 
@@ -527,52 +589,303 @@ class EField(FElementWithAttr):
         """ runner
 
         :brief: During its thread run it fetches the data from the source
+                and writes them into the H5 object
+        """
+        self.fetch()
+        self.write()
+
+    def fetch(self):
+        """ fetches the data from the source
+
+        :brief: It reads the data without touching the H5 object so it can
+                be called concurrently for all fields of the step
         """
         self.__grew = False
+        self.__holder = None
+        self.__fetched = False
         try:
             if self.source:
                 dt = self.source.getData()
-                dh = None
                 if dt and isinstance(dt, dict):
-                    dh = DataHolder(streams=self._streams, **dt)
-                self.__grow()
-                self.__grew = True
-                if not dh:
-                    message = self.setMessage("Data without value")
-                    self.error = message
-                elif not hasattr(self.h5Object, 'shape'):
-                    message = self.setMessage("H5 Object not created")
-                    self.error = message
+                    self.__holder = DataHolder(streams=self._streams, **dt)
+                self.__fetched = True
+        except Exception:
+            self.__setError()
+        finally:
+            self.__reportError()
+
+    def write(self):
+        """ writes the fetched data into the H5 object
+
+        :brief: It grows the H5 object and stores the data fetched by
+                :meth:`fetch`. All H5 calls of the step are made here
+        """
+        if not self.__fetched:
+            return
+        dh = self.__holder
+        self.__holder = None
+        self.__fetched = False
+        try:
+            if dh and self.__isbuffered() and self.__bufferData(dh):
+                return
+            self.flushBuffer()
+            if dh and self.__plan is not None \
+               and self.__plan[0] == (dh.format, tuple(dh.shape or ())):
+                self.__writePlanned(dh)
+                return
+            self.__grow()
+            self.__grew = True
+            if not dh:
+                message = self.setMessage("Data without value")
+                self.error = message
+            elif not hasattr(self.h5Object, 'shape'):
+                message = self.setMessage("H5 Object not created")
+                self.error = message
+            else:
+                if not self.__extraD:
+                    self.__growshape(dh.shape)
+                    self.__writeData(dh)
                 else:
-                    if not self.__extraD:
+                    if len(self.h5Object.shape) >= self.grows \
+                       and (self.h5Object.shape[self.grows - 1] == 1 or
+                            self.canfail):
                         self.__growshape(dh.shape)
-                        self.__writeData(dh)
-                    else:
-                        if len(self.h5Object.shape) >= self.grows \
-                           and (self.h5Object.shape[self.grows - 1] == 1 or
-                                self.canfail):
-                            self.__growshape(dh.shape)
-                        self.__writeGrowingData(dh)
+                    self.__writeGrowingData(dh)
+                    self.__plan = self.__makePlan(dh)
         except Exception:
-            info = sys.exc_info()
-            import traceback
-            message = self.setMessage(
-                str(info[1].__str__()) + "\n " + (" ").join(
-                    traceback.format_tb(sys.exc_info()[2])))
-            # message = self.setMessage(  sys.exc_info()[1].__str__()  )
-            del info
-            #: notification of error in the run method (defined in base class)
-            self.error = message
-            # self.error = sys.exc_info()
+            self.__setError()
         finally:
-            if self.error:
-                if self._streams:
-                    if self.canfail:
-                        self._streams.warn(
-                            "EField::run() - %s  " % str(self.error))
-                    else:
-                        self._streams.error(
-                            "EField::run() - %s  " % str(self.error))
+            self.__reportError()
+
+    def __makePlan(self, holder):
+        """ creates the write plan of growing data
+
+        :brief: The plan is created for fields growing in the first
+                dimension with data filling the whole step frame
+        :param holder: data holder written by the generic path
+        :type holder: :class:`nxswriter.DataHolder.DataHolder`
+        :returns: ((format, shape), dtype, index builder) or None
+        :rtype: :obj:`tuple`
+        """
+        if self.grows != 1:
+            return None
+        shape = tuple(holder.shape or ())
+        rank = len(self.h5Object.shape)
+        fmt = str(holder.format).split('.')[-1]
+        dims = [dm for dm in shape if dm]
+        if fmt == "SCALAR" and rank == 1:
+            def index(row):
+                return row
+        elif fmt == "SPECTRUM" and rank == 2 and len(dims) == 1:
+            frame = slice(0, dims[0])
+
+            def index(row):
+                return (row, frame)
+        elif fmt == "IMAGE" and rank == 3 and len(dims) == 2 \
+                and len(shape) == 2:
+            frame = (slice(0, dims[0]), slice(0, dims[1]))
+
+            def index(row):
+                return (row,) + frame
+        else:
+            return None
+        dtype = self.h5Object.dtype
+        if fmt != "SCALAR" and \
+           numpy.shape(holder.cast(dtype)) != tuple(dims):
+            return None
+        return ((holder.format, shape), dtype, index)
+
+    def __writePlanned(self, holder):
+        """ writes growing data with the write plan
+
+        :param holder: data holder
+        :type holder: :class:`nxswriter.DataHolder.DataHolder`
+        """
+        _, dtype, index = self.__plan
+        self.h5Object.grow(0)
+        self.__grew = True
+        self.h5Object[index(self.h5Object.shape[0] - 1)] = holder.cast(dtype)
+
+    def fetchBatch(self, globalJSON, localJSONs):
+        """ fetches data of many steps from the datasource
+
+        :brief: It succeeds only for growing fields with a datasource
+                providing data of many steps, i.e. CLIENT, and with
+                data of the same shape in all steps
+        :param globalJSON: global JSON string
+        :type globalJSON: \
+        :     :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        :param localJSONs: local JSON strings of the steps
+        :type localJSONs: :obj:`list` < \
+        :     :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>> >
+        :returns: True if the block can be written by :meth:`writeBatch`
+        :rtype: :obj:`bool`
+        """
+        self.__block = None
+        if not localJSONs or not self.__extraD or self.grows != 1 \
+                or self.canfail \
+                or not hasattr(self.source, "getBatchData") \
+                or not hasattr(self.h5Object, "shape") \
+                or self.h5Object.dtype == "string":
+            return False
+        dtype = self.h5Object.dtype
+        try:
+            rows = []
+            for dt in self.source.getBatchData(globalJSON, localJSONs):
+                if not dt or not isinstance(dt, dict):
+                    return False
+                rows.append(
+                    DataHolder(streams=self._streams, **dt).cast(dtype))
+            block = numpy.array(rows, dtype=nptype(dtype))
+        except Exception:
+            return False
+        h5shape = self.h5Object.shape
+        if len(block.shape) != len(h5shape) or 0 in block.shape:
+            return False
+        for i in range(1, len(h5shape)):
+            if block.shape[i] > h5shape[i] and h5shape[0]:
+                return False
+        self.__block = block
+        return True
+
+    def writeBatch(self):
+        """ writes the block fetched by :meth:`fetchBatch`
+
+        :brief: It grows the H5 object once and writes all steps of
+                the block with one slice assignment
+        """
+        block = self.__block
+        self.__block = None
+        if block is None:
+            return
+        try:
+            self.flushBuffer()
+            self.__writeBlock(block)
+        except Exception:
+            self.__setError()
+        finally:
+            self.__reportError()
+
+    def __writeBlock(self, block):
+        """ appends a block of steps to the field growing in 1st dimension
+
+        :param block: data of the steps
+        :type block: :class:`numpy.ndarray`
+        """
+        h5shape = self.h5Object.shape
+        for i in range(1, len(h5shape)):
+            if block.shape[i] > h5shape[i]:
+                self.h5Object.grow(i, block.shape[i] - h5shape[i])
+        start = h5shape[0]
+        self.h5Object.grow(0, block.shape[0])
+        self.h5Object[tuple(
+            [slice(start, start + block.shape[0])] +
+            [slice(0, dm) for dm in block.shape[1:]])] = block
+
+    def __isbufferable(self, dtype):
+        """ checks if steps of the field can be collected
+            in the write-behind buffer
+
+        :param dtype: field type
+        :type dtype: :obj:`str`
+        :returns: True if the write-behind buffer is enabled
+        :rtype: :obj:`bool`
+        """
+        return (self.buffersize > 1 or self.buffertime > 0) \
+            and bool(self.__extraD) and self.grows == 1 \
+            and dtype != "string"
+
+    def __isbuffered(self):
+        """ checks if steps are collected in the write-behind buffer
+
+        :returns: True if the write-behind buffer is enabled
+        :rtype: :obj:`bool`
+        """
+        return hasattr(self.h5Object, "shape") \
+            and self.__isbufferable(self.h5Object.dtype)
+
+    def __bufferData(self, holder):
+        """ appends the step to the write-behind buffer
+
+        :param holder: data holder
+        :type holder: :class:`nxswriter.DataHolder.DataHolder`
+        :returns: True if the step was buffered
+        :rtype: :obj:`bool`
+        """
+        dtype = nptype(self.h5Object.dtype)
+        arr = numpy.asarray(holder.cast(self.h5Object.dtype), dtype=dtype)
+        if self.__buffer is not None and \
+                self.__buffer.shape[1:] != arr.shape:
+            self.flushBuffer()
+            self.__buffer = None
+        h5shape = self.h5Object.shape
+        if len(arr.shape) + 1 != len(h5shape) or 0 in arr.shape:
+            return False
+        if h5shape[0] and any(
+                dm > hdm for dm, hdm in zip(arr.shape, h5shape[1:])):
+            return False
+        if self.__buffer is None:
+            self.__buffer = numpy.empty(
+                [self.__buffercapacity()] + list(arr.shape), dtype=dtype)
+        if not self.__buffered:
+            self.__bufferstart = time.time()
+        self.__buffer[self.__buffered] = arr
+        self.__buffered += 1
+        if self.__buffered >= len(self.__buffer) or (
+                self.buffertime > 0 and
+                (time.time() - self.__bufferstart) * 1000.
+                >= self.buffertime):
+            self.flushBuffer()
+        return True
+
+    def __buffercapacity(self):
+        """ provides number of steps which fit into the write-behind buffer
+
+        :returns: buffer capacity
+        :rtype: :obj:`int`
+        """
+        return self.buffersize if self.buffersize > 1 else 1024
+
+    def flushBuffer(self):
+        """ writes steps from the write-behind buffer into the H5 object
+
+        :brief: It grows the H5 object once and writes all buffered steps
+                with one slice assignment
+        """
+        if self.__buffered:
+            buffered = self.__buffered
+            self.__buffered = 0
+            self.__writeBlock(self.__buffer[:buffered])
+
+    def trim(self):
+        """ shrinks the preallocated H5 object to the written steps
+        """
+        if isinstance(self.h5Object, PreallocatedField):
+            self.h5Object.trim()
+
+    def __setError(self):
+        """ sets the error message from the current exception
+        """
+        info = sys.exc_info()
+        import traceback
+        message = self.setMessage(
+            str(info[1].__str__()) + "\n " + (" ").join(
+                traceback.format_tb(sys.exc_info()[2])))
+        del info
+        #: notification of error in the run method (defined in base class)
+        self.error = message
+
+    def __reportError(self):
+        """ reports the error message to the streams
+        """
+        if self.error:
+            if self._streams:
+                if self.canfail:
+                    self._streams.warn(
+                        "EField::run() - %s  " % str(self.error))
+                else:
+                    self._streams.error(
+                        "EField::run() - %s  " % str(self.error))
 
     def __fillMax(self):
         """ fills object with maximum value
@@ -641,6 +954,7 @@ class EField(FElementWithAttr):
         :type error: :obj:`str`
         """
         if self.h5Object is not None:
+            self.flushBuffer()
             if error:
                 if isinstance(error, tuple):
                     serror = str(tuple([str(e) for e in error]))
@@ -79,6 +79,18 @@ class EStrategy(Element):
                 if "shuffle" in attrs.keys() and hasattr(self.last, "shuffle"):
                     self.last.shuffle = False \
                         if attrs["shuffle"].upper() == "FALSE" else True
+        if "chunks" in attrs.keys() and hasattr(self.last, "chunks"):
+            self.last.chunks = [
+                max(int(vl.strip()), 0)
+                for vl in attrs["chunks"].split(",") if vl.strip()]
+        if "chunkbytes" in attrs.keys() and \
+           hasattr(self.last, "chunkbytes"):
+            self.last.chunkbytes = max(int(attrs["chunkbytes"]), 0)
+        if "buffer" in attrs.keys() and hasattr(self.last, "buffersize"):
+            self.last.buffersize = max(int(attrs["buffer"]), 0)
+        if "buffertime" in attrs.keys() and \
+           hasattr(self.last, "buffertime"):
+            self.last.buffertime = max(float(attrs["buffertime"]), 0)
 
     def store(self, xml=None, globalJSON=None):
         """ stores the tag content
@@ -95,3 +107,19 @@ class EStrategy(Element):
         """ sets can fail flag
         """
         self.last.canfail = True
+
+    def setBuffer(self, size, time):
+        """ sets write-behind buffer parameters if they are not given
+            in the strategy tag
+
+        :param size: number of buffered steps
+        :type size: :obj:`int`
+        :param time: maximal buffering time in ms
+        :type time: :obj:`float`
+        """
+        if "buffer" not in self._tagAttrs.keys() and \
+           hasattr(self.last, "buffersize"):
+            self.last.buffersize = size
+        if "buffertime" not in self._tagAttrs.keys() and \
+           hasattr(self.last, "buffertime"):
+            self.last.buffertime = time
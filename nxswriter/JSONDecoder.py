@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Decoder of JSON strings with data records """
+
+import base64
+import json
+
+import numpy
+
+#: (:obj:`bool`) True if orjson module is installed
+ORJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+
+class JSONDecoder(object):
+
+    """ decoder of JSON strings with an optional fast backend
+        and typed arrays
+    """
+
+    #: (:obj:`callable`) fast decoder used before :func:`json.loads`,
+    #:    e.g. :func:`orjson.loads`, not used if None
+    fastloads = orjson.loads if ORJSON_AVAILABLE else None
+
+    #: (:obj:`str`) key of base64 encoded typed arrays,
+    #:    i.e. {"__ndarray__": <base64>, "dtype": <dtype>, "shape": <shape>}
+    arrayKey = "__ndarray__"
+
+    @classmethod
+    def loads(cls, jsonstring, arrays=True):
+        """ decodes the JSON string
+
+        :brief: The fast decoder is used if it is set. Strings which
+                it rejects, e.g. with NaN, or with values which it may
+                have converted from integers exceeding 64 bits into
+                floats are decoded by :func:`json.loads`
+        :param jsonstring: JSON string
+        :type jsonstring: :obj:`str`
+        :param arrays: if True typed arrays of the data records
+                       are decoded into numpy arrays
+        :type arrays: :obj:`bool`
+        :returns: JSON object
+        :rtype: :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        """
+        obj = None
+        decoded = False
+        if cls.fastloads is not None:
+            try:
+                obj = cls.fastloads(jsonstring)
+                decoded = not cls.__hasLongFloats(obj)
+            except Exception:
+                decoded = False
+        if not decoded:
+            obj = json.loads(jsonstring)
+        if arrays:
+            cls.decodeArrays(obj)
+        return obj
+
+    @classmethod
+    def __hasLongFloats(cls, jsonobj):
+        """ checks if the JSON object contains numbers out of the int64 range
+
+        :brief: Lists of numbers are checked by their maximum and minimum
+        :param jsonobj: JSON object
+        :type jsonobj: any
+        :returns: True if any number could be a long integer
+        :rtype: :obj:`bool`
+        """
+        if isinstance(jsonobj, dict):
+            return any(cls.__hasLongFloats(v) for v in jsonobj.values())
+        if isinstance(jsonobj, list):
+            if not jsonobj:
+                return False
+            try:
+                high, low = max(jsonobj), min(jsonobj)
+            except TypeError:
+                return any(cls.__hasLongFloats(v) for v in jsonobj)
+            if isinstance(high, (int, float)) and \
+                    isinstance(low, (int, float)):
+                return high >= 2 ** 63 or low <= -2 ** 63
+            if isinstance(high, str) and isinstance(low, str):
+                return False
+            return any(cls.__hasLongFloats(v) for v in jsonobj)
+        return isinstance(jsonobj, float) and abs(jsonobj) >= 2 ** 63
+
+    @classmethod
+    def decodeArrays(cls, jsonobj):
+        """ replaces typed arrays of the data records by numpy arrays
+
+        :param jsonobj: JSON object
+        :type jsonobj: :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        :returns: JSON object
+        :rtype: :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        """
+        if isinstance(jsonobj, dict) and \
+                isinstance(jsonobj.get("data"), dict):
+            data = jsonobj["data"]
+            for name, value in data.items():
+                if isinstance(value, dict) and cls.arrayKey in value:
+                    data[name] = cls.decodeArray(value)
+        return jsonobj
+
+    @classmethod
+    def decodeArray(cls, record):
+        """ decodes the typed array
+
+        :param record: typed array record
+        :type record: :obj:`dict` <:obj:`str`, any>
+        :returns: writable numpy array
+        :rtype: :class:`numpy.ndarray`
+        :raises: :exc:`ValueError` if the record is not a valid typed array
+        """
+        try:
+            dtype = numpy.dtype(str(record.get("dtype", "float64")))
+            if dtype.hasobject:
+                raise ValueError("object type")
+            buf = bytearray(base64.b64decode(record[cls.arrayKey]))
+            array = numpy.frombuffer(buf, dtype=dtype)
+            if "shape" in record:
+                array = array.reshape(
+                    [int(dim) for dim in record["shape"]])
+        except Exception as e:
+            raise ValueError("JSONDecoder::decodeArray() - "
+                             "Invalid typed array: %s" % str(e))
+        return array
+
+    @classmethod
+    def encodeArray(cls, array):
+        """ encodes the array into the typed array record
+
+        :param array: array
+        :type array: :class:`numpy.ndarray`
+        :returns: typed array record
+        :rtype: :obj:`dict` <:obj:`str`, any>
+        """
+        array = numpy.ascontiguousarray(array)
+        return {
+            cls.arrayKey: base64.b64encode(array.tobytes()).decode("ascii"),
+            "dtype": array.dtype.str,
+            "shape": list(array.shape)}
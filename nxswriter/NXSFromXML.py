@@ -27,6 +27,7 @@ import datetime
 import argparse
 
 from . import TangoDataWriter
+from .JSONDecoder import JSONDecoder
 
 
 class CreateFile(object):
@@ -102,7 +103,7 @@ class CreateFile(object):
         if self.__jsonfile:
             sjsn = open(self.__jsonfile, 'r').read()
             if sjsn.strip():
-                jsn = json.loads(sjsn.strip())
+                jsn = JSONDecoder.loads(sjsn.strip(), arrays=False)
         if "data" not in jsn.keys():
             jsn["data"] = {}
         if "start_time" not in jsn["data"]:
@@ -110,7 +111,8 @@ class CreateFile(object):
         if "end_time" not in jsn["data"]:
             jsn["data"]["end_time"] = self.currenttime()
         if str(self.__data.strip()):
-            data = json.loads(str(self.__data.strip()))
+            data = JSONDecoder.loads(
+                str(self.__data.strip()), arrays=False)
             jsn["data"].update(data)
         return json.dumps(jsn)
 
@@ -39,6 +39,11 @@ from datetime import datetime
 
 from .TangoDataWriter import TangoDataWriter as TDW
 
+if sys.version_info > (3,):
+    import queue as Queue
+else:
+    import Queue
+
 
 class CommandThread(Thread):
 
@@ -50,8 +55,9 @@ class CommandThread(Thread):
 
         :param server: Tango server implementation
         :type server: :class:`PyTango.Device_4Impl`
-        :param command: Thread command
-        :type command: :obj:`str`
+        :param command: Thread command, i.e. a name of the TangoDataWriter
+                        method or a callable object
+        :type command: :obj:`str` or :obj:`__callable__`
         :param finalState: Final State Code
         :type finalState: :class:`PyTango.DevState`
         :param args: List of command arguments
@@ -61,7 +67,8 @@ class CommandThread(Thread):
         #: (:class:`PyTango.Device_4Impl`) tango server
         self.server = server
         #: (:obj:`__callable__`) command
-        self.command = getattr(server.tdw, command)
+        self.command = command if callable(command) \
+            else getattr(server.tdw, command)
         #: (:class:`PyTango.DevState`) final state
         self.fstate = finalState
         #: (:class:`PyTango.DevState`) error state
@@ -98,6 +105,67 @@ class CommandThread(Thread):
         self.dp.state()
 
 
+class RecordThread(Thread):
+
+    """ thread recording queued steps in the submitted order
+    """
+
+    def __init__(self, server, queue):
+        """constructor
+
+        :param server: Tango server implementation
+        :type server: :class:`PyTango.Device_4Impl`
+        :param queue: queue with JSON strings of the steps
+        :type queue: :class:`Queue.Queue`
+        """
+        Thread.__init__(self)
+        self.daemon = True
+        #: (:class:`PyTango.Device_4Impl`) tango server
+        self.server = server
+        #: (:class:`Queue.Queue`) queue with JSON strings of the steps
+        self.queue = queue
+        self.dp = PyTango.DeviceProxy(self.server.get_name())
+        self.dp.set_source(PyTango.DevSource.DEV)
+
+    def run(self):
+        """ records the queued steps until it gets None
+        """
+        while True:
+            argin = self.queue.get()
+            if argin is None:
+                break
+            try:
+                self.server.tdw.record(argin)
+            except Exception:
+                self.__failed()
+            else:
+                with self.server.lock:
+                    self.server.pendingRecords -= 1
+                    finished = self.server.pendingRecords <= 0 and \
+                        self.server.state_flag == PyTango.DevState.RUNNING
+                    if finished:
+                        self.server.state_flag = PyTango.DevState.EXTRACT
+                if finished:
+                    self.dp.state()
+
+    def __failed(self):
+        """ sets the error state and drops the queued steps
+        """
+        with self.server.lock:
+            self.server.state_flag = PyTango.DevState.FAULT
+            self.server.errors.append(
+                str(datetime.now()) + ":\n" + str(sys.exc_info()[1]))
+            self.server.pendingRecords = 0
+            try:
+                while True:
+                    if self.queue.get(block=False) is None:
+                        self.queue.put(None)
+                        break
+            except Queue.Empty:
+                pass
+        self.dp.state()
+
+
 class NXSDataWriter(PyTango.Device_4Impl):
 
     """ Tango Server to store data in H5 files
@@ -132,6 +200,13 @@ class NXSDataWriter(PyTango.Device_4Impl):
         self.rthread = None
         #: (:class:`CommandThread`) closentry thread
         self.cthread = None
+        #: (:class:`RecordThread`) thread recording the queued steps
+        self.pthread = None
+        #: (:obj:`int`) maximal number of queued steps of RecordAsynch,
+        #:     if < 1 the steps are not pipelined
+        self.recordQueueSize = 0
+        #: (:obj:`int`) number of queued steps which are not written yet
+        self.pendingRecords = 0
         #: (:class:`nxswriter.TangoDataWriter.TangoDataWriter`) \
         #:       Tango Data Writer
         self.tdw = TDW(self)
@@ -153,6 +228,7 @@ class NXSDataWriter(PyTango.Device_4Impl):
         """ Device destructor
         """
         self.debug_stream("In delete_device()")
+        self.__stopRecordThread()
         if hasattr(self, 'tdw') and self.tdw:
             if hasattr(self.tdw, 'closeFile'):
                 try:
@@ -174,6 +250,8 @@ class NXSDataWriter(PyTango.Device_4Impl):
             self.set_state(PyTango.DevState.RUNNING)
             with self.lock:
                 self.errors = []
+            self.__stopRecordThread()
+            self.pendingRecords = 0
             if hasattr(self, 'tdw') and self.tdw:
                 if hasattr(self.tdw, 'closeFile'):
                     try:
@@ -504,6 +582,170 @@ class NXSDataWriter(PyTango.Device_4Impl):
             return False
         return True
 
+    def read_BufferSize(self, attr):
+        """ Read BufferSize attribute
+
+        :param attr: attribute object
+        :type attr: :class:`PyTango.Attribute`
+        """
+        self.debug_stream("In read_BufferSize()")
+
+        attr.set_value(self.tdw.buffersize)
+
+    def write_BufferSize(self, attr):
+        """ Write BufferSize attribute
+
+        :param attr: attribute object
+        :type attr: :class:`PyTango.Attribute`
+        """
+        self.debug_stream("In write_BufferSize()")
+        if self.is_BufferSize_write_allowed():
+            self.tdw.buffersize = attr.get_write_value()
+        else:
+            self.warn_stream(
+                "To change the buffer size please close the entry.")
+            raise Exception(
+                "To change the buffer size please close the entry.")
+
+    def is_BufferSize_write_allowed(self):
+        """ BufferSize attribute Write State Machine
+
+        :returns: True if the operation allowed
+        :rtype: :obj:`bool`
+        """
+        if self.get_state() in [PyTango.DevState.OFF,
+                                PyTango.DevState.EXTRACT,
+                                PyTango.DevState.RUNNING]:
+            return False
+        return True
+
+    def is_BufferSize_allowed(self, _):
+        """BufferSize attribute State Machine
+
+        :returns: True if the operation allowed
+        :rtype: :obj:`bool`
+        """
+        if self.get_state() in [PyTango.DevState.OFF]:
+            return False
+        return True
+
+    def read_BufferTime(self, attr):
+        """ Read BufferTime attribute
+
+        :param attr: attribute object
+        :type attr: :class:`PyTango.Attribute`
+        """
+        self.debug_stream("In read_BufferTime()")
+
+        attr.set_value(self.tdw.buffertime)
+
+    def write_BufferTime(self, attr):
+        """ Write BufferTime attribute
+
+        :param attr: attribute object
+        :type attr: :class:`PyTango.Attribute`
+        """
+        self.debug_stream("In write_BufferTime()")
+        if self.is_BufferTime_write_allowed():
+            self.tdw.buffertime = attr.get_write_value()
+        else:
+            self.warn_stream(
+                "To change the buffer time please close the entry.")
+            raise Exception(
+                "To change the buffer time please close the entry.")
+
+    def is_BufferTime_write_allowed(self):
+        """ BufferTime attribute Write State Machine
+
+        :returns: True if the operation allowed
+        :rtype: :obj:`bool`
+        """
+        if self.get_state() in [PyTango.DevState.OFF,
+                                PyTango.DevState.EXTRACT,
+                                PyTango.DevState.RUNNING]:
+            return False
+        return True
+
+    def is_BufferTime_allowed(self, _):
+        """BufferTime attribute State Machine
+
+        :returns: True if the operation allowed
+        :rtype: :obj:`bool`
+        """
+        if self.get_state() in [PyTango.DevState.OFF]:
+            return False
+        return True
+
+    def read_RecordQueueSize(self, attr):
+        """ Read RecordQueueSize attribute
+
+        :param attr: attribute object
+        :type attr: :class:`PyTango.Attribute`
+        """
+        self.debug_stream("In read_RecordQueueSize()")
+
+        attr.set_value(self.recordQueueSize)
+
+    def write_RecordQueueSize(self, attr):
+        """ Write RecordQueueSize attribute
+
+        :param attr: attribute object
+        :type attr: :class:`PyTango.Attribute`
+        """
+        self.debug_stream("In write_RecordQueueSize()")
+        if self.is_RecordQueueSize_write_allowed():
+            self.recordQueueSize = attr.get_write_value()
+        else:
+            self.warn_stream("To change the record queue size please"
+                             " close the entry.")
+            raise Exception(
+                "To change the record queue size please close the entry.")
+
+    def is_RecordQueueSize_write_allowed(self):
+        """ RecordQueueSize attribute Write State Machine
+
+        :returns: True if the operation allowed
+        :rtype: :obj:`bool`
+        """
+        if self.pthread is not None:
+            return False
+        if self.get_state() in [PyTango.DevState.OFF,
+                                PyTango.DevState.EXTRACT,
+                                PyTango.DevState.RUNNING]:
+            return False
+        return True
+
+    def is_RecordQueueSize_allowed(self, _):
+        """ RecordQueueSize attribute State Machine
+
+        :returns: True if the operation allowed
+        :rtype: :obj:`bool`
+        """
+        if self.get_state() in [PyTango.DevState.OFF]:
+            return False
+        return True
+
+    def read_RecordQueueDepth(self, attr):
+        """ Read RecordQueueDepth attribute
+
+        :param attr: attribute object
+        :type attr: :class:`PyTango.Attribute`
+        """
+        self.debug_stream("In read_RecordQueueDepth()")
+
+        with self.lock:
+            attr.set_value(self.pendingRecords)
+
+    def is_RecordQueueDepth_allowed(self, _):
+        """ RecordQueueDepth attribute State Machine
+
+        :returns: True if the operation allowed
+        :rtype: :obj:`bool`
+        """
+        if self.get_state() in [PyTango.DevState.OFF]:
+            return False
+        return True
+
     def read_Errors(self, attr):
         """ Read Errors attribute
 
@@ -656,12 +898,50 @@ class NXSDataWriter(PyTango.Device_4Impl):
             return False
         return True
 
+    def RecordBatch(self, argin):
+        """ RecordBatch command
+
+        :brief: Records data for many scan steps
+        :param argin: list of JSON strings with data of the steps
+        :type argin: :obj:`list` <:obj:`str`>
+        """
+        self.debug_stream("In RecordBatch()")
+        self.set_state(PyTango.DevState.RUNNING)
+        try:
+            self.tdw.recordBatch(list(argin))
+            self.set_state(PyTango.DevState.EXTRACT)
+        except (PyTango.DevFailed, BaseException):
+            self.__failed()
+            raise
+        except Exception:
+            self.__failed()
+            PyTango.Except.throw_exception(
+                str(sys.exc_info()[0]),
+                str(sys.exc_info()[1]),
+                str(sys.exc_info()[2])
+            )
+
+    def is_RecordBatch_allowed(self):
+        """ RecordBatch command State Machine
+
+        :returns: True if the operation allowed
+        :rtype: :obj:`bool`
+        """
+        if self.get_state() in [PyTango.DevState.ON,
+                                PyTango.DevState.OFF,
+                                PyTango.DevState.OPEN,
+                                PyTango.DevState.FAULT,
+                                PyTango.DevState.RUNNING]:
+            return False
+        return True
+
     def CloseEntry(self):
         """ CloseEntry command
 
         :brief: Closes the entry
         """
         self.debug_stream("In CloseEntry()")
+        self.__stopRecordThread()
         state = self.get_state()
         if state != PyTango.DevState.FAULT:
             state = PyTango.DevState.OPEN
@@ -724,27 +1004,67 @@ class NXSDataWriter(PyTango.Device_4Impl):
     def RecordAsynch(self, argin):
         """ RecordAsynch command
 
-        :brief: Records data for one scan step in asynchronous mode
+        :brief: Records data for one scan step in asynchronous mode.
+                If RecordQueueSize > 0 the step is appended to the record
+                queue and it can be sent while the previous steps are
+                still written
         :param argin:  DevString    JSON string with data
         :type argin: :obj:`str`
         """
         self.debug_stream("In RecordAsynch()")
+        if self.recordQueueSize > 0:
+            self.__queueRecord(argin)
+            return
         self.set_state(PyTango.DevState.RUNNING)
         self.rthread = CommandThread(
             self, "record", PyTango.DevState.EXTRACT, [argin])
         self.rthread.start()
 
+    def __queueRecord(self, argin):
+        """ appends the step to the record queue
+
+        :param argin: JSON string with data
+        :type argin: :obj:`str`
+        """
+        if self.pthread is None:
+            self.pthread = RecordThread(
+                self, Queue.Queue(self.recordQueueSize))
+            self.pthread.start()
+        with self.lock:
+            if self.pendingRecords >= self.recordQueueSize:
+                self.warn_stream("Record queue is full")
+                raise Exception("Record queue is full")
+            try:
+                self.pthread.queue.put(argin, block=False)
+            except Queue.Full:
+                self.warn_stream("Record queue is full")
+                raise Exception("Record queue is full")
+            self.pendingRecords += 1
+            self.state_flag = PyTango.DevState.RUNNING
+        self.set_state(None)
+
+    def __stopRecordThread(self):
+        """ stops the thread recording the queued steps
+        """
+        if getattr(self, "pthread", None) is not None:
+            self.pthread.queue.put(None)
+            self.pthread.join()
+            self.pthread = None
+
     def is_RecordAsynch_allowed(self):
         """ RecordAsynch command State Machine
 
         :returns: True if the operation allowed
         :rtype: :obj:`bool`
         """
-        if self.get_state() in [PyTango.DevState.ON,
-                                PyTango.DevState.OFF,
-                                PyTango.DevState.FAULT,
-                                PyTango.DevState.OPEN,
-                                PyTango.DevState.RUNNING]:
+        state = self.get_state()
+        if state == PyTango.DevState.RUNNING and self.pendingRecords > 0:
+            return True
+        if state in [PyTango.DevState.ON,
+                     PyTango.DevState.OFF,
+                     PyTango.DevState.FAULT,
+                     PyTango.DevState.OPEN,
+                     PyTango.DevState.RUNNING]:
             return False
         return True
 
@@ -759,9 +1079,16 @@ class NXSDataWriter(PyTango.Device_4Impl):
             state = PyTango.DevState.OPEN
         self.set_state(PyTango.DevState.RUNNING)
         self.cthread = CommandThread(
-            self, "closeEntry", state)
+            self, self.__closeEntryAfterRecords, state)
         self.cthread.start()
 
+    def __closeEntryAfterRecords(self):
+        """ waits for the queued steps and closes the entry
+            in the command thread
+        """
+        self.__stopRecordThread()
+        self.tdw.closeEntry()
+
     def is_CloseEntryAsynch_allowed(self):
         """ CloseEntryAsynch command State Machine
 
@@ -784,6 +1111,7 @@ class NXSDataWriter(PyTango.Device_4Impl):
         state = self.get_state()
         if state in [PyTango.DevState.EXTRACT]:
             self.CloseEntry()
+        self.__stopRecordThread()
         if state != PyTango.DevState.FAULT:
             state = PyTango.DevState.ON
         self.set_state(PyTango.DevState.RUNNING)
@@ -860,6 +1188,9 @@ class NXSDataWriterClass(PyTango.DeviceClass):
         'Record':
         [[PyTango.DevString, "JSON string with data"],
          [PyTango.DevVoid, ""]],
+        'RecordBatch':
+        [[PyTango.DevVarStringArray, "list of JSON strings with data"],
+         [PyTango.DevVoid, ""]],
         'CloseEntry':
         [[PyTango.DevVoid, ""],
          [PyTango.DevVoid, ""]],
@@ -951,6 +1282,49 @@ class NXSDataWriterClass(PyTango.DeviceClass):
              'description': "Number of steps per file",
              'Memorized': "true"
         }],
+        'BufferSize':
+        [[PyTango.DevLong,
+          PyTango.SCALAR,
+          PyTango.READ_WRITE],
+         {
+             'label': "Buffer size",
+             'description': "Default number of steps collected by growing"
+             " fields before writing them with one H5 call."
+             " If it is smaller than 2 steps are written directly."
+             " The buffer attribute of the strategy tag overrides it",
+             'Memorized': "true"
+        }],
+        'BufferTime':
+        [[PyTango.DevDouble,
+          PyTango.SCALAR,
+          PyTango.READ_WRITE],
+         {
+             'label': "Buffer time",
+             'description': "Default maximal time in ms of collecting steps"
+             " by growing fields before writing them."
+             " If it is 0 the time is not checked."
+             " The buffertime attribute of the strategy tag overrides it",
+             'Memorized': "true"
+        }],
+        'RecordQueueSize':
+        [[PyTango.DevLong,
+          PyTango.SCALAR,
+          PyTango.READ_WRITE],
+         {
+             'label': "Record queue size",
+             'description': "Maximal number of steps queued by RecordAsynch."
+             " If it is larger than 0 RecordAsynch accepts a new step"
+             " while the previous ones are written. By default it is 0",
+             'Memorized': "true"
+        }],
+        'RecordQueueDepth':
+        [[PyTango.DevLong,
+          PyTango.SCALAR,
+          PyTango.READ],
+         {
+             'label': "Record queue depth",
+             'description': "Number of queued steps which are not written",
+        }],
     }
 
     def __init__(self, name):
@@ -223,6 +223,13 @@ class NexusXMLHandler(sax.ContentHandler):
                             weakref.ref(self._streams)
                             if self._streams else None),
                         reloadmode=self.__reloadmode))
+                if hasattr(self.__stack[-1], "nsteps"):
+                    if self.__json and "nsteps" in self.__json:
+                        self.__stack[-1].nsteps = max(
+                            int(self.__json["nsteps"] or 0), 0)
+                    elif getattr(self.__datasources(), "nsteps", 0):
+                        self.__stack[-1].nsteps = \
+                            self.__datasources().nsteps
             elif name in self.elementClass:
                 self.__stack.append(
                     self.elementClass[name](
@@ -234,6 +241,12 @@ class NexusXMLHandler(sax.ContentHandler):
                    and self.__datasources().canfail \
                    and hasattr(self.__stack[-1], "setCanFail"):
                     self.__stack[-1].setCanFail()
+                if (getattr(self.__datasources(), "buffersize", 0) or
+                        getattr(self.__datasources(), "buffertime", 0)) \
+                   and hasattr(self.__stack[-1], "setBuffer"):
+                    self.__stack[-1].setBuffer(
+                        self.__datasources().buffersize,
+                        self.__datasources().buffertime)
             elif name not in self.transparentTags:
                 if self.raiseUnsupportedTag:
                     if self._streams:
@@ -298,6 +311,11 @@ class NexusXMLHandler(sax.ContentHandler):
             else:
                 strategy = res
 
+        if strategy == 'STEP' \
+                and getattr(self.__datasources(), "autogroup", False) \
+                and hasattr(getattr(task, "source", None), "setAutoGroup"):
+            task.source.setAutoGroup(trigger)
+
         if trigger and strategy == 'STEP':
             if trigger not in self.triggerPools.keys():
                 self.triggerPools[trigger] = ThreadPool(
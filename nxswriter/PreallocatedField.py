@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Growing H5 field with preallocated steps """
+
+import numbers
+
+
+class PreallocatedField(object):
+
+    """ growing H5 field with rows reserved in the first dimension
+
+    :brief: It provides the interface of the wrapped field with the shape
+            of the written rows. Growing the first dimension only moves
+            the row counter while the reserved rows are not used up.
+    """
+
+    def __init__(self, field, capacity, reserve=None):
+        """ constructor
+
+        :param field: wrapped H5 field
+        :type field: :class:`nxswriter.FileWriter.FTField`
+        :param capacity: expected number of rows
+        :type capacity: :obj:`int`
+        :param reserve: number of rows reserved when the capacity is
+                        exceeded, capacity if None
+        :type reserve: :obj:`int`
+        """
+        #: (:class:`nxswriter.FileWriter.FTField`) wrapped H5 field
+        self.field = field
+        #: (:obj:`int`) expected number of rows
+        self.capacity = max(int(capacity), 1)
+        #: (:obj:`int`) number of rows reserved when the capacity is exceeded
+        self.reserve = max(int(reserve or capacity), 1)
+        #: (:obj:`int`) number of written rows
+        self.__rows = field.shape[0]
+
+    def __getattr__(self, name):
+        """ provides attributes of the wrapped field
+
+        :param name: attribute name
+        :type name: :obj:`str`
+        :returns: attribute value
+        :rtype: :obj:`any`
+        """
+        return getattr(self.field, name)
+
+    def __getShape(self):
+        """ get method for the shape of written rows
+
+        :returns: field shape
+        :rtype: :obj:`tuple` <:obj:`int`>
+        """
+        return tuple([self.__rows] + list(self.field.shape)[1:])
+
+    #: shape of written rows
+    shape = property(__getShape,
+                     doc='(:obj:`tuple` <:obj:`int`>) shape of written rows')
+
+    def __getSize(self):
+        """ get method for the size of written rows
+
+        :returns: field size
+        :rtype: :obj:`int`
+        """
+        size = 1
+        for dm in self.shape:
+            size *= dm
+        return size
+
+    #: size of written rows
+    size = property(__getSize,
+                    doc='(:obj:`int`) number of items in written rows')
+
+    def __getReserved(self):
+        """ get method for the number of allocated rows
+
+        :returns: number of allocated rows
+        :rtype: :obj:`int`
+        """
+        return self.field.shape[0]
+
+    #: number of allocated rows
+    reserved = property(__getReserved,
+                        doc='(:obj:`int`) number of allocated rows')
+
+    def grow(self, dim=0, ext=1):
+        """ grows the field
+
+        :param dim: growing dimension
+        :type dim: :obj:`int`
+        :param ext: size of the grow
+        :type ext: :obj:`int`
+        """
+        if dim:
+            return self.field.grow(dim, ext)
+        self.__rows += ext
+        allocated = self.field.shape[0]
+        if self.__rows > allocated:
+            if allocated < self.capacity:
+                step = self.capacity - allocated
+            else:
+                step = self.reserve
+            self.field.grow(0, max(self.__rows - allocated, step))
+
+    def trim(self):
+        """ shrinks the field to the written rows
+        """
+        allocated = self.field.shape[0]
+        if allocated > self.__rows:
+            self.field.grow(0, self.__rows - allocated)
+
+    def __index(self, t):
+        """ maps the index of the first dimension to the written rows
+
+        :brief: Ellipsis, negative indices and open or negative slice
+                bounds are taken with respect to the written rows
+        :param t: slice tuple
+        :type t: :obj:`tuple`
+        :returns: slice tuple of written rows
+        :rtype: :obj:`tuple`
+        """
+        if isinstance(t, tuple):
+            if not t:
+                return slice(0, self.__rows)
+            if t[0] is not Ellipsis:
+                return (self.__index(t[0]),) + t[1:]
+            if len(t) <= len(self.field.shape):
+                return (slice(0, self.__rows), Ellipsis) + t[1:]
+            return t
+        if t is Ellipsis:
+            return slice(0, self.__rows)
+        if isinstance(t, slice):
+            if t.step is None or t.step > 0:
+                start, stop, _ = t.indices(self.__rows)
+                return slice(start, stop, t.step)
+            return t
+        if isinstance(t, numbers.Integral) and t < 0:
+            return t + self.__rows
+        return t
+
+    def __getitem__(self, t):
+        """ get value
+
+        :param t: slice tuple
+        :type t: :obj:`tuple`
+        :returns: value of written rows
+        :rtype: :obj:`any`
+        """
+        return self.field[self.__index(t)]
+
+    def __setitem__(self, t, o):
+        """ set value
+
+        :param t: slice tuple
+        :type t: :obj:`tuple`
+        :param o: written value
+        :type o: :obj:`any`
+        """
+        self.field[self.__index(t)] = o
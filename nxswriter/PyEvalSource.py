@@ -20,13 +20,17 @@
 """ Definitions of PYEVAL datasource """
 
 import threading
+import collections
 import copy
+import hashlib
 import sys
+import numpy
 import xml.etree.ElementTree as et
 from lxml.etree import XMLParser
 
 from .Types import NTP
 
+from .ClientSource import ClientSource
 from .DataHolder import DataHolder
 from .DataSources import DataSource
 from .Errors import DataSourceSetupError
@@ -38,11 +42,156 @@ class Variables(object):
     """
 
 
+class PyEvalInput(object):
+
+    """ input of PyEval datasource fetched by a worker thread
+    """
+
+    #: (:class:`threading.local`) thread data with the nested flag
+    #:    of inputs fetched inside other inputs
+    local = DataSource.local
+
+    def __init__(self, name, source, streams=None):
+        """ constructor
+
+        :param name: input name
+        :type name: :obj:`str`
+        :param source: input datasource
+        :type source: :class:`nxswriter.DataSources.DataSource`
+        :param streams: tango-like steamset class
+        :type streams: :class:`StreamSet` or :class:`PyTango.Device_4Impl`
+        """
+        #: (:obj:`str`) input name
+        self.name = name
+        #: (:class:`nxswriter.DataSources.DataSource`) input datasource
+        self.source = source
+        #: (:obj:`any`) fetched value
+        self.value = None
+        #: (:obj:`str`) error message
+        self.error = None
+        #: (:obj:`Exception`) raised exception
+        self.exception = None
+        #: (:class:`StreamSet` or :class:`PyTango.Device_4Impl`) stream set
+        self._streams = streams
+
+    def run(self):
+        """ fetches the input value
+
+        :brief: Read-only arrays, e.g. shared tango reads, are copied,
+                so scripts can change their inputs in place
+        """
+        nested = getattr(self.local, "nested", False)
+        self.local.nested = True
+        try:
+            dt = self.source.getData()
+            value = None
+            if dt:
+                dh = DataHolder(streams=self._streams, **dt)
+                if dh and hasattr(dh, "value"):
+                    value = dh.value
+                    if isinstance(value, numpy.ndarray) \
+                            and not value.flags.writeable:
+                        value = value.copy()
+            self.value = value
+        except Exception as e:
+            self.exception = e
+            self.error = str(e)
+        finally:
+            self.local.nested = nested
+
+    @classmethod
+    def isNested(cls):
+        """ checks if the current thread fetches an input
+
+        :returns: True if the current thread fetches an input
+        :rtype: :obj:`bool`
+        """
+        return getattr(cls.local, "nested", False)
+
+
+class PyEvalCodeCache(object):
+
+    """ cache of compiled PyEval scripts shared by the whole process
+    """
+
+    def __init__(self, maxsize=1024):
+        """ constructor
+
+        :param maxsize: maximal number of stored scripts
+        :type maxsize: :obj:`int`
+        """
+        #: (:obj:`int`) maximal number of stored scripts
+        self.maxsize = maxsize
+        #: (:obj:`int`) number of scripts found in the cache
+        self.hits = 0
+        #: (:obj:`int`) number of compiled scripts
+        self.misses = 0
+        #: (:class:`collections.OrderedDict` <:obj:`str`, :obj:`tuple`>)
+        #:     scripts with their code objects ordered by the use
+        self.__codes = collections.OrderedDict()
+        #: (:class:`threading.Lock`) threading lock
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def key(cls, script):
+        """ provides the cache key of the script
+
+        :param script: python script
+        :type script: :obj:`str`
+        :returns: hash of the script
+        :rtype: :obj:`str`
+        """
+        return hashlib.sha1(script.encode("utf-8")).hexdigest()
+
+    def __len__(self):
+        """ provides the number of stored scripts
+
+        :returns: number of stored scripts
+        :rtype: :obj:`int`
+        """
+        with self.__lock:
+            return len(self.__codes)
+
+    def get(self, script):
+        """ provides the compiled script
+
+        :param script: python script
+        :type script: :obj:`str`
+        :returns: code object
+        :rtype: :obj:`types.CodeType`
+        :raises: :exc:`SyntaxError` if the script cannot be compiled
+        """
+        script = script.strip()
+        key = self.key(script)
+        with self.__lock:
+            item = self.__codes.pop(key, None)
+            if item is not None and item[0] == script:
+                self.__codes[key] = item
+                self.hits += 1
+                return item[1]
+        code = compile(script, "<string>", "exec")
+        with self.__lock:
+            self.misses += 1
+            self.__codes[key] = (script, code)
+            while len(self.__codes) > max(self.maxsize, 0):
+                self.__codes.popitem(last=False)
+        return code
+
+    def clear(self):
+        """ removes all stored scripts
+        """
+        with self.__lock:
+            self.__codes.clear()
+
+
 class PyEvalSource(DataSource):
 
     """ Python Eval data source
     """
 
+    #: (:class:`PyEvalCodeCache`) compiled scripts shared by the process
+    codes = PyEvalCodeCache()
+
     def __init__(self, streams=None):
         """ constructor
 
@@ -70,6 +219,8 @@ class PyEvalSource(DataSource):
         self.__datasources = {}
         #: (:obj:`str`) python script
         self.__script = ""
+        #: (:obj:`types.CodeType`) compiled python script
+        self.__code = None
         #: (:obj:`bool`) True if common block used
         self.__commonblock = False
         #: (:class:`threading.Lock`) lock for common block
@@ -154,6 +305,12 @@ class PyEvalSource(DataSource):
         else:
             self.__commonblock = False
 
+        try:
+            self.__code = self.codes.get(self.__script)
+        except SyntaxError:
+            # the error is raised by getData()
+            self.__code = None
+
     #
     def __str__(self):
         """ self-description
@@ -199,29 +356,29 @@ class PyEvalSource(DataSource):
                 "PyEvalSource::getData() - PyEval datasource not set up")
 
         ds = Variables()
-        for name, source in self.__datasources.items():
-            if name in self.__script:
-                dt = source.getData()
-                value = None
-                if dt:
-                    dh = DataHolder(streams=self._streams, **dt)
-                    if dh and hasattr(dh, "value"):
-                        value = dh.value
-                setattr(ds, name, value)
+        for inp in self.__fetchInputs():
+            if inp.exception is not None:
+                raise inp.exception
+            setattr(ds, inp.name, inp.value)
 
         setattr(ds, self.__name, None)
 
+        code = self.__code
+        if code is None:
+            code = self.codes.get(self.__script)
         if not self.__commonblock:
-            exec(self.__script.strip(), {}, {"ds": ds})
+            exec(code, {}, {"ds": ds})
             rec = getattr(ds, self.__name)
         else:
             rec = None
             with self.__lock:
-                exec(self.__script.strip(), {}, {
+                exec(code, {}, {
                     "ds": ds, "commonblock": self.__common})
                 rec = copy.deepcopy(getattr(ds, self.__name))
         ntp = NTP()
-        rank, shape, dtype = ntp.arrayRankShape(rec)
+        rank, shape, dtype, value = ntp.arrayRankShapeValue(rec)
+        if not PyEvalInput.isNested():
+            rec = value
         if rank in NTP.rTf:
             if shape is None:
                 shape = [1, 0]
@@ -231,6 +388,48 @@ class PyEvalSource(DataSource):
                     "tangoDType": NTP.pTt[dtype],
                     "shape": shape}
 
+    def __fetchInputs(self):
+        """ fetches values of the inputs used by the script
+
+        :brief: Inputs other than CLIENT ones are fetched concurrently
+                by the input workers of the datasource pool if there
+                are more of them
+        :returns: fetched inputs
+        :rtype: :obj:`list` <:class:`PyEvalInput`>
+        """
+        inputs = [PyEvalInput(name, source, self._streams)
+                  for name, source in self.__datasources.items()
+                  if name in self.__script]
+        workers = getattr(self.__pool, "inputworkers", None)
+        remote = [inp for inp in inputs
+                  if not isinstance(inp.source, ClientSource)]
+        if workers is None or not workers.running or len(remote) < 2 \
+                or PyEvalInput.isNested():
+            remote = []
+        batch = workers.submit(remote) if remote else None
+        for inp in inputs:
+            if batch is None or inp not in remote:
+                inp.run()
+        if batch is not None:
+            batch.wait()
+        return inputs
+
+    def usesJSONContext(self):
+        """ checks if the datasource reads JSON objects
+            from the JSON context of its datasource pool
+
+        :returns: True if JSON objects do not need to be set by setJSON
+        :rtype: :obj:`bool`
+        """
+        if not hasattr(self.__pool, "jsoncontext"):
+            return False
+        for source in self.__datasources.values():
+            if hasattr(source, "setJSON") and not (
+                    hasattr(source, "usesJSONContext")
+                    and source.usesJSONContext()):
+                return False
+        return True
+
     def setDecoders(self, decoders):
         """ sets the used decoders
 
@@ -272,6 +471,9 @@ class PyEvalSource(DataSource):
             if name in self.__script:
                 if pool and pool.hasDataSource(inp[0]):
                     self.__datasources[name] = pool.get(inp[0])()
+                    if hasattr(self.__datasources[name], "deferred") \
+                            and getattr(pool, "deferproxies", False):
+                        self.__datasources[name].deferred = True
                     self.__datasources[name].setup(inp[1])
                     if hasattr(self.__datasources[name], "setJSON") \
                             and self.__globalJSON:
@@ -23,7 +23,6 @@ import os
 import shutil
 
 from xml import sax
-import json
 import sys
 import gc
 import weakref
@@ -41,7 +40,10 @@ from nxstools import filewriter as FileWriter
 from .H5Elements import EFile
 from .EGroup import EGroup
 from .DecoderPool import DecoderPool
+from .DataHolder import DataHolder
 from .DataSourcePool import DataSourcePool
+from .JSONDecoder import JSONDecoder
+from .WorkerPool import WorkerPool
 
 
 WRITERS = {}
@@ -109,6 +111,9 @@ class TangoDataWriter(object):
         self.__xmlsettings = ""
         #: (:obj:`str`) global JSON string with data records
         self.__json = "{}"
+        #: (:obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>) \
+        #:     parsed global JSON string, None if not parsed yet
+        self.__globalJSON = None
         #: (:obj:`str`) nexus parent path of (name, type)
         self.__parents = []
         #: (:obj:`int`) maximal number of threads
@@ -125,6 +130,9 @@ class TangoDataWriter(object):
         #:  :class:`nxswriter.ThreadPool.ThreadPool` >) \
         #:     collection of thread pool with triggered STEP elements
         self.__triggerPools = {}
+        #: (:class:`nxswriter.WorkerPool.WorkerPool`) \
+        #:     long-lived worker threads shared by the entry thread pools
+        self.__workers = None
         #: (:class:`nxswriter.FileWriter.FTGroup`) H5 file handle
         self.__nxRoot = None
         #: (:obj: `list` <:class:`nxswriter.FileWriter.FTGroup` >)
@@ -220,6 +228,141 @@ class TangoDataWriter(object):
     canfail = property(__getCanFail, __setCanFail,
                        doc='(:obj:`bool`) the global can fail flag')
 
+    def __getBufferSize(self):
+        """ get method for the global write-behind buffer size
+
+        :returns: number of buffered steps
+        :rtype: :obj:`int`
+        """
+        return self.__datasources.buffersize
+
+    def __setBufferSize(self, size):
+        """ set method for the global write-behind buffer size
+
+        :param size: number of buffered steps, if < 2 steps are not buffered
+        :type size: :obj:`int`
+        """
+        self.__datasources.buffersize = max(int(size), 0)
+
+    #: the global write-behind buffer size
+    buffersize = property(
+        __getBufferSize, __setBufferSize,
+        doc='(:obj:`int`) number of steps buffered by growing fields')
+
+    def __getBufferTime(self):
+        """ get method for the global write-behind buffer time
+
+        :returns: maximal buffering time in ms
+        :rtype: :obj:`float`
+        """
+        return self.__datasources.buffertime
+
+    def __setBufferTime(self, time):
+        """ set method for the global write-behind buffer time
+
+        :brief: The time is checked only when the next step is recorded,
+                so without further steps buffered data is written
+                in closeEntry
+        :param time: maximal buffering time in ms, if <= 0 it is not used
+        :type time: :obj:`float`
+        """
+        self.__datasources.buffertime = max(float(time), 0)
+
+    #: the global write-behind buffer time
+    buffertime = property(
+        __getBufferTime, __setBufferTime,
+        doc='(:obj:`float`) maximal time in ms of buffering steps')
+
+    def __getAutoGroup(self):
+        """ get method for the automatic grouping of tango attributes
+
+        :returns: True if tango attributes are grouped automatically
+        :rtype: :obj:`bool`
+        """
+        return self.__datasources.autogroup
+
+    def __setAutoGroup(self, autogroup):
+        """ set method for the automatic grouping of tango attributes
+
+        :param autogroup: True if tango attributes are grouped automatically
+        :type autogroup: :obj:`bool`
+        """
+        self.__datasources.autogroup = bool(autogroup)
+
+    #: the automatic grouping of tango attributes
+    autogroup = property(
+        __getAutoGroup, __setAutoGroup,
+        doc='(:obj:`bool`) read STEP tango attributes of each device'
+        ' and trigger by one call')
+
+    def __getAsynchGroups(self):
+        """ get method for the asynchronous reading of tango groups
+
+        :returns: True if devices of tango groups are read concurrently
+        :rtype: :obj:`bool`
+        """
+        return self.__datasources.asynchgroups
+
+    def __setAsynchGroups(self, asynch):
+        """ set method for the asynchronous reading of tango groups
+
+        :param asynch: True if devices of tango groups are read concurrently
+        :type asynch: :obj:`bool`
+        """
+        self.__datasources.asynchgroups = bool(asynch)
+
+    #: the asynchronous reading of tango groups
+    asynchgroups = property(
+        __getAsynchGroups, __setAsynchGroups,
+        doc='(:obj:`bool`) read devices of tango groups'
+        ' by concurrent asynchronous calls')
+
+    def __getProxyTimeout(self):
+        """ get method for the total time of setting tango proxies up
+
+        :returns: time in seconds or None for the default time
+        :rtype: :obj:`float`
+        """
+        return self.__datasources.proxytimeout
+
+    def __setProxyTimeout(self, timeout):
+        """ set method for the total time of setting tango proxies up
+
+        :param timeout: time in seconds, if < 0 the default time is used
+        :type timeout: :obj:`float`
+        """
+        timeout = float(timeout) if timeout is not None else -1
+        self.__datasources.proxytimeout = timeout if timeout >= 0 else None
+
+    #: the total time of setting tango proxies up
+    proxytimeout = property(
+        __getProxyTimeout, __setProxyTimeout,
+        doc='(:obj:`float`) total time in seconds of setting'
+        ' a tango proxy up after a lost connection')
+
+    def __getDBCacheTime(self):
+        """ get method for the time of reusing INIT and FINAL query results
+
+        :returns: time in seconds, 0 if results are not reused
+        :rtype: :obj:`float`
+        """
+        return self.__datasources.dbqueries.ttl
+
+    def __setDBCacheTime(self, ttl):
+        """ set method for the time of reusing INIT and FINAL query results
+
+        :param ttl: time in seconds, 0 if results are not reused
+        :type ttl: :obj:`float`
+        """
+        self.__datasources.dbqueries.ttl = max(float(ttl or 0), 0.)
+
+    #: the time of reusing INIT and FINAL query results
+    dbcachetime = property(
+        __getDBCacheTime, __setDBCacheTime,
+        doc='(:obj:`float`) time in seconds of reusing results of INIT'
+        ' and FINAL database queries in the following entries'
+        ' of the file')
+
     def __getDefaultCanFail(self):
         """ get method for the global can fail flag
 
@@ -257,15 +400,53 @@ class TangoDataWriter(object):
         :type jsonstring: :obj:`str`
         """
 
-        self.__decoders.appendUserDecoders(json.loads(jsonstring))
-        self.__datasources.appendUserDataSources(json.loads(jsonstring))
+        globalJSON = JSONDecoder.loads(jsonstring)
+        self.__decoders.appendUserDecoders(globalJSON)
+        self.__datasources.appendUserDataSources(globalJSON)
         self.__json = jsonstring
+        self.__globalJSON = globalJSON
 
     def __delJSON(self):
         """  del method for jsonrecord attribute
         """
 
         del self.__json
+        self.__globalJSON = None
+
+    def __getGlobalJSON(self):
+        """ provides the parsed global JSON string
+
+        :returns: global JSON object parsed once after setting jsonrecord
+        :rtype: :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        """
+        if self.__globalJSON is None:
+            self.__globalJSON = JSONDecoder.loads(self.jsonrecord)
+        return self.__globalJSON
+
+    def __shareJSON(self, pool, localJSON=None, globalJSON=None):
+        """ sets JSON objects of the current step for the thread pool
+            and starts a new run of datasources
+
+        :brief: Datasources read the JSON objects from the JSON context
+                of the datasource pool, only the other ones get them
+                by setJSON
+        :param pool: thread pool
+        :type pool: :class:`nxswriter.ThreadPool.ThreadPool`
+        :param localJSON: local JSON object with data records
+        :type localJSON: \
+        :     :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        :param globalJSON: global JSON object, parsed jsonrecord if None
+        :type globalJSON: \
+        :     :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        """
+        if globalJSON is None:
+            globalJSON = self.__getGlobalJSON()
+        context = self.__datasources.jsoncontext
+        if context is None or context.globalJSON is not globalJSON \
+                or context.localJSON is not localJSON:
+            self.__datasources.setJSON(globalJSON, localJSON)
+        pool.updateJSON(globalJSON, localJSON)
+        self.__datasources.startRun()
 
     #: the json data string
     jsonrecord = property(__getJSON, __setJSON, __delJSON,
@@ -467,23 +648,29 @@ class TangoDataWriter(object):
             pars["libver"] = "latest"
         return pars
 
-    def openEntry(self):
+    def openEntry(self, nsteps=None):
         """ opens the data entry corresponding to a new XML settings
 
         :brief: It parse the XML settings, creates thread pools
                 and runs the INIT pool.
+        :param nsteps: expected number of steps used to preallocate
+                       growing fields if the global JSON string
+                       does not contain the nsteps key
+        :type nsteps: :obj:`int`
         """
+        self.__datasources.nsteps = max(int(nsteps or 0), 0)
         if self.xmlsettings:
             # flag for INIT mode
             self.__datasources.counter = -1
             self.__datasources.nxroot = self.__nxRoot
+            self.__datasources.setJSON(self.__getGlobalJSON())
             errorHandler = sax.ErrorHandler()
             parser = sax.make_parser()
             handler = NexusXMLHandler(
                 self.__nxPath[-1] if self.__nxPath else self.__eFile,
                 self.__datasources,
                 self.__decoders, self.__fetcher.groupTypes,
-                parser, json.loads(self.jsonrecord),
+                parser, self.__getGlobalJSON(),
                 self._streams,
                 self.skipacquisition
             )
@@ -492,6 +679,9 @@ class TangoDataWriter(object):
             inpsrc = sax.InputSource()
             inpsrc.setByteStream(StringIO(self.xmlsettings))
             parser.parse(inpsrc)
+            self.__datasources.setupProxies(
+                self.numberOfThreads, self._streams)
+            self.__datasources.subscribeEvents(self._streams)
 
             self.__initPool = handler.initPool
             self.__stepPool = handler.stepPool
@@ -506,7 +696,21 @@ class TangoDataWriter(object):
                 self.__triggerPools[pool].numberOfThreads = \
                     self.numberOfThreads
 
-            self.__initPool.setJSON(json.loads(self.jsonrecord))
+            if self.__workers is not None:
+                self.__workers.close()
+            self.__workers = WorkerPool(
+                self.numberOfThreads, streams=self._streams)
+            if self.__datasources.inputworkers is not None:
+                self.__datasources.inputworkers.close()
+            self.__datasources.inputworkers = WorkerPool(
+                self.numberOfThreads, streams=self._streams)
+            self.__initPool.workers = self.__workers
+            self.__stepPool.workers = self.__workers
+            self.__finalPool.workers = self.__workers
+            for pool in self.__triggerPools.values():
+                pool.workers = self.__workers
+
+            self.__shareJSON(self.__initPool)
             if not self.skipacquisition:
                 self.__initPool.runAndWait()
                 self.__initPool.checkErrors()
@@ -568,25 +772,82 @@ class TangoDataWriter(object):
         :param jsonstring: local JSON string with data records
         :type jsonstring: :obj:`str`
         """
+        localJSON = None
+        if jsonstring:
+            localJSON = JSONDecoder.loads(jsonstring)
+
+        self.__recordStep(self.__stepPool, localJSON)
+
+        if self.__nxFile and hasattr(self.__nxFile, "flush"):
+            self.__nxFile.flush()
+        if self.stepsperfile > 0:
+            if (self.__datasources.counter) % self.stepsperfile == 0:
+                self.__flushBuffers()
+                self.__trim()
+                self.__nextfile()
+        self.skipacquisition = False
+
+    def recordBatch(self, jsonstrings):
+        """ runs threads form the STEP pool for a block of steps
+
+        :brief: It records many steps in one call. Growing CLIENT fields
+                are written with one grow and one block write per field,
+                the other fields are recorded step by step
+        :param jsonstrings: local JSON strings with data records
+        :type jsonstrings: :obj:`list` <:obj:`str`>
+        """
+        if self.stepsperfile > 0 or self.skipacquisition \
+                or self.__stepPool is None:
+            skip = self.skipacquisition
+            for jsonstring in jsonstrings:
+                self.skipacquisition = skip
+                self.record(jsonstring)
+            self.skipacquisition = False
+            return
+
+        localJSONs = [JSONDecoder.loads(jsonstring) if jsonstring else None
+                      for jsonstring in jsonstrings]
+        globalJSON = self.__getGlobalJSON()
+        blockPool, stepPool = self.__stepPool.split(
+            lambda el: hasattr(el, "fetchBatch")
+            and el.fetchBatch(globalJSON, localJSONs))
+
+        for localJSON in localJSONs:
+            self.__recordStep(stepPool, localJSON, globalJSON)
+        blockPool.writeBatch()
+        blockPool.checkErrors()
+
+        if self.__nxFile and hasattr(self.__nxFile, "flush"):
+            self.__nxFile.flush()
+        self.skipacquisition = False
+
+    def __recordStep(self, stepPool, localJSON, globalJSON=None):
+        """ runs threads of one step from the STEP and trigger pools
+
+        :param stepPool: pool with STEP elements
+        :type stepPool: :class:`nxswriter.ThreadPool.ThreadPool`
+        :param localJSON: local JSON string with data records
+        :type localJSON: \
+        :     :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        :param globalJSON: global JSON string, parsed jsonrecord if None
+        :type globalJSON: \
+        :     :obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, any>>
+        """
         # flag for STEP mode
         if self.__datasources.counter > 0:
             self.__datasources.counter += 1
         else:
             self.__datasources.counter = 1
 
-        localJSON = None
-        if jsonstring:
-            localJSON = json.loads(jsonstring)
-
-        if self.__stepPool:
+        if stepPool:
             self._streams.info(
                 "TangoDataWriter::record() - Default trigger",
                 False
             )
-            self.__stepPool.setJSON(json.loads(self.jsonrecord), localJSON)
+            self.__shareJSON(stepPool, localJSON, globalJSON)
             if not self.skipacquisition:
-                self.__stepPool.runAndWait()
-                self.__stepPool.checkErrors()
+                stepPool.runAndWait()
+                stepPool.checkErrors()
 
         triggers = None
         if localJSON and 'triggers' in localJSON.keys():
@@ -599,18 +860,40 @@ class TangoDataWriter(object):
                         "TangoDataWriter:record() - Trigger: %s" % pool,
                         False
                     )
-                    self.__triggerPools[pool].setJSON(
-                        json.loads(self.jsonrecord), localJSON)
+                    self.__shareJSON(
+                        self.__triggerPools[pool], localJSON, globalJSON)
                     if not self.skipacquisition:
                         self.__triggerPools[pool].runAndWait()
                         self.__triggerPools[pool].checkErrors()
 
-        if self.__nxFile and hasattr(self.__nxFile, "flush"):
-            self.__nxFile.flush()
-        if self.stepsperfile > 0:
-            if (self.__datasources.counter) % self.stepsperfile == 0:
-                self.__nextfile()
-        self.skipacquisition = False
+        if DataHolder.debugCopies:
+            self._streams.debug(
+                "TangoDataWriter::record() - Step %s: cast copies: %s" % (
+                    self.__datasources.counter,
+                    DataHolder.resetCopyCounter()),
+                False
+            )
+
+    def __flushBuffers(self):
+        """ writes steps collected in write-behind buffers
+            of the STEP and trigger pools
+        """
+        pools = list(self.__triggerPools.values())
+        if self.__stepPool:
+            pools.insert(0, self.__stepPool)
+        for pool in pools:
+            pool.flushBuffers()
+        for pool in pools:
+            pool.checkErrors()
+
+    def __trim(self):
+        """ shrinks preallocated fields of the STEP and trigger pools
+            to the written steps
+        """
+        if self.__stepPool:
+            self.__stepPool.trim()
+        for pool in self.__triggerPools.values():
+            pool.trim()
 
     def __updateNXRoot(self):
         fname = self.__filenames[-1]
@@ -628,6 +911,8 @@ class TangoDataWriter(object):
         :brief: It runs threads from the FINAL pool and
                 removes the thread pools
         """
+        self.__flushBuffers()
+        self.__trim()
         # flag for FINAL mode
         if self.stepsperfile > 0:
             os.remove(self.__fileName)
@@ -642,7 +927,7 @@ class TangoDataWriter(object):
             # self.__logGroup = None
 
         if self.__finalPool:
-            self.__finalPool.setJSON(json.loads(self.jsonrecord))
+            self.__shareJSON(self.__finalPool)
             if not self.skipacquisition:
                 self.__finalPool.runAndWait()
             if self.stepsperfile > 0:
@@ -655,6 +940,8 @@ class TangoDataWriter(object):
             if not self.skipacquisition:
                 self.__finalPool.checkErrors()
         self.skipacquisition = False
+        self.__datasources.unsubscribeEvents()
+        self.__datasources.closeConnections()
 
         if self.__initPool:
             self.__initPool.close()
@@ -673,54 +960,89 @@ class TangoDataWriter(object):
                 self.__triggerPools[pool].close()
             self.__triggerPools = {}
 
+        if self.__workers is not None:
+            self.__workers.close()
+        self.__workers = None
+        if self.__datasources.inputworkers is not None:
+            self.__datasources.inputworkers.close()
+        self.__datasources.inputworkers = None
+
         if self.addingLogs and self.__logGroup:
             self.__logGroup.close()
 
         if self.__nxFile and hasattr(self.__nxFile, "flush"):
             self.__nxFile.flush()
 
+        interfaces = self.__datasources.common.get('TANGO_INTERFACES')
+        if interfaces is not None:
+            self._streams.debug(
+                "TangoDataWriter::closeEntry() - "
+                "Tango interface cache: %s hits, %s misses, ratio %.3f" % (
+                    interfaces.hits, interfaces.misses,
+                    interfaces.hitRatio()),
+                False
+            )
+
         gc.collect()
 
     def closeFile(self):
         """ the H5 file closing
 
-        :brief: It closes the H5 file
+        :brief: It closes the H5 file. Buffered steps of an entry
+                which was not closed are written and its preallocated
+                fields are trimmed. Errors of these steps are raised
+                after the file is closed
         """
-        self.__currentfileid = 0
-        if self.__nxRoot:
-            self.__nxRoot.currentfileid = self.__currentfileid
-
-        if self.__initPool:
-            self.__initPool.close()
-            self.__initPool = None
-
-        if self.__stepPool:
-            self.__stepPool.close()
-            self.__stepPool = None
-
-        if self.__finalPool:
-            self.__finalPool.close()
-            self.__finalPool = None
-
-        if self.__triggerPools:
-            for pool in self.__triggerPools.keys():
-                self.__triggerPools[pool].close()
-            self.__triggerPools = {}
-
-        if self.__nxRoot:
-            self.__nxRoot.close()
-        if self.__nxFile:
-            self.__nxFile.close()
-
-        if self.addingLogs and self.__logGroup:
-            self.__logGroup.close()
-
-        self.__nxPath = []
-        self.__nxRoot = None
-        self.__nxFile = None
-        self.__eFile = None
-        self.__logGroup = None
-        gc.collect()
+        try:
+            try:
+                self.__flushBuffers()
+            finally:
+                self.__trim()
+        finally:
+            self.__currentfileid = 0
+            if self.__nxRoot:
+                self.__nxRoot.currentfileid = self.__currentfileid
+
+            if self.__initPool:
+                self.__initPool.close()
+                self.__initPool = None
+
+            if self.__stepPool:
+                self.__stepPool.close()
+                self.__stepPool = None
+
+            if self.__finalPool:
+                self.__finalPool.close()
+                self.__finalPool = None
+
+            if self.__triggerPools:
+                for pool in self.__triggerPools.keys():
+                    self.__triggerPools[pool].close()
+                self.__triggerPools = {}
+
+            if self.__workers is not None:
+                self.__workers.close()
+            self.__workers = None
+            if self.__datasources.inputworkers is not None:
+                self.__datasources.inputworkers.close()
+            self.__datasources.inputworkers = None
+            self.__datasources.closeConnections()
+            self.__datasources.dbqueries.clear()
+
+            if self.__nxRoot:
+                self.__nxRoot.close()
+            if self.__nxFile:
+                self.__nxFile.close()
+
+            if self.addingLogs and self.__logGroup:
+                self.__logGroup.close()
+
+            self.__nxPath = []
+            self.__nxRoot = None
+            self.__nxFile = None
+            self.__eFile = None
+            self.__logGroup = None
+            gc.collect()
 
 
 if __name__ == "__main__":
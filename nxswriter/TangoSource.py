@@ -23,6 +23,8 @@ import sys
 import time
 import threading
 import socket
+import collections
+import numpy
 import xml.etree.ElementTree as et
 from lxml.etree import XMLParser
 
@@ -30,6 +32,7 @@ from .Types import NTP
 
 from .DataSources import DataSource
 from .Errors import (PackageError, DataSourceSetupError)
+from .WorkerPool import WorkerPool
 
 
 try:
@@ -42,24 +45,157 @@ except ImportError as e:
     sys.stdout.flush()
 
 
+class TgProxyPool(object):
+
+    """ pool of device proxies shared by all writers of the process
+    """
+
+    def __init__(self, maxsize=256, idletime=3600.):
+        """ constructor
+
+        :param maxsize: maximal number of stored proxies
+        :type maxsize: :obj:`int`
+        :param idletime: time in seconds after which unused proxies
+                         are removed
+        :type idletime: :obj:`float`
+        """
+        #: (:obj:`int`) maximal number of stored proxies
+        self.maxsize = maxsize
+        #: (:obj:`float`) time in seconds after which unused proxies
+        #:     are removed
+        self.idletime = idletime
+        #: (:class:`collections.OrderedDict` <:obj:`str`, :obj:`tuple`>)
+        #:     proxies with their last use time ordered by the use
+        self.__proxies = collections.OrderedDict()
+        #: (:class:`threading.Lock`) threading lock
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def normalize(cls, device):
+        """ provides the pool key of the device
+
+        :param device: tango device name
+        :type device: :obj:`str`
+        :returns: lower case device name without the protocol
+        :rtype: :obj:`str`
+        """
+        key = device.decode() if isinstance(device, bytes) else str(device)
+        key = key.strip().lower()
+        if key.startswith("tango://"):
+            key = key[8:]
+        return key
+
+    def __len__(self):
+        """ provides the number of stored proxies
+
+        :returns: number of stored proxies
+        :rtype: :obj:`int`
+        """
+        with self.__lock:
+            return len(self.__proxies)
+
+    def __evict(self):
+        """ removes idle proxies and the least recently used ones
+            exceeding the maximal size
+        """
+        if self.idletime is not None:
+            limit = time.time() - self.idletime
+            for key in [key for key, (_, used) in self.__proxies.items()
+                        if used < limit]:
+                self.__proxies.pop(key)
+        while len(self.__proxies) > max(self.maxsize, 0):
+            self.__proxies.popitem(last=False)
+
+    def get(self, device):
+        """ provides the stored proxy of the device
+
+        :param device: tango device name
+        :type device: :obj:`str`
+        :returns: device proxy or None if it is not stored
+        :rtype: :class:`PyTango.DeviceProxy`
+        """
+        key = self.normalize(device)
+        with self.__lock:
+            self.__evict()
+            item = self.__proxies.pop(key, None)
+            if item is None:
+                return None
+            self.__proxies[key] = (item[0], time.time())
+            return item[0]
+
+    def put(self, device, proxy):
+        """ stores the proxy of the device
+
+        :param device: tango device name
+        :type device: :obj:`str`
+        :param proxy: device proxy
+        :type proxy: :class:`PyTango.DeviceProxy`
+        """
+        key = self.normalize(device)
+        with self.__lock:
+            self.__proxies.pop(key, None)
+            self.__proxies[key] = (proxy, time.time())
+            self.__evict()
+
+    def remove(self, device, proxy=None):
+        """ removes the proxy of the device
+
+        :param device: tango device name
+        :type device: :obj:`str`
+        :param proxy: removed proxy, any proxy of the device if None
+        :type proxy: :class:`PyTango.DeviceProxy`
+        """
+        key = self.normalize(device)
+        with self.__lock:
+            item = self.__proxies.get(key)
+            if item is not None and (proxy is None or item[0] is proxy):
+                self.__proxies.pop(key)
+
+    def clear(self):
+        """ removes all proxies
+        """
+        with self.__lock:
+            self.__proxies.clear()
+
+
 class ProxyTools(object):
 
     """ tools for proxy
     """
 
+    #: (:class:`TgProxyPool`) proxies shared by all writers of the process
+    proxies = TgProxyPool()
+
+    #: (:obj:`float`) default total time in seconds of setting a proxy up
+    timeout = 10.
+
+    #: (:obj:`list` <:obj:`str`>) reasons of tango errors
+    #:    caused by lost connection to the device
+    connectionReasons = [
+        "API_CantConnectToDevice", "API_DeviceNotExported",
+        "API_DeviceTimedOut", "API_CorbaException",
+        "API_CommunicationFailed", "API_ServerNotRunning",
+        "API_DeviceNotDefined"]
+
     @classmethod
-    def proxySetup(cls, device, streams=None):
+    def proxySetup(cls, device, streams=None, timeout=None):
         """ sets the Tango proxy up
 
+        :brief: The device is pinged with an exponentially growing delay
+                until it answers or the timeout is exceeded
         :param device: tango device
         :type device: :obj:`str`
         :param streams: tango-like steamset class
         :type streams: :class:`StreamSet` or :class:`PyTango.Device_4Impl`
+        :param timeout: total time of setting up in seconds,
+                        :attr:`ProxyTools.timeout` if None
+        :type timeout: :obj:`float`
         :returns: proxy if proxy is set up
         :rtype: :class:`PyTango.DeviceProxy`
         """
-        found = False
-        cnt = 0
+        deadline = time.time() + (
+            cls.timeout if timeout is None else timeout)
+        delay = 0.01
 
         try:
             proxy = PyTango.DeviceProxy(device)
@@ -73,18 +209,112 @@ class ProxyTools(object):
                     std=False)
             raise
 
-        while not found and cnt < 1000:
-            if cnt > 1:
-                time.sleep(0.01)
+        while True:
             try:
                 proxy.ping()
-                found = True
+                return proxy
             except Exception:
-                time.sleep(0.01)
-                found = False
-            cnt += 1
-        if found:
-            return proxy
+                if time.time() + delay > deadline:
+                    return
+            time.sleep(delay)
+            delay = min(2 * delay, 1.)
+
+    @classmethod
+    def getProxy(cls, device, streams=None, timeout=None):
+        """ provides the proxy from the proxy pool or sets a new one up
+
+        :param device: tango device
+        :type device: :obj:`str`
+        :param streams: tango-like steamset class
+        :type streams: :class:`StreamSet` or :class:`PyTango.Device_4Impl`
+        :param timeout: total time of setting up in seconds,
+                        :attr:`ProxyTools.timeout` if None
+        :type timeout: :obj:`float`
+        :returns: proxy if proxy is set up
+        :rtype: :class:`PyTango.DeviceProxy`
+        """
+        proxy = cls.proxies.get(device)
+        if proxy is None:
+            proxy = cls.proxySetup(device, streams=streams, timeout=timeout)
+            if proxy is not None:
+                cls.proxies.put(device, proxy)
+        return proxy
+
+    @classmethod
+    def isConnectionError(cls, error):
+        """ checks if the error is caused by lost connection to the device
+
+        :param error: raised exception
+        :type error: :class:`Exception`
+        :returns: True for connection errors
+        :rtype: :obj:`bool`
+        """
+        if not PYTANGO_AVAILABLE:
+            return False
+        if isinstance(error, (PyTango.ConnectionFailed,
+                              PyTango.CommunicationFailed)):
+            return True
+        if isinstance(error, PyTango.DevFailed):
+            try:
+                return any(err.reason in cls.connectionReasons
+                           for err in error.args)
+            except Exception:
+                return False
+        return False
+
+    @classmethod
+    def setupProxies(cls, sources, numberOfThreads=None, timeout=None,
+                     streams=None):
+        """ sets proxies of deferred TANGO datasources up in parallel
+
+        :brief: Every device without a proxy in the proxy pool is set up
+                once by a bounded pool of threads within the common
+                timeout and its proxy is bound to all its datasources
+        :param sources: TANGO datasources without proxies
+        :type sources: :obj:`list` <:class:`TangoSource`>
+        :param numberOfThreads: maximal number of threads
+        :type numberOfThreads: :obj:`int`
+        :param timeout: total time of setting up in seconds,
+                        :attr:`ProxyTools.timeout` if None
+        :type timeout: :obj:`float`
+        :param streams: tango-like steamset class
+        :type streams: :class:`StreamSet` or :class:`PyTango.Device_4Impl`
+        """
+        devices = {}
+        for source in sources:
+            proxy = cls.proxies.get(source.device)
+            if proxy is not None:
+                source.setProxy(proxy)
+                continue
+            if source.device not in devices:
+                devices[source.device] = []
+            devices[source.device].append(source)
+        if not devices:
+            return
+        deadline = time.time() + (cls.timeout if timeout is None else timeout)
+        jobs = [TgProxyJob(device, deadline) for device in devices.keys()]
+        workers = WorkerPool(numberOfThreads, streams=streams)
+        try:
+            workers.submit(jobs).wait(max(deadline - time.time(), 0) + 1.)
+        finally:
+            workers.close(0)
+
+        failed = []
+        for job in jobs:
+            if job.proxy is None:
+                failed.append(job.device)
+            else:
+                cls.proxies.put(job.device, job.proxy)
+                for source in devices[job.device]:
+                    source.setProxy(job.proxy)
+        if failed:
+            if streams:
+                streams.error(
+                    "ProxyTools::setupProxies() - "
+                    "Cannot connect to: %s" % ", ".join(failed),
+                    std=False)
+            raise DataSourceSetupError(
+                "Cannot connect to: %s" % ", ".join(failed))
 
     @classmethod
     def isProxyValid(cls, proxy):
@@ -105,6 +335,126 @@ class ProxyTools(object):
         return not failed
 
 
+class TgProxyJob(object):
+
+    """ job setting a proxy of one device up
+    """
+
+    def __init__(self, device, deadline):
+        """ constructor
+
+        :param device: tango device name
+        :type device: :obj:`str`
+        :param deadline: time after which the setup is abandoned
+        :type deadline: :obj:`float`
+        """
+        #: (:obj:`str`) tango device name
+        self.device = device
+        #: (:obj:`float`) time after which the setup is abandoned
+        self.deadline = deadline
+        #: (:class:`PyTango.DeviceProxy`) device proxy if set up
+        self.proxy = None
+        #: (:obj:`str`) error message
+        self.error = None
+
+    def run(self):
+        """ sets the proxy up
+        """
+        self.proxy = ProxyTools.proxySetup(
+            self.device, timeout=max(self.deadline - time.time(), 0))
+
+
+class TgDeviceHealth(object):
+
+    """ connection state of a tango device shared by its datasources
+    """
+
+    #: (:obj:`float`) delay in seconds before the first reconnect
+    #:     after a failed setup
+    backoff = 0.1
+    #: (:obj:`float`) maximal delay in seconds between reconnects
+    maxbackoff = 30.
+
+    def __init__(self, device, proxy=None, timeout=None):
+        """ constructor
+
+        :param device: tango device name
+        :type device: :obj:`str`
+        :param proxy: device proxy
+        :type proxy: :class:`PyTango.DeviceProxy`
+        :param timeout: total time of one reconnect in seconds,
+                        :attr:`ProxyTools.timeout` if None
+        :type timeout: :obj:`float`
+        """
+        #: (:obj:`str`) tango device name
+        self.device = device
+        #: (:class:`PyTango.DeviceProxy`) working device proxy
+        self.proxy = proxy
+        #: (:obj:`float`) total time of one reconnect in seconds
+        self.timeout = timeout
+        #: (:obj:`int`) number of failed reconnects in a row
+        self.failures = 0
+        #: (:obj:`float`) time before which reconnects fail immediately
+        self.retrytime = 0
+        #: (:class:`threading.Lock`) threading lock
+        self.lock = threading.Lock()
+
+    def getProxy(self, streams=None):
+        """ provides the working proxy or sets a new one up
+
+        :brief: A device which could not be set up fails immediately
+                until its exponentially growing backoff time passes
+        :param streams: tango-like steamset class
+        :type streams: :class:`StreamSet` or :class:`PyTango.Device_4Impl`
+        :returns: device proxy
+        :rtype: :class:`PyTango.DeviceProxy`
+        """
+        with self.lock:
+            if self.proxy is not None:
+                return self.proxy
+            if time.time() < self.retrytime:
+                if streams:
+                    streams.error(
+                        "TgDeviceHealth::getProxy() - "
+                        "Device %s is not responding" % self.device,
+                        std=False)
+                raise DataSourceSetupError(
+                    "Device %s is not responding" % self.device)
+            proxy = None
+            try:
+                proxy = ProxyTools.getProxy(
+                    self.device, streams=streams, timeout=self.timeout)
+            finally:
+                if proxy is None:
+                    self.failures += 1
+                    self.retrytime = time.time() + min(
+                        self.backoff * 2 ** (self.failures - 1),
+                        self.maxbackoff)
+            if proxy is None:
+                if streams:
+                    streams.error(
+                        "TgDeviceHealth::getProxy() - "
+                        "Setting up lasts to long: %s" % self.device,
+                        std=False)
+                raise DataSourceSetupError(
+                    "Setting up lasts to long: %s" % self.device)
+            self.failures = 0
+            self.retrytime = 0
+            self.proxy = proxy
+            return proxy
+
+    def markFailed(self, proxy):
+        """ drops the proxy after a connection error
+
+        :param proxy: device proxy which failed
+        :type proxy: :class:`PyTango.DeviceProxy`
+        """
+        with self.lock:
+            if proxy is self.proxy:
+                self.proxy = None
+        ProxyTools.proxies.remove(self.device, proxy)
+
+
 class TangoSource(DataSource):
 
     """ Tango data source
@@ -130,6 +480,10 @@ class TangoSource(DataSource):
         self.__pool = None
         #: (:class:`PyTango.DeviceProxy`) device proxy
         self.__proxy = None
+        #: (:class:`TgInterfaceCache`) cache of device member lists
+        self.__interfaces = None
+        #: (:class:`TgDeviceHealth`) connection state of the device
+        self.__health = None
 
         #: (:obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>) \
         #:     the current  static JSON object
@@ -144,6 +498,23 @@ class TangoSource(DataSource):
         self.client = None
         #: (:obj:`str`) client datasource for mixed CLIENT/TANGO mode with fqdn
         self.fullclient = None
+        #: (:obj:`tuple` <:obj:`tuple`, :obj:`list` <:obj:`str`>>)
+        #:     client datasources with their normalized JSON keys
+        #:     for mixed CLIENT/TANGO mode
+        self.__clientkeys = None
+        #: (:obj:`bool`) proxy is set up after parsing
+        #:     by :meth:`ProxyTools.setupProxies`
+        self.deferred = False
+        #: (:obj:`tuple` <:obj:`str`>) hostname, port, device and record
+        #:     of the mixed CLIENT/TANGO mode waiting for the proxy
+        self.__clientinfo = None
+        #: (:obj:`bool`) attribute values are received by tango events
+        self.eventmode = False
+        #: (:obj:`float`) maximal age in seconds of values received
+        #:     by events, :attr:`TgEventCache.maxage` if None
+        self.maxage = None
+        #: (:class:`TgEventCache`) values of the attribute received by events
+        self.__events = None
 
     def __str__(self):
         """ self-description
@@ -205,10 +576,17 @@ class TangoSource(DataSource):
             if not memberType or memberType not in [
                     "attribute", "command", "property"]:
                 memberType = "attribute"
-            if group != '__CLIENT__':
-                self.group = group
-            else:
+            self.eventmode = (dv.get("mode") == "event"
+                              and memberType == "attribute")
+            if self.eventmode and dv.get("maxage"):
+                try:
+                    self.maxage = float(dv.get("maxage"))
+                except ValueError:
+                    self.maxage = None
+            if group == '__CLIENT__':
                 client = True
+            elif not self.eventmode:
+                self.group = group
             self.member = TgMember(
                 name, memberType, encoding, streams=self._streams)
         if not device:
@@ -234,10 +612,17 @@ class TangoSource(DataSource):
         elif device:
             self.device = "%s" % (edevice)
 
-        self.__proxy = ProxyTools.proxySetup(
+        self.__proxy = None
+        self.__clientinfo = None
+        if hostname and port and device and client:
+            self.__clientinfo = (ehostname, eport, edevice, name)
+        if self.deferred:
+            return
+
+        proxy = ProxyTools.getProxy(
             self.device, streams=self._streams)
 
-        if not self.__proxy:
+        if not proxy:
             if self._streams:
                 self._streams.error(
                     "TangoSource::setup() - "
@@ -246,9 +631,19 @@ class TangoSource(DataSource):
 
             raise DataSourceSetupError(
                 "Cannot connect to: %s \ndefined by %s" % (self.device, xml))
-        if hostname and port and device and client:
+        self.setProxy(proxy)
+
+    def setProxy(self, proxy):
+        """ binds the device proxy to the datasource
+
+        :param proxy: device proxy
+        :type proxy: :class:`PyTango.DeviceProxy`
+        """
+        self.__proxy = proxy
+        if self.__clientinfo is not None:
+            ehostname, eport, edevice, name = self.__clientinfo
             try:
-                host = self.__proxy.get_db_host().split(".")[0]
+                host = proxy.get_db_host().split(".")[0]
             except Exception:
                 host = ehostname.split(".")[0]
             self.client = "%s:%s/%s/%s" % (
@@ -259,6 +654,9 @@ class TangoSource(DataSource):
                 socket.getfqdn(host), eport,
                 edevice, name.lower()
             )
+            self.__clientinfo = None
+        if self.__health is not None and self.__health.proxy is None:
+            self.__health.proxy = proxy
 
     def setDecoders(self, decoders):
         """ sets the used decoders
@@ -268,35 +666,51 @@ class TangoSource(DataSource):
         """
         self.__decoders = decoders
 
-    def __tryclient(self, fullclient):
+    def usesJSONContext(self):
+        """ checks if the datasource reads JSON objects
+            from the JSON context of its datasource pool
+
+        :returns: True if JSON objects do not need to be set by setJSON
+        :rtype: :obj:`bool`
+        """
+        return hasattr(self.__pool, "jsoncontext")
+
+    def __tryclient(self):
         """ data provider from client
 
-        :param fullclient: data key name
-        :type fullclient: :obj:`str:obj:`
+        :brief: The precomputed client keys are looked up
+                in the normalized key indexes of the JSON data
         :returns: dictionary with collected data
         :rtype: {'rank': :obj:`str`, 'value': any, 'tangoDType': :obj:`str`, \
         :        'shape': :obj:`list` <int>, 'encoding': :obj:`str`, \
         :        'decoders': :obj:`str`}
         """
         res = None
-        fclient = "/".join((fullclient or "").split('/')[:-1])
-        sclient = "/".join(self.client.split('/')[:-1])
-        clients = [
-            "tango://%s" % fullclient,
-            fullclient,
-            fclient,
-            "tango://%s" % fclient,
-            "tango://%s" % self.client,
-            self.client,
-            sclient,
-            "tango://%s" % sclient
-        ]
-        try:
-            res = self._getJSONData(
-                clients,
-                self.__globalJSON, self.__localJSON)
-        except Exception:
-            res = None
+        globalJSON, localJSON = self.__globalJSON, self.__localJSON
+        context = getattr(self.__pool, "jsoncontext", None)
+        if context is not None:
+            globalJSON, localJSON = context.globalJSON, context.localJSON
+        clients = (self.client, self.fullclient)
+        if self.__clientkeys is None or self.__clientkeys[0] != clients:
+            keys = []
+            for cl in clients[::-1]:
+                if cl:
+                    for key in [cl, "/".join(cl.split('/')[:-1])]:
+                        key = self._normalizeKey(key)
+                        if key not in keys:
+                            keys.append(key)
+            self.__clientkeys = (clients, keys)
+        lindex = self._getJSONIndex(localJSON)
+        gindex = self._getJSONIndex(globalJSON)
+        for key in self.__clientkeys[1]:
+            name = lindex.get(key, gindex.get(key))
+            if name is not None:
+                try:
+                    res = self._getJSONData(name, globalJSON, localJSON)
+                except Exception:
+                    res = None
+                if res:
+                    break
         return res
 
     def getData(self):
@@ -307,14 +721,12 @@ class TangoSource(DataSource):
         :        'shape': :obj:`list` <int>, 'encoding': :obj:`str`, \
         :        'decoders': :obj:`str`}
         """
+        if self.__clientinfo is not None:
+            self.setProxy(self.__getProxy())
         if self.client:
-            res = self.__tryclient(self.fullclient)
+            res = self.__tryclient()
             if res:
                 return res
-            if self.fullclient is not None:
-                res = self.__tryclient(self.fullclient.lower())
-                if res:
-                    return res
         if not PYTANGO_AVAILABLE:
             if self._streams:
                 self._streams.error(
@@ -326,42 +738,94 @@ class TangoSource(DataSource):
                 "Support for PyTango datasources not available")
 
         if self.device and self.member.memberType and self.member.name:
-            if not self.__proxy or not ProxyTools.isProxyValid(self.__proxy):
-                self.__proxy = ProxyTools.proxySetup(
-                    self.device, streams=self._streams)
-                if not self.__proxy:
-                    if self._streams:
-                        self._streams.error(
-                            "TangoSource::getData() - "
-                            "Setting up lasts to long: %s" % self.device,
-                            std=False)
-
-                    raise DataSourceSetupError(
-                        "Setting up lasts to long: %s" % self.device)
-
-            if self.group is None:
-                self.member.getData(self.__proxy)
-            else:
-                if not hasattr(self.__tngrp, "getData"):
-                    if self._streams:
-                        self._streams.error(
-                            "TangoSource::getData() - "
-                            "DataSource pool not set up",
-                            std=False)
+            reads = getattr(self.__pool, "tangoreads", None)
+            if reads is not None and self.group is None \
+                    and self.member.memberType in ["attribute", "property"]:
+                return reads.fetch(
+                    (TgProxyPool.normalize(self.device),
+                     self.member.memberType, self.member.name,
+                     self.member.encoding),
+                    self.__read)
+            return self.__read()
+
+    def __read(self):
+        """ reads the member data from the device
 
-                    raise DataSourceSetupError("DataSource pool not set up")
+        :returns: dictionary with collected data
+        :rtype: {'rank': :obj:`str`, 'value': any, 'tangoDType': :obj:`str`, \
+        :        'shape': :obj:`list` <int>, 'encoding': :obj:`str`, \
+        :        'decoders': :obj:`str`}
+        """
+        if self.__events is not None:
+            data = self.__events.getData()
+            if data is not None:
+                self.member.reset()
+                self.member.setData(data)
+                return self.member.getValue(self.__decoders)
+        self.__proxy = self.__getProxy()
+        try:
+            self.__fetch()
+        except Exception as e:
+            if not ProxyTools.isConnectionError(e):
+                raise
+            if self.__health is not None:
+                self.__health.markFailed(self.__proxy)
+            self.__proxy = None
+            self.__proxy = self.__getProxy()
+            self.__fetch()
+        if self.__events is not None:
+            self.__events.update(self.member.getRawData())
+
+        if hasattr(self.__tngrp, "lock"):
+            self.__tngrp.lock.acquire()
+        try:
+            val = self.member.getValue(self.__decoders)
+        finally:
+            if hasattr(self.__tngrp, "lock"):
+                self.__tngrp.lock.release()
+        return val
 
-                self.__tngrp.getData(
-                    self.__pool.counter, self.__proxy, self.member)
+    def __getProxy(self):
+        """ provides device proxy without pinging the device
 
-            if hasattr(self.__tngrp, "lock"):
-                self.__tngrp.lock.acquire()
-            try:
-                val = self.member.getValue(self.__decoders)
-            finally:
-                if hasattr(self.__tngrp, "lock"):
-                    self.__tngrp.lock.release()
-            return val
+        :returns: device proxy
+        :rtype: :class:`PyTango.DeviceProxy`
+        """
+        if self.__health is not None:
+            return self.__health.getProxy(self._streams)
+        if not self.__proxy:
+            self.__proxy = ProxyTools.getProxy(
+                self.device, streams=self._streams)
+            if not self.__proxy:
+                if self._streams:
+                    self._streams.error(
+                        "TangoSource::getData() - "
+                        "Setting up lasts to long: %s" % self.device,
+                        std=False)
+
+                raise DataSourceSetupError(
+                    "Setting up lasts to long: %s" % self.device)
+        return self.__proxy
+
+    def __fetch(self):
+        """ reads the member data from the device
+        """
+        if self.group is None:
+            self.member.getData(
+                self.__proxy, self.__interfaces, self.device)
+        else:
+            if not hasattr(self.__tngrp, "getData"):
+                if self._streams:
+                    self._streams.error(
+                        "TangoSource::getData() - "
+                        "DataSource pool not set up",
+                        std=False)
+
+                raise DataSourceSetupError("DataSource pool not set up")
+
+            self.__tngrp.getData(
+                self.__pool.counter, self.__proxy, self.member,
+                self.device)
 
     def setDataSources(self, pool):
         """ sets the datasources
@@ -375,11 +839,39 @@ class TangoSource(DataSource):
         try:
             if 'TANGO' not in self.__pool.common.keys():
                 self.__pool.common['TANGO'] = {}
+            if 'TANGO_INTERFACES' not in self.__pool.common.keys():
+                self.__pool.common['TANGO_INTERFACES'] = TgInterfaceCache()
+            self.__interfaces = self.__pool.common['TANGO_INTERFACES']
+            if 'TANGO_HEALTH' not in self.__pool.common.keys():
+                self.__pool.common['TANGO_HEALTH'] = {}
+            health = self.__pool.common['TANGO_HEALTH']
+            if self.device not in health:
+                health[self.device] = TgDeviceHealth(self.device)
+            self.__health = health[self.device]
+            self.__health.timeout = getattr(pool, "proxytimeout", None)
+            if self.__health.proxy is None and self.__proxy is not None:
+                self.__health.proxy = self.__proxy
+            if self.deferred and self.__proxy is None:
+                if 'TANGO_PENDING' not in self.__pool.common.keys():
+                    self.__pool.common['TANGO_PENDING'] = []
+                self.__pool.common['TANGO_PENDING'].append(self)
+            if self.eventmode:
+                if 'TANGO_EVENTS' not in self.__pool.common.keys():
+                    self.__pool.common['TANGO_EVENTS'] = {}
+                events = self.__pool.common['TANGO_EVENTS']
+                key = (self.device, self.member.name.lower())
+                if key not in events:
+                    events[key] = TgEventCache(
+                        self.device, self.member.name, self.maxage)
+                self.__events = events[key]
             if self.group:
                 if self.group not in self.__pool.common['TANGO'].keys():
                     self.__pool.common['TANGO'][self.group] = TgGroup(
                         streams=self._streams)
                 self.__tngrp = self.__pool.common['TANGO'][self.group]
+                self.__tngrp.interfaces = self.__interfaces
+                self.__tngrp.health = health
+                self.__tngrp.asynch = getattr(pool, "asynchgroups", False)
 
                 self.__tngrp.lock.acquire()
                 tdv = self.__tngrp.getDevice(self.device)
@@ -390,6 +882,37 @@ class TangoSource(DataSource):
                 self.__tngrp.lock.release()
             pool.lock.release()
 
+    def setAutoGroup(self, trigger=None):
+        """ adds the attribute without group to the automatic group
+            of its trigger
+
+        :brief: All STEP attributes of one device and trigger are
+                read by one read_attributes() call, errors of single
+                attributes are raised only by their datasources
+        :param trigger: trigger name of the STEP field
+        :type trigger: :obj:`str`
+        """
+        if self.group is not None or self.__pool is None \
+                or self.member.memberType != "attribute" or self.client \
+                or self.eventmode:
+            return
+        pool = self.__pool
+        with pool.lock:
+            self.group = "__AUTO__%s" % (trigger or "")
+            if self.group not in pool.common['TANGO'].keys():
+                pool.common['TANGO'][self.group] = TgGroup(
+                    streams=self._streams)
+                pool.common['TANGO'][self.group].isolated = True
+            self.__tngrp = pool.common['TANGO'][self.group]
+            self.__tngrp.interfaces = self.__interfaces
+            self.__tngrp.health = pool.common.get('TANGO_HEALTH')
+            self.__tngrp.asynch = getattr(pool, "asynchgroups", False)
+            with self.__tngrp.lock:
+                tdv = self.__tngrp.getDevice(self.device)
+                if tdv.proxy is None:
+                    tdv.proxy = self.__proxy
+                self.member = tdv.setMember(self.member)
+
 
 class TgGroup(object):
 
@@ -411,9 +934,46 @@ class TgGroup(object):
         self.counter = counter
         #: (:obj:`dict` <:obj:`str`,  :class:`TgDevice`> ) TANGO devices
         self.devices = {}
+        #: (:class:`TgInterfaceCache`) cache of device member lists
+        self.interfaces = None
+        #: (:obj:`dict` <:obj:`str`, :class:`TgDeviceHealth`>) \
+        #:     connection states of devices
+        self.health = None
+        #: (:obj:`bool`) errors of single attributes are kept
+        #:     in their members instead of failing the whole group
+        self.isolated = False
+        #: (:obj:`bool`) devices are read by concurrent asynchronous calls
+        self.asynch = False
         #: (:class:`StreamSet` or :class:`PyTango.Device_4Impl`) stream set
         self._streams = streams
 
+    def __hasMember(self, proxy, memberType, name, device=None):
+        """ checks if the device provides the member
+
+        :param proxy: given proxy
+        :type proxy: :class:`PyTango.DeviceProxy`
+        :param memberType: member type, i.e. attribute, property or command
+        :type memberType: :obj:`str`
+        :param name: member name
+        :type name: :obj:`str`
+        :param device: device name, the member list is not cached if None
+        :type device: :obj:`str`
+        :returns: True if the device provides the member
+        :rtype: :obj:`bool`
+        """
+        if self.interfaces is not None and device:
+            return self.interfaces.hasMember(device, proxy, memberType, name)
+        return name.lower() in TgInterfaceCache.fetchNames(proxy, memberType)
+
+    def __invalidate(self, device=None):
+        """ drops cached member lists of the device after a read failure
+
+        :param device: device name
+        :type device: :obj:`str`
+        """
+        if self.interfaces is not None and device:
+            self.interfaces.invalidate(device)
+
     def getDevice(self, device):
         """ provides tango device
 
@@ -434,16 +994,50 @@ class TgGroup(object):
         :type device: :class:`TgDevice`
         """
 
+        attr = self.__checkAttributes(device)
+        if not attr:
+            return
+        try:
+            res = device.proxy.read_attributes(attr)
+        except Exception as e:
+            self.__invalidate(device.device)
+            if not self.isolated or ProxyTools.isConnectionError(e):
+                raise
+            res = []
+            for a in attr:
+                try:
+                    res.append(device.proxy.read_attribute(a))
+                except Exception as ae:
+                    if ProxyTools.isConnectionError(ae):
+                        raise
+                    res.append(ae)
+        self.__setAttributes(device, attr, res)
+
+    def __checkAttributes(self, device):
+        """ provides attributes of the device which can be read
+
+        :param device: given device
+        :type device: :class:`TgDevice`
+        :returns: attribute names
+        :rtype: :obj:`list` <:obj:`str`>
+        """
+
         attr = device.attributes
-        alist = device.proxy.get_attribute_list()
-        alist = [a.lower() for a in alist]
 
         errors = []
         for a in attr:
             ea = a if sys.version_info > (3,) else a.encode()
-            if ea.lower() not in alist:
+            if not self.__hasMember(
+                    device.proxy, "attribute", ea, device.device):
                 errors.append((a, device.device))
-        if errors:
+        if errors and self.isolated:
+            missing = [er[0] for er in errors]
+            for a in missing:
+                device.members[a].setError(
+                    "attribute %s not in tango device %s attributes"
+                    % (a, device.device))
+            attr = [a for a in attr if a not in missing]
+        elif errors:
             if self._streams:
                 self._streams.error(
                     "TgGroup::getData() - "
@@ -455,69 +1049,95 @@ class TgGroup(object):
                 "TgGroup::getData() - "
                 "attribute not in tango "
                 "device attributes:%s" % errors)
+        return attr
+
+    def __setAttributes(self, device, attr, res):
+        """ sets read attribute data to members of the device
 
-        res = device.proxy.read_attributes(attr)
+        :param device: given device
+        :type device: :class:`TgDevice`
+        :param attr: attribute names
+        :type attr: :obj:`list` <:obj:`str`>
+        :param res: read attributes or their errors
+        :type res: :obj:`list` <:class:`PyTango.DeviceAttribute`>
+        """
         for i in range(len(attr)):
             mb = device.members[attr[i]]
-            mb.setData(res[i])
+            if not self.isolated:
+                mb.setData(res[i])
+            elif isinstance(res[i], Exception):
+                mb.setError(str(res[i]))
+            elif getattr(res[i], "has_failed", False):
+                mb.setError("reading of attribute %s of %s failed"
+                            % (attr[i], device.device))
+            else:
+                mb.setData(res[i])
 
-    @classmethod
-    def __fetchAttribute(cls, proxy, member):
+    def __fetchAttribute(self, proxy, member, device=None):
         """ fetches attribute data for given proxy
 
         :param proxy: given proxy
         :type proxy: :class:`PyTango.DeviceProxy`
         :param member: given member
         :type member: :class:`TgMember`
+        :param device: device name
+        :type device: :obj:`str`
         """
 
-        alist = proxy.get_attribute_list()
-        alist = [a.lower() for a in alist]
-        if member.name.lower() in alist:
+        if self.__hasMember(proxy, "attribute", member.name, device):
             emname = member.name if sys.version_info > (3,) \
                 else member.name.encode()
-            da = proxy.read_attribute(emname)
+            try:
+                da = proxy.read_attribute(emname)
+            except Exception:
+                self.__invalidate(device)
+                raise
             member.setData(da)
 
-    @classmethod
-    def __fetchProperty(cls, proxy, member):
+    def __fetchProperty(self, proxy, member, device=None):
         """ fetches property data for given member
 
         :param proxy: given proxy
         :type proxy: :class:`PyTango.DeviceProxy`
         :param member: given member
         :type member: :class:`TgMember`
+        :param device: device name
+        :type device: :obj:`str`
         """
 
-        plist = proxy.get_property_list('*')
-        plist = [a.lower() for a in plist]
         emname = member.name if sys.version_info > (3,) \
             else member.name.encode()
-        if emname.lower() in plist:
-            da = proxy.get_property(emname)[emname]
+        if self.__hasMember(proxy, "property", emname, device):
+            try:
+                da = proxy.get_property(emname)[emname]
+            except Exception:
+                self.__invalidate(device)
+                raise
             member.setData(da)
 
-    @classmethod
-    def __fetchCommand(cls, proxy, member):
+    def __fetchCommand(self, proxy, member, device=None):
         """ fetches command data for given member
 
         :param proxy: given device proxy
         :type proxy: :class:`PyTango.DeviceProxy`
         :param member: given member
         :type member: :class:`TgMember`
+        :param device: device name
+        :type device: :obj:`str`
         """
 
-        clist = [cm.cmd_name
-                 for cm in proxy.command_list_query()]
-        clist = [a.lower() for a in clist]
         emname = member.name if sys.version_info > (3,) \
             else member.name.encode()
-        if emname.lower() in clist:
-            cd = proxy.command_query(emname)
-            da = proxy.command_inout(emname)
+        if self.__hasMember(proxy, "command", emname, device):
+            try:
+                cd = proxy.command_query(emname)
+                da = proxy.command_inout(emname)
+            except Exception:
+                self.__invalidate(device)
+                raise
             member.setData(da, cd)
 
-    def getData(self, counter, proxy=None, member=None):
+    def getData(self, counter, proxy=None, member=None, device=None):
         """ reads data from device proxy
 
         :param counter: counts of scan steps
@@ -526,47 +1146,158 @@ class TgGroup(object):
         :type proxy: :class:`PyTango.DeviceProxy`
         :param member: required member
         :type member: :class:`TgMember`
+        :param device: device name of the required member
+        :type device: :obj:`str`
         """
 
         with self.lock:
             if counter == self.counter:
-                if proxy and member and not member.isDataSet():
+                if proxy and member and not member.isDataSet() \
+                        and not (self.isolated and member.hasError()):
                     if member.memberType == "attribute":
-                        self.__fetchAttribute(proxy, member)
+                        self.__fetchAttribute(proxy, member, device)
                     elif member.memberType == "command":
-                        self.__fetchCommand(proxy, member)
+                        self.__fetchCommand(proxy, member, device)
                     elif member.memberType == "property":
-                        self.__fetchProperty(proxy, member)
+                        self.__fetchProperty(proxy, member, device)
                 return
 
             self.counter = counter
 
-            for dv in self.devices.values():
+            devices = list(self.devices.values())
+            for dv in devices:
                 for mb in dv.members.values():
                     mb.reset()
+                self.__connect(dv)
+
+            requests = {}
+            if self.asynch and len(devices) > 1:
+                for dv in devices:
+                    requests[dv.device] = self.__sendRequests(dv)
+
+            for dv in devices:
+                if requests.get(dv.device) is not None:
+                    try:
+                        self.__gatherReplies(dv, *requests[dv.device])
+                        continue
+                    except Exception:
+                        for mb in dv.members.values():
+                            mb.reset()
+                self.__readDevice(dv)
+
+    def __readDevice(self, device):
+        """ reads data of all members of the device and
+            reconnects it once after a connection error
 
-                if not dv.proxy or not ProxyTools.isProxyValid(dv.proxy):
-                    dv.proxy = ProxyTools.proxySetup(
-                        dv.device, streams=self._streams)
-                    if not dv.proxy:
-                        if self._streams:
-                            self._streams.error(
-                                "TgGroup::getData() - "
-                                "Setting up lasts to long: %s" % dv.device,
-                                std=False)
+        :param device: given device
+        :type device: :class:`TgDevice`
+        """
+        try:
+            self.__fetchDevice(device)
+        except Exception as e:
+            if not ProxyTools.isConnectionError(e):
+                raise
+            health = self.health.get(device.device) \
+                if self.health else None
+            if health is not None:
+                health.markFailed(device.proxy)
+            device.proxy = None
+            self.__connect(device)
+            self.__fetchDevice(device)
+
+    def __sendRequests(self, device):
+        """ starts asynchronous reads of attributes and commands
+            of the device
 
-                        raise DataSourceSetupError(
-                            "TgGroup::getData() - "
-                            "Setting up lasts to long: %s" % dv.device)
+        :param device: given device
+        :type device: :class:`TgDevice`
+        :returns: (attribute names, attribute request id,
+                   command request ids) or None if the requests failed
+        :rtype: (:obj:`list` <:obj:`str`>, :obj:`int`,
+                 :obj:`dict` <:obj:`str`, :obj:`int`>)
+        """
+        try:
+            attr = self.__checkAttributes(device) \
+                if device.attributes else []
+            aid = device.proxy.read_attributes_asynch(attr) \
+                if attr else None
+            cids = {}
+            for mb in device.members.values():
+                if mb.memberType == "command":
+                    emname = mb.name if sys.version_info > (3,) \
+                        else mb.name.encode()
+                    if self.__hasMember(device.proxy, "command",
+                                        emname, device.device):
+                        cids[mb.name] = device.proxy.command_inout_asynch(
+                            emname)
+            return (attr, aid, cids)
+        except Exception:
+            for mb in device.members.values():
+                mb.reset()
 
-                if dv.attributes:
-                    self.__fetchAttributes(dv)
+    def __gatherReplies(self, device, attr, aid, cids):
+        """ waits for replies of asynchronous reads of the device
+            and reads its properties
 
-                for mb in dv.members.values():
-                    if mb.memberType == "property":
-                        self.__fetchProperty(dv.proxy, mb)
-                    elif mb.memberType == "command":
-                        self.__fetchCommand(dv.proxy, mb)
+        :param device: given device
+        :type device: :class:`TgDevice`
+        :param attr: attribute names
+        :type attr: :obj:`list` <:obj:`str`>
+        :param aid: attribute request id
+        :type aid: :obj:`int`
+        :param cids: command request ids
+        :type cids: :obj:`dict` <:obj:`str`, :obj:`int`>
+        """
+        timeout = device.proxy.get_timeout_millis()
+        if aid is not None:
+            res = device.proxy.read_attributes_reply(aid, timeout)
+            self.__setAttributes(device, attr, res)
+        for name, cid in cids.items():
+            emname = name if sys.version_info > (3,) else name.encode()
+            da = device.proxy.command_inout_reply(cid, timeout)
+            cd = device.proxy.command_query(emname)
+            device.members[name].setData(da, cd)
+        for mb in device.members.values():
+            if mb.memberType == "property":
+                self.__fetchProperty(device.proxy, mb, device.device)
+
+    def __connect(self, device):
+        """ provides proxy of the device without pinging it
+
+        :param device: given device
+        :type device: :class:`TgDevice`
+        """
+        health = self.health.get(device.device) if self.health else None
+        if health is not None:
+            device.proxy = health.getProxy(self._streams)
+        elif not device.proxy:
+            device.proxy = ProxyTools.getProxy(
+                device.device, streams=self._streams)
+            if not device.proxy:
+                if self._streams:
+                    self._streams.error(
+                        "TgGroup::getData() - "
+                        "Setting up lasts to long: %s" % device.device,
+                        std=False)
+
+                raise DataSourceSetupError(
+                    "TgGroup::getData() - "
+                    "Setting up lasts to long: %s" % device.device)
+
+    def __fetchDevice(self, device):
+        """ fetches data of all members of the device
+
+        :param device: given device
+        :type device: :class:`TgDevice`
+        """
+        if device.attributes:
+            self.__fetchAttributes(device)
+
+        for mb in device.members.values():
+            if mb.memberType == "property":
+                self.__fetchProperty(device.proxy, mb, device.device)
+            elif mb.memberType == "command":
+                self.__fetchCommand(device.proxy, mb, device.device)
 
 
 class TgDevice(object):
@@ -663,6 +1394,8 @@ class TgMember(object):
         self.__da = None
         #: (:class:`PyTango.CommandInfo`) input command data
         self.__cd = None
+        #: (:obj:`str`) error message of reading the data
+        self.__error = None
         #: (:class:`StreamSet` or :class:`PyTango.Device_4Impl`) stream set
         self._streams = streams
 
@@ -672,6 +1405,17 @@ class TgMember(object):
         self.__value = None
         self.__da = None
         self.__cd = None
+        self.__error = None
+
+    def setError(self, error):
+        """ sets error of reading the data
+
+        :param error: error message
+        :type error: :obj:`str`
+        """
+        self.__da = None
+        self.__cd = None
+        self.__error = error
 
     def setData(self, data, cmd=None):
         """ sets tango data
@@ -685,6 +1429,22 @@ class TgMember(object):
         self.__da = data
         self.__cd = cmd
 
+    def getRawData(self):
+        """ provides tango data
+
+        :returns: output tango data
+        :rtype: :class:`PyTango.DeviceAttribute`
+        """
+        return self.__da
+
+    def hasError(self):
+        """ checks if reading of the data failed
+
+        :returns: True if the error is set
+        :rtype: :obj:`bool`
+        """
+        return self.__error is not None
+
     def isDataSet(self):
         """ checks if data is set
 
@@ -710,6 +1470,16 @@ class TgMember(object):
         """
         if self.__value:
             return self.__value
+        if self.__error is not None:
+            if self._streams:
+                self._streams.error(
+                    "TgMember::getValue() - "
+                    "Reading of %s failed: %s" % (self.name, self.__error),
+                    std=False)
+
+            raise DataSourceSetupError(
+                "TgMember::getValue() -  "
+                "Reading of %s failed: %s" % (self.name, self.__error))
         if self.__da is None:
             if self._streams:
                 self._streams.error(
@@ -766,28 +1536,349 @@ class TgMember(object):
                 "decoders": decoders}
         return self.__value
 
-    def getData(self, proxy):
+    def getData(self, proxy, interfaces=None, device=None):
         """ reads data from device proxy
 
         :param proxy: device proxy
         :type proxy: :class:`PyTango.DeviceProxy`
+        :param interfaces: cache of device member lists
+        :type interfaces: :class:`TgInterfaceCache`
+        :param device: device name, the member list is not cached if None
+        :type device: :obj:`str`
         """
         self.reset()
         ename = self.name if sys.version_info > (3,) else self.name.encode()
-        if self.memberType == "attribute":
-            alist = proxy.get_attribute_list()
-            alist = [a.lower() for a in alist]
-            if ename.lower() in alist:
+        if self.memberType not in ["attribute", "property", "command"]:
+            return
+        if interfaces is not None and device:
+            if not interfaces.hasMember(
+                    device, proxy, self.memberType, ename):
+                return
+        elif ename.lower() not in TgInterfaceCache.fetchNames(
+                proxy, self.memberType):
+            return
+        try:
+            if self.memberType == "attribute":
                 self.__da = proxy.read_attribute(ename)
-        elif self.memberType == "property":
-            plist = proxy.get_property_list('*')
-            plist = [a.lower() for a in plist]
-            if ename.lower() in plist:
+            elif self.memberType == "property":
                 self.__da = proxy.get_property(
                     ename)[ename]
-        elif self.memberType == "command":
-            clist = [cm.cmd_name for cm in proxy.command_list_query()]
-            clist = [a.lower() for a in clist]
-            if ename.lower() in clist:
+            elif self.memberType == "command":
                 self.__cd = proxy.command_query(ename)
                 self.__da = proxy.command_inout(ename)
+        except Exception:
+            if interfaces is not None and device:
+                interfaces.invalidate(device)
+            raise
+
+
+class TgRead(object):
+
+    """ read of a tango device member shared by datasources of one pool run
+    """
+
+    def __init__(self):
+        """ constructor
+        """
+        #: (:class:`threading.Event`) set when the read is finished
+        self.done = threading.Event()
+        #: (:obj:`dict` <:obj:`str`, any>) collected data
+        self.data = None
+        #: (:obj:`Exception`) error of the read
+        self.error = None
+
+
+class TgReadCache(object):
+
+    """ reads of tango attributes and properties shared by datasources
+        of one INIT, STEP or FINAL pool run
+
+    :brief: A member read by many datasources, e.g. by a field and
+            by an input of a PYEVAL field, is read only once.
+            Concurrent datasources wait for the first read.
+            Array values are shared as read-only arrays
+    """
+
+    def __init__(self):
+        """ constructor
+        """
+        #: (:obj:`int`) number of performed reads
+        self.reads = 0
+        #: (:obj:`int`) number of shared results
+        self.shared = 0
+        #: (:obj:`dict` <:obj:`tuple`, :class:`TgRead`>) \
+        #:     reads of the current pool run
+        self.__reads = {}
+        #: (:class:`threading.Lock`) threading lock
+        self.__lock = threading.Lock()
+
+    def start(self):
+        """ starts a new pool run
+        """
+        with self.__lock:
+            self.__reads = {}
+
+    def fetch(self, key, read):
+        """ provides the read result
+
+        :param key: member key, i.e. (device, member type, name, encoding)
+        :type key: :obj:`tuple` <:obj:`str`>
+        :param read: function reading the member
+        :type read: :obj:`callable`
+        :returns: dictionary with collected data
+        :rtype: :obj:`dict` <:obj:`str`, any>
+        """
+        with self.__lock:
+            result = self.__reads.get(key)
+            owner = result is None
+            if owner:
+                result = TgRead()
+                self.__reads[key] = result
+                self.reads += 1
+            else:
+                self.shared += 1
+        if not owner:
+            result.done.wait()
+            if result.error is not None:
+                raise result.error
+            return dict(result.data) if result.data else result.data
+        try:
+            result.data = read()
+            value = result.data.get("value") if result.data else None
+            if isinstance(value, numpy.ndarray):
+                value.flags.writeable = False
+        except Exception as e:
+            result.error = e
+            with self.__lock:
+                if self.__reads.get(key) is result:
+                    self.__reads.pop(key)
+            raise
+        finally:
+            result.done.set()
+        return dict(result.data) if result.data else result.data
+
+
+class TgEventCache(object):
+
+    """ latest value of a tango attribute received by events
+    """
+
+    #: (:obj:`float`) default maximal age in seconds of served values
+    maxage = 3.
+
+    def __init__(self, device, name, maxage=None):
+        """ constructor
+
+        :param device: tango device name
+        :type device: :obj:`str`
+        :param name: attribute name
+        :type name: :obj:`str`
+        :param maxage: maximal age in seconds of served values,
+                       :attr:`TgEventCache.maxage` if None
+        :type maxage: :obj:`float`
+        """
+        #: (:obj:`str`) tango device name
+        self.device = device
+        #: (:obj:`str`) attribute name
+        self.name = name
+        #: (:obj:`float`) maximal age in seconds of served values
+        self.maxage = TgEventCache.maxage if maxage is None else maxage
+        #: (:class:`PyTango.DeviceProxy`) device proxy of the subscription
+        self.proxy = None
+        #: (:obj:`list` <:obj:`int`>) subscribed event ids
+        self.eventids = []
+        #: (:class:`threading.Lock`) threading lock
+        self.lock = threading.Lock()
+        #: (:obj:`int`) number of values served from the cache
+        self.hits = 0
+        #: (:obj:`int`) number of missing or too old values
+        self.misses = 0
+        #: (:class:`PyTango.DeviceAttribute`) the latest value
+        self.__data = None
+        #: (:obj:`float`) receiving time of the latest value
+        self.__time = 0
+
+    def push_event(self, event):
+        """ stores the value of the received event
+
+        :param event: tango event
+        :type event: :class:`PyTango.EventData`
+        """
+        data = None
+        if not getattr(event, "err", False):
+            data = getattr(event, "attr_value", None)
+        with self.lock:
+            self.__data = data
+            self.__time = time.time()
+
+    def getData(self):
+        """ provides the latest value if it is not too old
+
+        :returns: the latest value or None
+        :rtype: :class:`PyTango.DeviceAttribute`
+        """
+        with self.lock:
+            if self.__data is not None \
+                    and time.time() - self.__time <= self.maxage:
+                self.hits += 1
+                return self.__data
+            self.misses += 1
+            return None
+
+    def update(self, data):
+        """ stores the value read synchronously after a missing
+            or too old value
+
+        :brief: The value is stored only if events are subscribed,
+                so slowly changing attributes without periodic events
+                are read again after maxage
+        :param data: the read value
+        :type data: :class:`PyTango.DeviceAttribute`
+        """
+        if data is None:
+            return
+        with self.lock:
+            if self.eventids:
+                self.__data = data
+                self.__time = time.time()
+
+    def subscribe(self, proxy, eventTypes=None, streams=None):
+        """ subscribes the attribute events
+
+        :param proxy: device proxy
+        :type proxy: :class:`PyTango.DeviceProxy`
+        :param eventTypes: event types, change and periodic events if None
+        :type eventTypes: :obj:`list` <:class:`PyTango.EventType`>
+        :param streams: tango-like steamset class
+        :type streams: :class:`StreamSet` or :class:`PyTango.Device_4Impl`
+        :returns: True if any event type is subscribed
+        :rtype: :obj:`bool`
+        """
+        if eventTypes is None:
+            if not PYTANGO_AVAILABLE:
+                return False
+            eventTypes = [PyTango.EventType.CHANGE_EVENT,
+                          PyTango.EventType.PERIODIC_EVENT]
+        ename = self.name if sys.version_info > (3,) else self.name.encode()
+        self.proxy = proxy
+        for etype in eventTypes:
+            try:
+                self.eventids.append(
+                    proxy.subscribe_event(ename, etype, self))
+            except Exception as e:
+                if streams:
+                    streams.debug(
+                        "TgEventCache::subscribe() - "
+                        "Events %s of %s/%s not subscribed: %s"
+                        % (etype, self.device, self.name, str(e)),
+                        False)
+        return bool(self.eventids)
+
+    def unsubscribe(self):
+        """ unsubscribes the attribute events
+        """
+        for eid in self.eventids:
+            try:
+                self.proxy.unsubscribe_event(eid)
+            except Exception:
+                pass
+        self.eventids = []
+        self.proxy = None
+        with self.lock:
+            self.__data = None
+            self.__time = 0
+
+
+class TgInterfaceCache(object):
+
+    """ cache of lowercase attribute, property and command lists
+        of tango devices
+    """
+
+    def __init__(self):
+        """ constructor
+        """
+        #: (:class:`threading.Lock`) threading lock
+        self.lock = threading.Lock()
+        #: (:obj:`dict` <:obj:`str`, :obj:`dict` <:obj:`str`, \
+        #:     :obj:`set` <:obj:`str`>>>) member names of devices
+        #:     with respect to member types
+        self.__members = {}
+        #: (:obj:`int`) number of lookups found in the cache
+        self.hits = 0
+        #: (:obj:`int`) number of lookups which fetched member lists
+        self.misses = 0
+
+    @classmethod
+    def fetchNames(cls, proxy, memberType):
+        """ fetches lowercase member names from the device
+
+        :param proxy: device proxy
+        :type proxy: :class:`PyTango.DeviceProxy`
+        :param memberType: member type, i.e. attribute, property or command
+        :type memberType: :obj:`str`
+        :returns: lowercase member names
+        :rtype: :obj:`set` <:obj:`str`>
+        """
+        if memberType == "attribute":
+            names = proxy.get_attribute_list()
+        elif memberType == "property":
+            names = proxy.get_property_list('*')
+        elif memberType == "command":
+            names = [cm.cmd_name for cm in proxy.command_list_query()]
+        else:
+            names = []
+        return set(a.lower() for a in names)
+
+    def hasMember(self, device, proxy, memberType, name):
+        """ checks if the device provides the member
+
+        :brief: Member lists are fetched only when they are not cached
+                or when they do not contain the member, e.g. after
+                a device restart with a new interface
+        :param device: device name
+        :type device: :obj:`str`
+        :param proxy: device proxy
+        :type proxy: :class:`PyTango.DeviceProxy`
+        :param memberType: member type, i.e. attribute, property or command
+        :type memberType: :obj:`str`
+        :param name: member name
+        :type name: :obj:`str`
+        :returns: True if the device provides the member
+        :rtype: :obj:`bool`
+        """
+        lname = name.lower()
+        with self.lock:
+            names = self.__members.get(device, {}).get(memberType)
+            if names is not None and lname in names:
+                self.hits += 1
+                return True
+        names = self.fetchNames(proxy, memberType)
+        with self.lock:
+            self.misses += 1
+            if device not in self.__members:
+                self.__members[device] = {}
+            self.__members[device][memberType] = names
+        return lname in names
+
+    def invalidate(self, device=None):
+        """ drops cached member lists
+
+        :param device: device name, all devices if None
+        :type device: :obj:`str`
+        """
+        with self.lock:
+            if device is None:
+                self.__members = {}
+            else:
+                self.__members.pop(device, None)
+
+    def hitRatio(self):
+        """ provides the cache hit ratio
+
+        :returns: ratio of lookups found in the cache, 0 without lookups
+        :rtype: :obj:`float`
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            return float(self.hits) / total if total else 0.
@@ -55,6 +55,19 @@ class ThreadPool(object):
         #: (:obj:`list` <:class:`nxswriter.ElementThread.ElementThread`>) \
         #:     list of the threads related to the appended elements
         self.__threadList = []
+        #: (:obj:`list` <:class:`nxswriter.Element.Element`>) \
+        #:    elements with datasources which do not use the JSON context
+        self.__jsonList = None
+
+        #: (:class:`nxswriter.WorkerPool.WorkerPool`) \
+        #:     long-lived worker threads, if None threads are spawned per run
+        self.workers = None
+        #: (:class:`nxswriter.WorkerPool.WorkerBatch`) \
+        #:     batch of elements submitted to the worker threads
+        self.__batch = None
+        #: (:obj:`bool`) if True the worker threads only fetch the data
+        #:     and one writer thread stores them in the element order
+        self.serialWrite = True
 
         #: (:class:`StreamSet` or :class:`PyTango.Device_4Impl`) stream set
         self._streams = streams
@@ -66,6 +79,60 @@ class ThreadPool(object):
         :type elem: :class:`nxswriter.Element.Element`
         """
         self.__elementList.append(elem)
+        self.__jsonList = None
+
+    def split(self, condition):
+        """ splits the pool into two pools sharing the worker threads
+
+        :param condition: function which selects elements
+        :type condition: :obj:`callable`
+        :returns: pools with selected and with the other elements
+        :rtype: (:class:`ThreadPool`, :class:`ThreadPool`)
+        """
+        pools = []
+        for _ in range(2):
+            pool = ThreadPool(self.numberOfThreads, self._streams)
+            pool.workers = self.workers
+            pool.serialWrite = self.serialWrite
+            pools.append(pool)
+        for el in self.__elementList:
+            pools[0 if condition(el) else 1].append(el)
+        return tuple(pools)
+
+    def writeBatch(self):
+        """ writes blocks of steps fetched by elements
+
+        :brief: It calls writeBatch of all elements in the pool order
+        """
+        for el in self.__elementList:
+            el.error = None
+            el.writeBatch()
+
+    def flushBuffers(self):
+        """ writes steps collected in write-behind buffers of elements
+
+        :brief: It calls flushBuffer of all elements in the pool order.
+                Errors of the previous run are cleared for all elements,
+                so checkErrors reports only errors of the flush
+        """
+        for el in self.__elementList:
+            el.error = None
+        for el in self.__elementList:
+            if hasattr(el, "flushBuffer"):
+                try:
+                    el.flushBuffer()
+                except Exception as e:
+                    if hasattr(el, "setMessage"):
+                        el.error = el.setMessage(str(e))
+                    else:
+                        el.error = str(e)
+
+    def trim(self):
+        """ shrinks preallocated H5 objects of elements to written steps
+        """
+        for el in self.__elementList:
+            if hasattr(el, "trim"):
+                el.trim()
 
     def setJSON(self, globalJSON, localJSON=None):
         """ sets the JSON string to threads
@@ -85,6 +152,30 @@ class ThreadPool(object):
                 el.source.setJSON(globalJSON, localJSON)
         return self
 
+    def updateJSON(self, globalJSON, localJSON=None):
+        """ sets the JSON string to threads with datasources
+            which do not read it from the JSON context of the datasource pool
+
+        :param globalJSON: the static JSON string
+        :type globalJSON: \
+        :     :obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>
+        :param localJSON: the dynamic JSON string
+        :type localJSON: \
+        :     :obj:`dict` <:obj:`str` , :obj:`dict` <:obj:`str`, any>>
+        :returns: self object
+        :rtype: :class:`ThreadPool`
+        """
+        if self.__jsonList is None:
+            self.__jsonList = [
+                el for el in self.__elementList
+                if hasattr(el.source, "setJSON")
+                and callable(el.source.setJSON)
+                and not (hasattr(el.source, "usesJSONContext")
+                         and el.source.usesJSONContext())]
+        for el in self.__jsonList:
+            el.source.setJSON(globalJSON, localJSON)
+        return self
+
     def run(self):
         """ thread runner
 
@@ -92,6 +183,12 @@ class ThreadPool(object):
         """
 
         self.__threadList = []
+        self.__batch = None
+        if self.workers is not None and self.workers.running:
+            self.__batch = self.workers.submit(
+                self.__elementList, self.serialWrite)
+            return
+
         self.__elementQueue = Queue.Queue()
 
         for eth in self.__elementList:
@@ -112,6 +209,9 @@ class ThreadPool(object):
         :type timeout: :obj:`int`
         """
 
+        if self.__batch is not None:
+            if self.__batch.wait(timeout):
+                self.__batch = None
         for th in self.__threadList:
             if th.is_alive():
                 th.join(timeout)
@@ -161,4 +261,6 @@ class ThreadPool(object):
                 el.h5Object.close()
         self.__threadList = []
         self.__elementList = []
+        self.__jsonList = None
         self.__elementQueue = None
+        self.__batch = None
@@ -191,10 +191,34 @@ class NTP(object):
         :rtype: (:obj:`int` , :obj:`list` <:obj:`int` > , :obj:`str` )
 
         """
+        return self.arrayRankShapeValue(array)[:3]
+
+    def arrayRankShapeValue(self, array):
+        """ array rank, shape, type and value
+
+        :brief: Non-empty lists and arrays of numbers, booleans or strings
+                are converted once to a numpy array which provides
+                the rank and shape. The type is still taken from
+                the first element. Other values are inspected
+                by their first elements.
+        :param array: given array
+        :type array: any
+        :returns: (rank, shape, type, numpy array or the given array)
+        :rtype: (:obj:`int` , :obj:`list` <:obj:`int` > , :obj:`str` , any)
+        """
+        if isinstance(array, (list, tuple, numpy.ndarray)):
+            try:
+                value = numpy.asarray(array)
+            except (ValueError, TypeError, OverflowError):
+                value = None
+            if value is not None and value.ndim and value.size \
+                    and value.dtype.kind in 'biufSU':
+                pythonDType = self.arrayRankRShape(array)[2]
+                return (value.ndim, list(value.shape), pythonDType, value)
         rank, shape, pythonDType = self.arrayRankRShape(array)
         if shape:
             shape.reverse()
-        return (rank, shape, pythonDType)
+        return (rank, shape, pythonDType, array)
 
     def createArray(self, value, fun=None):
         """ creates python array from the given array with applied
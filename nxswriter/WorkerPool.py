@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+""" Provides a pool with long-lived worker threads and a writer thread """
+
+import sys
+import threading
+
+if sys.version_info > (3,):
+    import queue as Queue
+else:
+    import Queue
+
+
+class WorkerBatch(object):
+
+    """ set of elements submitted to the worker pool in one call
+    """
+
+    def __init__(self, size):
+        """ constructor
+
+        :param size: number of submitted elements
+        :type size: :obj:`int`
+        """
+        #: (:obj:`int`) number of not finished elements
+        self.__pending = size
+        #: (:obj:`set` <:obj:`int`>) indices of finished elements
+        self.__finished = set()
+        #: (:class:`threading.Condition`) condition of finished elements
+        self.__condition = threading.Condition(threading.Lock())
+
+    def done(self, index=None):
+        """ marks one element of the batch as finished
+
+        :param index: index of the finished element
+        :type index: :obj:`int`
+        """
+        with self.__condition:
+            self.__pending -= 1
+            if index is not None:
+                self.__finished.add(index)
+                self.__condition.notify_all()
+            elif self.__pending <= 0:
+                self.__condition.notify_all()
+
+    def waitFor(self, index):
+        """ waits for the given element of the batch
+
+        :param index: index of the element
+        :type index: :obj:`int`
+        """
+        with self.__condition:
+            while index not in self.__finished and self.__pending > 0:
+                self.__condition.wait()
+
+    def isDone(self):
+        """ checks if all elements of the batch are finished
+
+        :returns: True if all elements are finished
+        :rtype: :obj:`bool`
+        """
+        with self.__condition:
+            return self.__pending <= 0
+
+    def wait(self, timeout=None):
+        """ waits for all elements of the batch
+
+        :param timeout: the maximal waiting time
+        :type timeout: :obj:`float`
+        :returns: True if all elements are finished
+        :rtype: :obj:`bool`
+        """
+        with self.__condition:
+            if self.__pending > 0:
+                if timeout is None:
+                    while self.__pending > 0:
+                        self.__condition.wait()
+                else:
+                    self.__condition.wait(timeout)
+            return self.__pending <= 0
+
+
+class WorkerThread(threading.Thread):
+
+    """ long-lived thread executing elements from the worker queue
+    """
+
+    def __init__(self, index, queue):
+        """ constructor
+
+        :param index: the current thread index
+        :type index: :obj:`int`
+        :param queue: queue with (element, batch, index, fetch) tasks
+        :type queue: :class:`Queue.Queue`
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        #: (:obj:`int`) thread index
+        self.index = index
+        #: (:class:`Queue.Queue`) queue with runnable elements
+        self.__queue = queue
+
+    def run(self):
+        """ runner
+
+        :brief: It runs elements from the queue until it gets None.
+                Elements with a fetch task are only fetched when they
+                provide the two-phase interface
+        """
+        while True:
+            task = self.__queue.get()
+            if task is None:
+                break
+            elem, batch, index, fetch = task
+            try:
+                elem.error = None
+                if fetch and isTwoPhase(elem):
+                    elem.fetch()
+                elif hasattr(elem, "run") and callable(elem.run):
+                    elem.run()
+            except Exception as e:
+                setError(elem, e)
+            finally:
+                batch.done(index)
+
+
+class WriterThread(threading.Thread):
+
+    """ long-lived thread writing fetched elements in the submitted order
+    """
+
+    def __init__(self, queue):
+        """ constructor
+
+        :param queue: queue with (elements, fetched, batch) tasks
+        :type queue: :class:`Queue.Queue`
+        """
+        threading.Thread.__init__(self)
+        self.daemon = True
+        #: (:class:`Queue.Queue`) queue with written element lists
+        self.__queue = queue
+
+    def run(self):
+        """ runner
+
+        :brief: It writes every element as soon as its fetch is finished,
+                keeping the order of the element list
+        """
+        while True:
+            task = self.__queue.get()
+            if task is None:
+                break
+            elements, fetched, batch = task
+            for index, elem in enumerate(elements):
+                try:
+                    fetched.waitFor(index)
+                    if not elem.error and isTwoPhase(elem):
+                        elem.write()
+                except Exception as e:
+                    setError(elem, e)
+                finally:
+                    batch.done()
+
+
+def isTwoPhase(elem):
+    """ checks if the element provides separate fetch and write methods
+
+    :param elem: runnable element
+    :type elem: :class:`nxswriter.Element.Element`
+    :returns: True if the element has fetch and write methods
+    :rtype: :obj:`bool`
+    """
+    return callable(getattr(elem, "fetch", None)) \
+        and callable(getattr(elem, "write", None))
+
+
+def setError(elem, error):
+    """ sets the element error from the exception
+
+    :param elem: runnable element
+    :type elem: :class:`nxswriter.Element.Element`
+    :param error: raised exception
+    :type error: :obj:`Exception`
+    """
+    if hasattr(elem, "setMessage"):
+        elem.error = elem.setMessage(str(error))
+    else:
+        elem.error = str(error)
+
+
+class WorkerPool(object):
+
+    """ Pool with long-lived worker threads shared by thread pools
+    """
+
+    def __init__(self, numberOfThreads=None, streams=None):
+        """ constructor
+
+        :param numberOfThreads: maximal number of threads
+        :type numberOfThreads: :obj:`int`
+        :param streams: tango-like steamset class
+        :type streams: :class:`StreamSet` or :class:`PyTango.Device_4Impl`
+        """
+        #: (:obj:`int`) maximal number of threads, unlimited if < 1
+        self.numberOfThreads = numberOfThreads or -1
+        #: (:class:`Queue.Queue`) queue of the submitted tasks
+        self.__queue = Queue.Queue()
+        #: (:obj:`list` <:class:`WorkerThread`>) started worker threads
+        self.__threads = []
+        #: (:class:`Queue.Queue`) queue of the serialized write tasks
+        self.__writeQueue = Queue.Queue()
+        #: (:class:`WriterThread`) thread performing all H5 writes
+        self.__writer = None
+        #: (:class:`threading.Lock`) pool lock
+        self.__lock = threading.Lock()
+        #: (:obj:`bool`) True if the pool is closed
+        self.__closed = False
+        #: (:class:`StreamSet` or :class:`PyTango.Device_4Impl`) stream set
+        self._streams = streams
+
+    def __getSize(self):
+        """ get method for the number of started threads
+
+        :returns: number of started threads
+        :rtype: :obj:`int`
+        """
+        with self.__lock:
+            return len(self.__threads)
+
+    #: number of started threads
+    size = property(__getSize,
+                    doc='(:obj:`int`) number of started worker threads')
+
+    def __getRunning(self):
+        """ get method for the running flag
+
+        :returns: True if the pool accepts new tasks
+        :rtype: :obj:`bool`
+        """
+        return not self.__closed
+
+    #: the running flag
+    running = property(__getRunning,
+                       doc='(:obj:`bool`) True if the pool accepts tasks')
+
+    def __startThreads(self, number):
+        """ starts missing threads
+
+        :param number: required number of threads
+        :type number: :obj:`int`
+        """
+        if self.numberOfThreads > 0:
+            number = min(number, self.numberOfThreads)
+        with self.__lock:
+            while len(self.__threads) < number:
+                th = WorkerThread(len(self.__threads), self.__queue)
+                self.__threads.append(th)
+                th.start()
+
+    def __startWriter(self):
+        """ starts the writer thread if it is not running
+        """
+        with self.__lock:
+            if self.__writer is None:
+                self.__writer = WriterThread(self.__writeQueue)
+                self.__writer.start()
+
+    def submit(self, elements, serialWrite=False):
+        """ submits elements to the worker threads
+
+        :param elements: runnable elements
+        :type elements: :obj:`list` <:class:`nxswriter.Element.Element`>
+        :param serialWrite: if True elements with fetch and write methods
+                            are fetched concurrently and written by
+                            the single writer thread in the list order
+        :type serialWrite: :obj:`bool`
+        :returns: batch of the submitted elements
+        :rtype: :class:`WorkerBatch`
+        """
+        if self.__closed:
+            if self._streams:
+                self._streams.error(
+                    "WorkerPool::submit() - Worker pool is closed",
+                    std=False)
+            raise RuntimeError("Worker pool is closed")
+        batch = WorkerBatch(len(elements))
+        if elements:
+            self.__startThreads(len(elements))
+            if serialWrite and any(isTwoPhase(el) for el in elements):
+                self.__startWriter()
+                fetched = WorkerBatch(len(elements))
+                self.__writeQueue.put((elements, fetched, batch))
+                for index, elem in enumerate(elements):
+                    self.__queue.put((elem, fetched, index, True))
+            else:
+                for elem in elements:
+                    self.__queue.put((elem, batch, None, False))
+        return batch
+
+    def close(self, timeout=None):
+        """ stops all worker threads
+
+        :param timeout: the maximal waiting time for every thread
+        :type timeout: :obj:`float`
+        """
+        self.__closed = True
+        with self.__lock:
+            threads = list(self.__threads)
+            self.__threads = []
+            writer = self.__writer
+            self.__writer = None
+        for _ in threads:
+            self.__queue.put(None)
+        if writer is not None:
+            self.__writeQueue.put(None)
+            threads.append(writer)
+        for th in threads:
+            if th.is_alive():
+                th.join(timeout)
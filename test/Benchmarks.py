@@ -0,0 +1,657 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file Benchmarks.py
+# performance benchmarks of the writer engine
+#
+# usage: python test/Benchmarks.py [benchmark ...]
+#
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import h5py
+import numpy
+
+from nxswriter.ClientSource import ClientSource
+from nxswriter.DataHolder import DataHolder
+from nxswriter.EField import EField
+from nxswriter.H5Elements import EFile
+from nxswriter.JSONDecoder import JSONDecoder
+from nxswriter.PreallocatedField import PreallocatedField
+from nxswriter.PyEvalSource import PyEvalSource
+from nxswriter.TangoSource import TangoSource
+from nxswriter.TangoDataWriter import TangoDataWriter
+from nxstools import filewriter as FileWriter
+from nxstools import h5pywriter as H5PYWriter
+from nxswriter.ThreadPool import ThreadPool
+from nxswriter.Types import NTP
+from nxswriter.WorkerPool import WorkerPool
+
+
+# class job
+class Job(object):
+    # contructor
+
+    def __init__(self):
+        # error
+        self.error = None
+
+    # run method
+    def run(self):
+        pass
+
+
+# class job with a slow fetch and an HDF5 write
+class H5Job(object):
+    # contructor
+
+    def __init__(self, dataset, latency):
+        # error
+        self.error = None
+        # h5py dataset
+        self.dataset = dataset
+        # fetch latency in seconds
+        self.latency = latency
+        # fetched value
+        self.value = None
+
+    # run method
+    def run(self):
+        self.fetch()
+        self.write()
+
+    # fetch method
+    def fetch(self):
+        time.sleep(self.latency)
+        self.value = numpy.arange(256, dtype="float64")
+
+    # write method
+    def write(self):
+        self.dataset.resize(self.dataset.shape[0] + 1, axis=0)
+        self.dataset[-1, :] = self.value
+
+
+# class datasource with a constant value
+class ValueSource(object):
+    # contructor
+
+    def __init__(self, value):
+        # data record
+        self.value = value
+
+    # checks if the datasource is valid
+    def isValid(self):
+        return True
+
+    # provides the data record
+    def getData(self):
+        return self.value
+
+
+def timeit(fun, repeat):
+    """ measures the mean execution time of the function
+
+    :param fun: measured function
+    :type fun: :obj:`callable`
+    :param repeat: number of repetitions
+    :type repeat: :obj:`int`
+    :returns: mean time in seconds
+    :rtype: :obj:`float`
+    """
+    start = time.time()
+    for _ in range(repeat):
+        fun()
+    return (time.time() - start) / repeat
+
+
+def report(name, label, value, unit="ms"):
+    """ prints the benchmark result
+
+    :param name: benchmark name
+    :type name: :obj:`str`
+    :param label: measurement label
+    :type label: :obj:`str`
+    :param value: measured value in seconds
+    :type value: :obj:`float`
+    :param unit: printed unit, i.e. ms or us
+    :type unit: :obj:`str`
+    """
+    scale = 1000. if unit == "ms" else 1000000.
+    print("%-12s %-40s %10.3f %s" % (name, label, value * scale, unit))
+
+
+def threadpool(steps=200):
+    """ per-step overhead of thread pools with fresh and long-lived threads
+
+    :param steps: number of measured steps
+    :type steps: :obj:`int`
+    """
+    for nfields, nthreads in [(10, 100), (100, 100), (300, 100)]:
+        pool = ThreadPool(nthreads)
+        for _ in range(nfields):
+            pool.append(Job())
+        report("threadpool",
+               "fresh threads    %4s fields" % nfields,
+               timeit(pool.runAndWait, steps))
+        workers = WorkerPool(nthreads)
+        pool.workers = workers
+        report("threadpool",
+               "long-lived pool  %4s fields" % nfields,
+               timeit(pool.runAndWait, steps))
+        workers.close()
+
+
+def twophase(steps=50):
+    """ per-step time of combined and separated fetch/write phases
+
+    :param steps: number of measured steps
+    :type steps: :obj:`int`
+    """
+    fl = h5py.File("twophase.h5", "w", driver="core", backing_store=False)
+    for nfields in [10, 100, 300]:
+        pool = ThreadPool(100)
+        for i in range(nfields):
+            pool.append(H5Job(
+                fl.create_dataset(
+                    "f%s_%s" % (nfields, i), (0, 256), "float64",
+                    maxshape=(None, 256), chunks=(64, 256)),
+                0.001 * (i % 3)))
+        workers = WorkerPool(100)
+        pool.workers = workers
+        for serial in [False, True]:
+            pool.serialWrite = serial
+            report("twophase",
+                   "%-16s %4s fields" % (
+                       "serialized write" if serial else "fetch+write",
+                       nfields),
+                   timeit(pool.runAndWait, steps))
+        workers.close()
+    fl.close()
+
+
+def clientxml(nfields, strategy=""):
+    """ creates XML settings with growing CLIENT fields
+
+    :param nfields: number of fields
+    :type nfields: :obj:`int`
+    :param strategy: additional attributes of the strategy tag
+    :type strategy: :obj:`str`
+    :returns: XML settings
+    :rtype: :obj:`str`
+    """
+    fields = "".join(
+        '<field name="c%s" type="NX_FLOAT64">'
+        '<strategy mode="STEP" %s/>'
+        '<datasource type="CLIENT"><record name="c%s"/></datasource>'
+        '</field>' % (i, strategy, i) for i in range(nfields))
+    return '<definition><group type="NXentry" name="entry">' \
+        '<group type="NXdata" name="data">%s</group>' \
+        '</group></definition>' % fields
+
+
+def clientsteps(nfields, nsteps):
+    """ creates local JSON strings of the steps
+
+    :param nfields: number of fields
+    :type nfields: :obj:`int`
+    :param nsteps: number of steps
+    :type nsteps: :obj:`int`
+    :returns: JSON strings
+    :rtype: :obj:`list` <:obj:`str`>
+    """
+    return [json.dumps(
+        {"data": dict(("c%s" % i, 0.1 * i + st) for i in range(nfields))})
+        for st in range(nsteps)]
+
+
+def writescan(xml, steps, batch=0, entry=None, info=None):
+    """ writes a scan into a temporary file
+
+    :param xml: XML settings
+    :type xml: :obj:`str`
+    :param steps: local JSON strings of the steps
+    :type steps: :obj:`list` <:obj:`str`>
+    :param batch: number of steps recorded by one recordBatch call
+    :type batch: :obj:`int`
+    :param entry: extra parameters set before openEntry
+    :type entry: :obj:`dict` <:obj:`str`, any>
+    :param info: dictionary filled with the file size
+    :type info: :obj:`dict` <:obj:`str`, any>
+    :returns: time in seconds
+    :rtype: :obj:`float`
+    """
+    fd, fname = tempfile.mkstemp(suffix=".h5")
+    os.close(fd)
+    tdw = TangoDataWriter()
+    tdw.writer = "h5py"
+    tdw.fileName = fname
+    tdw.addingLogs = False
+    tdw.openFile()
+    tdw.xmlsettings = xml
+    for key, value in (entry or {}).items():
+        setattr(tdw, key, value)
+    tdw.openEntry()
+    start = time.time()
+    if batch:
+        for i in range(0, len(steps), batch):
+            tdw.recordBatch(steps[i:i + batch])
+    else:
+        for step in steps:
+            tdw.record(step)
+    tdw.closeEntry()
+    duration = time.time() - start
+    tdw.closeFile()
+    if info is not None:
+        info["filesize"] = os.path.getsize(fname)
+    os.remove(fname)
+    return duration
+
+
+def recordbatch(nsteps=1000):
+    """ time of a scan recorded step by step and by recordBatch
+
+    :param nsteps: number of steps
+    :type nsteps: :obj:`int`
+    """
+    for nfields in [1, 10]:
+        xml = clientxml(nfields)
+        steps = clientsteps(nfields, nsteps)
+        report("recordbatch",
+               "record       %4s steps %3s fields" % (nsteps, nfields),
+               writescan(xml, steps))
+        for batch in [100, 1000]:
+            report("recordbatch",
+                   "recordBatch(%4s) %4s steps %3s fields" % (
+                       batch, nsteps, nfields),
+                   writescan(xml, steps, batch))
+
+
+def buffer(nsteps=1000):
+    """ time of a scan recorded with and without write-behind buffers
+
+    :param nsteps: number of steps
+    :type nsteps: :obj:`int`
+    """
+    for nfields in [1, 10]:
+        steps = clientsteps(nfields, nsteps)
+        report("buffer",
+               "direct          %4s steps %3s fields" % (nsteps, nfields),
+               writescan(clientxml(nfields), steps))
+        for size in [10, 100]:
+            report("buffer",
+                   "buffer=%-4s     %4s steps %3s fields" % (
+                       size, nsteps, nfields),
+                   writescan(clientxml(nfields, 'buffer="%s"' % size),
+                             steps))
+
+
+def framexml(shape, strategy=""):
+    """ creates XML settings with one growing CLIENT field
+
+    :param shape: shape of the field frame
+    :type shape: :obj:`list` <:obj:`int`>
+    :param strategy: additional attributes of the strategy tag
+    :type strategy: :obj:`str`
+    :returns: XML settings
+    :rtype: :obj:`str`
+    """
+    dims = "".join('<dim index="%s" value="%s"/>' % (i + 1, dm)
+                   for i, dm in enumerate(shape))
+    return '<definition><group type="NXentry" name="entry">' \
+        '<group type="NXdata" name="data">' \
+        '<field name="f" type="NX_FLOAT64"><dimensions rank="%s">%s' \
+        '</dimensions><strategy mode="STEP" %s/>' \
+        '<datasource type="CLIENT"><record name="f"/></datasource>' \
+        '</field></group></group></definition>' % (
+            len(shape), dims, strategy)
+
+
+def chunks():
+    """ write time and file size with one-step and planned chunks
+    """
+    for shape, nsteps in [([], 5000), ([1024], 1000), ([128, 128], 200)]:
+        value = numpy.arange(
+            int(numpy.prod(shape)), dtype="float64").reshape(shape)
+        steps = [json.dumps({"data": {"f": (value + st).tolist()}})
+                 for st in range(nsteps)]
+        label = "x".join(str(dm) for dm in shape) or "scalar"
+        for name, strategy in [
+                ("one-step", 'chunks="%s"' % ",".join(
+                    ["1"] + [str(dm) for dm in shape])),
+                ("planned", "")]:
+            info = {}
+            if shape:
+                xml = framexml(shape, strategy)
+            else:
+                xml = clientxml(1, strategy).replace('"c0"', '"f"')
+            duration = writescan(xml, steps, info=info)
+            report("chunks",
+                   "%-9s %-8s %4s steps %8.3f MB/s %6s kB" % (
+                       name, label, nsteps,
+                       nsteps * value.nbytes / duration / 1e6,
+                       info["filesize"] // 1024),
+                   duration)
+
+
+def nsteps(nsteps=2000):
+    """ time of a scan recorded with and without the nsteps hint
+
+    :param nsteps: number of steps
+    :type nsteps: :obj:`int`
+    """
+    fd, fname = tempfile.mkstemp(suffix=".h5")
+    os.close(fd)
+    FileWriter.writer = H5PYWriter
+    root = FileWriter.create_file(fname, overwrite=True).root()
+    for name in ["grown by step", "preallocated"]:
+        field = root.create_field(
+            name.replace(" ", "_"), "float64", [0], [1024])
+        if name == "preallocated":
+            field = PreallocatedField(field, nsteps)
+
+        def step():
+            field.grow()
+            field[field.shape[0] - 1] = 1.0
+        report("nsteps", "%-17s field grow+write" % name,
+               timeit(step, nsteps))
+    root.close()
+    os.remove(fname)
+    for nfields in [1, 10]:
+        xml = clientxml(nfields)
+        steps = clientsteps(nfields, nsteps)
+        report("nsteps",
+               "grown by step     %4s steps %3s fields" % (nsteps, nfields),
+               writescan(xml, steps))
+        report("nsteps",
+               "preallocated      %4s steps %3s fields" % (nsteps, nfields),
+               writescan(xml, steps, entry={"jsonrecord": json.dumps(
+                   {"nsteps": nsteps})}))
+
+
+def writeplan(steps=2000):
+    """ per-step time of unplanned and planned EField writes for scalar,
+        spectrum and image data
+
+    :param steps: number of measured steps
+    :type steps: :obj:`int`
+    """
+    fd, fname = tempfile.mkstemp(suffix=".h5")
+    os.close(fd)
+    FileWriter.writer = H5PYWriter
+    root = FileWriter.create_file(fname, overwrite=True).root()
+    efile = EFile({}, None, root)
+    for label, shape in [("scalar", []), ("spectrum", [1024]),
+                         ("image", [64, 64]), ("image", [512, 512])]:
+        value = numpy.ones(shape, dtype="float64")
+        for name in ["unplanned", "planned"]:
+            el = EField({"name": "%s%s" % (name, "x".join(map(str, shape))),
+                         "type": "NX_FLOAT64"}, efile)
+            el.strategy = "STEP"
+            el.rank = str(len(shape))
+            el.source = ValueSource({
+                "rank": NTP.rTf[len(shape)],
+                "value": value if shape else 1.0,
+                "tangoDType": "DevDouble", "shape": (shape + [0, 0])[:2]})
+            el.store()
+
+            def run(el=el, planned=(name == "planned")):
+                if not planned:
+                    el._EField__plan = None
+                el.run()
+
+            report("writeplan", "%-9s %-8s %-9s EField.run()" % (
+                label, "x".join(map(str, shape)) or "1", name),
+                timeit(run, steps if len(shape) < 2 or shape[0] < 100
+                       else steps // 10),
+                "us")
+    root.close()
+    os.remove(fname)
+
+
+def cast(repeat=20):
+    """ time and copies of DataHolder.cast() for a 2048x2048 image
+
+    :param repeat: number of measured casts
+    :type repeat: :obj:`int`
+    """
+    value = numpy.ones((2048, 2048), dtype="int32")
+    for label, tdtype, dtype, arr in [
+            ("same type", "DevLong", "int32", value),
+            ("tango type mismatch", "DevLong64", "int32", value),
+            ("swapped byte order", "DevLong", "int32", value.astype(">i4")),
+            ("int32 -> bool", "DevLong", "bool", value)]:
+        dh = DataHolder("IMAGE", arr, tdtype, [2048, 2048])
+        DataHolder.debugCopies = True
+        DataHolder.resetCopyCounter()
+        dh.cast(dtype)
+        counter = DataHolder.resetCopyCounter()
+        DataHolder.debugCopies = False
+        report("cast", "%-20s %s MB copied" % (
+            label, counter["bytes"] // (1024 * 1024)),
+            timeit(lambda: dh.cast(dtype), repeat))
+
+
+def jsonlists(repeat=3):
+    """ time of CLIENT data from 1-D and 2-D JSON lists cast into a field type
+
+    :param repeat: number of measured steps
+    :type repeat: :obj:`int`
+    """
+    for size in [1000, 10000, 100000, 1000000]:
+        side = int(round(size ** 0.5))
+        for label, value in [
+                ("1d %s" % size, [float(i) for i in range(size)]),
+                ("2d %sx%s" % (side, side),
+                 [[float(i) for i in range(side)] for _ in range(side)])]:
+            source = ClientSource()
+            source.setup("<datasource><record name='data'/></datasource>")
+            source.setJSON({"data": {"data": value}})
+
+            def step():
+                DataHolder(**source.getData()).cast("float64")
+            report("jsonlists", "%-16s getData()+cast()" % label,
+                   timeit(step, repeat))
+
+
+def tangoclient(nclients=500, steps=20):
+    """ per-step time of __CLIENT__ tango datasources found in JSON data
+
+    :param nclients: number of client values in one step
+    :type nclients: :obj:`int`
+    :param steps: number of steps
+    :type steps: :obj:`int`
+    """
+    sources = []
+    for i in range(nclients):
+        source = TangoSource()
+        source.device = "haso:10000/p09/motor/exp.%03d" % i
+        source.member.name = "Position"
+        source.client = "haso:10000/p09/motor/exp.%03d/position" % i
+        source.fullclient = \
+            "haso.desy.de:10000/p09/motor/exp.%03d/position" % i
+        sources.append(source)
+    gjson = json.loads('{"data":{}}')
+    ljsons = [json.loads(json.dumps({"data": dict(
+        ("tango://haso:10000/p09/motor/exp.%03d/position" % i, 0.1 * i)
+        for i in range(nclients))})) for _ in range(steps)]
+
+    def step():
+        ljson = ljsons.pop()
+        for source in sources:
+            source.setJSON(gjson, ljson)
+            source.getData()
+    report("tangoclient", "%s sources per step" % nclients,
+           timeit(step, steps))
+
+
+def globaljson(nsteps=200, nfields=100):
+    """ time of a scan with a large global JSON string
+
+    :param nsteps: number of steps
+    :type nsteps: :obj:`int`
+    :param nfields: number of fields
+    :type nfields: :obj:`int`
+    """
+    xml = clientxml(nfields)
+    steps = clientsteps(nfields, nsteps)
+    for size in [0, 100000]:
+        jsonrecord = json.dumps({"data": dict(
+            ("param%s" % i, 0.5 * i) for i in range(size))})
+        report("globaljson",
+               "%4s steps %3s fields %6s global keys" % (
+                   nsteps, nfields, size),
+               writescan(xml, steps, entry={"jsonrecord": jsonrecord}))
+
+
+def jsondecoder(nsteps=20):
+    """ time of scans with images sent as JSON lists and typed arrays
+
+    :param nsteps: number of steps
+    :type nsteps: :obj:`int`
+    """
+    shape = [512, 512]
+    value = numpy.random.random(shape)
+    xml = framexml(shape)
+    fastloads = JSONDecoder.fastloads
+    try:
+        for backend, loads in [("json", None), ("fast", fastloads)]:
+            if backend == "fast" and loads is None:
+                continue
+            JSONDecoder.fastloads = loads
+            for payload in ["lists", "typed"]:
+                if payload == "lists":
+                    steps = [json.dumps({"data": {"f": (value + st).tolist()}})
+                             for st in range(nsteps)]
+                else:
+                    steps = [json.dumps({"data": {
+                        "f": JSONDecoder.encodeArray(value + st)}})
+                        for st in range(nsteps)]
+                report("jsondecoder",
+                       "%-4s %-5s loads() %sx%s" % (
+                           backend, payload, shape[0], shape[1]),
+                       timeit(lambda: JSONDecoder.loads(steps[0]), 5))
+                report("jsondecoder",
+                       "%-4s %-5s scan %s steps" % (
+                           backend, payload, nsteps),
+                       writescan(xml, steps))
+    finally:
+        JSONDecoder.fastloads = fastloads
+
+
+#: (:obj:`str`) typical PyEval script combining two inputs
+PYEVAL_SCRIPT = """
+import math
+if ds.inp2:
+    ds.res = math.sqrt(ds.inp1 ** 2 + ds.inp2 ** 2)
+else:
+    ds.res = abs(ds.inp1)
+"""
+
+
+def pyevalxml(nfields):
+    """ creates XML settings with growing PYEVAL fields of CLIENT inputs
+
+    :param nfields: number of fields
+    :type nfields: :obj:`int`
+    :returns: XML settings
+    :rtype: :obj:`str`
+    """
+    fields = "".join(
+        '<field name="p%s" type="NX_FLOAT64">'
+        '<strategy mode="STEP"/>'
+        '<datasource type="PYEVAL">'
+        '<datasource type="CLIENT" name="inp1"><record name="c%s"/>'
+        '</datasource>'
+        '<datasource type="CLIENT" name="inp2"><record name="c%s"/>'
+        '</datasource>'
+        '<result name="res"><![CDATA[%s]]></result>'
+        '</datasource>'
+        '</field>' % (i, i, (i + 1) % nfields, PYEVAL_SCRIPT)
+        for i in range(nfields))
+    return '<definition><group type="NXentry" name="entry">' \
+        '<group type="NXdata" name="data">%s</group>' \
+        '</group></definition>' % fields
+
+
+def pyeval(nsteps=200, nfields=100):
+    """ time of PyEval scripts and of a scan with PYEVAL fields
+
+    :param nsteps: number of steps
+    :type nsteps: :obj:`int`
+    :param nfields: number of fields
+    :type nfields: :obj:`int`
+    """
+    class Inputs(object):
+        inp1 = 3.
+        inp2 = 4.
+    code = PyEvalSource.codes.get(PYEVAL_SCRIPT)
+
+    def text():
+        exec(PYEVAL_SCRIPT.strip(), {}, {"ds": Inputs()})
+
+    def compiled():
+        exec(code, {}, {"ds": Inputs()})
+    report("pyeval", "exec() script text", timeit(text, 10000), "us")
+    report("pyeval", "exec() compiled code", timeit(compiled, 10000), "us")
+    report("pyeval", "%4s steps %3s PYEVAL fields" % (nsteps, nfields),
+           writescan(pyevalxml(nfields), clientsteps(nfields, nsteps)))
+
+
+#: (:obj:`dict` <:obj:`str`, :obj:`callable`>) available benchmarks
+BENCHMARKS = {
+    "threadpool": threadpool,
+    "twophase": twophase,
+    "recordbatch": recordbatch,
+    "buffer": buffer,
+    "chunks": chunks,
+    "nsteps": nsteps,
+    "writeplan": writeplan,
+    "cast": cast,
+    "jsonlists": jsonlists,
+    "tangoclient": tangoclient,
+    "globaljson": globaljson,
+    "jsondecoder": jsondecoder,
+    "pyeval": pyeval,
+}
+
+
+def main():
+    """ the main function
+    """
+    parser = argparse.ArgumentParser(
+        description="Performance benchmarks of the NeXus writer")
+    parser.add_argument(
+        "benchmarks", nargs="*",
+        help="benchmarks to run: %s (all if not given)"
+        % ", ".join(sorted(BENCHMARKS.keys())))
+    options = parser.parse_args()
+    unknown = [nm for nm in options.benchmarks if nm not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmarks: %s" % ", ".join(unknown))
+    for name in (options.benchmarks or sorted(BENCHMARKS.keys())):
+        BENCHMARKS[name]()
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ChunkPlannerTest.py
+# unittests for the chunk shape planner
+#
+import unittest
+import os
+import sys
+import random
+import binascii
+import time
+
+from nxswriter.ChunkPlanner import ChunkPlanner
+
+
+if sys.version_info > (3,):
+    long = int
+
+
+# test fixture
+class ChunkPlannerTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        try:
+            self.__seed = long(binascii.hexlify(os.urandom(16)), 16)
+        except NotImplementedError:
+            self.__seed = long(time.time() * 256)  # use fractional seconds
+
+        self.__rnd = random.Random(self.__seed)
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        print("SEED = %s" % self.__seed)
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = ChunkPlanner()
+        self.assertEqual(el.chunkbytes, 512 * 1024)
+        self.assertEqual(el.maxsteps, 1024)
+        self.assertEqual(el.framedim, 256)
+        el = ChunkPlanner(1000, 10, 5)
+        self.assertEqual(el.chunkbytes, 1000)
+        self.assertEqual(el.maxsteps, 10)
+        self.assertEqual(el.framedim, 5)
+
+    # itemsize test
+    # \brief It tests item sizes of types
+    def test_itemsize(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertEqual(ChunkPlanner.itemsize("float64"), 8)
+        self.assertEqual(ChunkPlanner.itemsize("int16"), 2)
+        self.assertEqual(ChunkPlanner.itemsize("bool"), 1)
+        self.assertEqual(ChunkPlanner.itemsize("string"), 16)
+        self.assertEqual(ChunkPlanner.itemsize("unknown"), 16)
+
+    # plan test
+    # \brief It tests chunks of growing fields
+    def test_plan_growing(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = ChunkPlanner(8192, 100, 16)
+        self.assertEqual(el.plan([], "float64"), [])
+        self.assertEqual(el.plan([0], "float64", 1), [100])
+        self.assertEqual(el.plan([0], "float64", 1, 20), [20])
+        self.assertEqual(el.plan([0, 64], "float64", 1), [16, 64])
+        self.assertEqual(el.plan([0, 0], "float64", 1), [64, 16])
+        self.assertEqual(el.plan([64, 0], "int32", 2), [64, 32])
+        self.assertEqual(el.plan([0, 100, 100], "float64", 1), [1, 25, 25])
+        self.assertEqual(
+            el.plan([0, 100, 100], "float64", 1, chunks=[0, 100, 0]),
+            [1, 100, 7])
+        self.assertEqual(
+            el.plan([0, 10], "float64", 1, chunks=[3, 0]), [3, 10])
+
+    # plan test
+    # \brief It tests if chunks fit into the target size
+    def test_plan_size(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        for _ in range(100):
+            target = self.__rnd.randint(1, 100000)
+            el = ChunkPlanner(target)
+            rank = self.__rnd.randint(1, 4)
+            shape = [self.__rnd.randint(0, 5000) for _ in range(rank)]
+            grows = self.__rnd.randint(1, rank)
+            shape[grows - 1] = 0
+            nsteps = self.__rnd.randint(0, 10000)
+            chunk = el.plan(shape, "int64", grows, nsteps)
+            self.assertEqual(len(chunk), rank)
+            size = 8
+            for i, ch in enumerate(chunk):
+                self.assertTrue(ch >= 1)
+                if shape[i]:
+                    self.assertTrue(ch <= shape[i])
+                size *= ch
+            self.assertTrue(size <= max(target, 8))
+            self.assertTrue(chunk[grows - 1] <= (nsteps or el.maxsteps))
+
+    # plan test
+    # \brief It tests chunks of non-growing fields
+    def test_plan_fixed(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = ChunkPlanner(8192, 100, 16)
+        self.assertEqual(el.plan([10], "float64"), [10])
+        self.assertEqual(el.plan([0], "float64"), [16])
+        self.assertEqual(el.plan([10, 20], "float64"), [10, 20])
+        self.assertEqual(el.plan([100, 100], "float64"), [25, 25])
+
+
+if __name__ == '__main__':
+    unittest.main()
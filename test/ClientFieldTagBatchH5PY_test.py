@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ClientFieldTagBatchH5PY_test.py
+# unittests for field Tags recorded with recordBatch
+#
+import unittest
+
+try:
+    import ClientFieldTagWriterH5PY_test
+except Exception:
+    from . import ClientFieldTagWriterH5PY_test
+
+
+# test fixture
+class ClientFieldTagBatchH5PYTest(
+        ClientFieldTagWriterH5PY_test.ClientFieldTagWriterH5PYTest):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        ClientFieldTagWriterH5PY_test.ClientFieldTagWriterH5PYTest.__init__(
+            self, methodName)
+        # steps waiting for recordBatch
+        self.__steps = []
+
+    # closes writer
+    # \param tdw Tango Data Writer instance
+    # \param json JSON Record with client settings
+    def closeWriter(self, tdw, json=None):
+        steps = self.__steps
+        self.__steps = []
+        tdw.recordBatch(steps)
+        ClientFieldTagWriterH5PY_test.ClientFieldTagWriterH5PYTest.\
+            closeWriter(self, tdw, json)
+
+    # collects one record step
+    def record(self, tdw, string):
+        self.__steps.append(string)
+
+
+if __name__ == '__main__':
+    unittest.main()
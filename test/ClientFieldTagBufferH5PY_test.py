@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ClientFieldTagBufferH5PY_test.py
+# unittests for field Tags recorded with write-behind buffers
+#
+import unittest
+import os
+import sys
+import numpy
+
+from nxswriter.TangoDataWriter import TangoDataWriter
+from nxstools import filewriter as FileWriter
+from nxstools import h5pywriter as H5PYWriter
+
+try:
+    import ClientFieldTagWriterH5PY_test
+except Exception:
+    from . import ClientFieldTagWriterH5PY_test
+
+
+# test fixture
+class ClientFieldTagBufferH5PYTest(
+        ClientFieldTagWriterH5PY_test.ClientFieldTagWriterH5PYTest):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        ClientFieldTagWriterH5PY_test.ClientFieldTagWriterH5PYTest.__init__(
+            self, methodName)
+
+    # opens writer
+    # \param fname file name
+    # \param xml XML settings
+    # \param json JSON Record with client settings
+    # \returns Tango Data Writer instance
+    def openWriter(self, fname, xml, json=None):
+        tdw = TangoDataWriter()
+        self.setProp(tdw, "writer", "h5py")
+        tdw.fileName = fname
+        tdw.openFile()
+        tdw.xmlsettings = xml
+        tdw.buffersize = 2
+        if json:
+            tdw.jsonrecord = json
+        tdw.openEntry()
+        return tdw
+
+    # records the steps and reads the written detector fields
+    # \param fun test name
+    # \param xml XML settings
+    # \param steps list of JSON data records
+    # \param names field names
+    # \returns list of written field values
+    def recordSteps(self, fun, xml, steps, names):
+        fname = '%s/%s%s.h5' % (os.getcwd(), self.__class__.__name__, fun)
+        if os.path.exists(fname):
+            os.remove(fname)
+        tdw = self.openWriter(fname, xml)
+        for step in steps:
+            self.record(tdw, step)
+        self.closeWriter(tdw)
+
+        FileWriter.writer = H5PYWriter
+        f = FileWriter.open_file(fname, readonly=True)
+        det = f.root().open("entry1").open("instrument").open("detector")
+        values = [det.open(name).read().tolist() for name in names]
+        attrs = [at.name for at in det.open(names[-1]).attributes]
+        f.close()
+        os.remove(fname)
+        return values, attrs
+
+    # buffer test
+    # \brief It tests spectra changing their length during the scan
+    def test_clientSpectrumShapeChange(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        xml = """<definition>
+  <group type="NXentry" name="entry1">
+    <group type="NXinstrument" name="instrument">
+      <group type="NXdetector" name="detector">
+        <field type="NX_INT64" name="mca">
+          <dimensions rank="1"/>
+          <strategy mode="STEP"/>
+          <datasource type="CLIENT">
+            <record name="mca"/>
+          </datasource>
+        </field>
+      </group>
+    </group>
+  </group>
+</definition>
+"""
+        mcas = [[1, 2, 3], [4, 5, 6], [7], [8], [9, 10, 11]]
+        steps = ['{"data": {"mca": %s}}' % mca for mca in mcas]
+        values, _ = self.recordSteps(fun, xml, steps, ["mca"])
+        self.assertEqual(
+            values[0],
+            [[1, 2, 3], [4, 5, 6], [7, 0, 0], [8, 0, 0], [9, 10, 11]])
+
+    # buffer test
+    # \brief It tests a failed step in the middle of the buffered steps
+    def test_clientSpectrumCanFail(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        xml = """<definition>
+  <group type="NXentry" name="entry1">
+    <group type="NXinstrument" name="instrument">
+      <group type="NXdetector" name="detector">
+        <field type="NX_INT64" name="mca">
+          <dimensions rank="1">
+            <dim value="3" index="1"/>
+          </dimensions>
+          <strategy mode="STEP"/>
+          <datasource type="CLIENT">
+            <record name="mca"/>
+          </datasource>
+        </field>
+        <field type="NX_INT32" name="mca_canfail">
+          <dimensions rank="1">
+            <dim value="3" index="1"/>
+          </dimensions>
+          <strategy mode="STEP" canfail="true"/>
+          <datasource type="PYEVAL">
+            <datasource type="CLIENT" name="cnt">
+              <record name="cnt"/>
+            </datasource>
+            <result name="res">
+ds.res = [ds.cnt, ds.cnt + 1, ds.cnt + 2] if ds.cnt != 1 else 1 // 0
+            </result>
+          </datasource>
+        </field>
+      </group>
+    </group>
+  </group>
+</definition>
+"""
+        mcas = [[i, i + 1, i + 2] for i in range(5)]
+        steps = ['{"data": {"mca": %s, "cnt": %s}}' % (mca, i)
+                 for i, mca in enumerate(mcas)]
+        values, attrs = self.recordSteps(
+            fun, xml, steps, ["mca", "mca_canfail"])
+        mx = numpy.iinfo(numpy.int32).max
+        self.assertEqual(values[0], mcas)
+        self.assertEqual(values[1], mcas[:1] + [[mx] * 3] + mcas[2:])
+        self.assertTrue("nexdatas_canfail" in attrs)
+
+
+if __name__ == '__main__':
+    unittest.main()
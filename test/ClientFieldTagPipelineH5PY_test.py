@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ClientFieldTagPipelineH5PY_test.py
+# unittests for field Tags running Tango Server with pipelined records
+#
+import unittest
+import time
+
+import PyTango
+
+
+import ServerSetUp
+import ClientFieldTagAsynchH5PY_test
+from ProxyHelper import ProxyHelper
+
+# test fixture
+
+
+class ClientFieldTagPipelineH5PYTest(
+        ClientFieldTagAsynchH5PY_test.ClientFieldTagAsynchH5PYTest):
+    # server counter
+    serverCounter = 0
+    # size of the record queue
+    queueSize = 3
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        ClientFieldTagAsynchH5PY_test.ClientFieldTagAsynchH5PYTest.__init__(
+            self, methodName)
+
+        ClientFieldTagPipelineH5PYTest.serverCounter += 1
+        sins = self.__class__.__name__ + \
+            "%s" % ClientFieldTagPipelineH5PYTest.serverCounter
+        self._sv = ServerSetUp.ServerSetUp("testp09/testtdw/" + sins, sins)
+
+    # opens writer
+    # \param fname file name
+    # \param xml XML settings
+    # \param json JSON Record with client settings
+    # \returns Tango Data Writer proxy instance
+    def openWriter(self, fname, xml, json=None):
+        tdw = PyTango.DeviceProxy(self._sv.new_device_info_writer.name)
+        self.assertTrue(ProxyHelper.wait(tdw, 10000))
+        tdw.RecordQueueSize = self.queueSize
+        self.assertEqual(tdw.RecordQueueSize, self.queueSize)
+        self.assertEqual(tdw.RecordQueueDepth, 0)
+        return ClientFieldTagAsynchH5PY_test.ClientFieldTagAsynchH5PYTest.\
+            openWriter(self, fname, xml, json)
+
+    # closes writer
+    # \param tdw Tango Data Writer proxy instance
+    # \param json JSON Record with client settings
+    def closeWriter(self, tdw, json=None):
+        self.assertTrue(ProxyHelper.wait(tdw, 10000))
+        self.assertEqual(tdw.RecordQueueDepth, 0)
+        ClientFieldTagAsynchH5PY_test.ClientFieldTagAsynchH5PYTest.\
+            closeWriter(self, tdw, json)
+
+    # performs one record step without waiting for the previous steps
+    def record(self, tdw, string):
+        self.assertTrue(tdw.state() in [PyTango.DevState.EXTRACT,
+                                        PyTango.DevState.RUNNING])
+        while tdw.RecordQueueDepth >= self.queueSize:
+            time.sleep(0.001)
+        tdw.RecordAsynch(string)
+        self.assertTrue(tdw.RecordQueueDepth <= self.queueSize)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file ClientFieldTagPreallocH5PY_test.py
+# unittests for field Tags recorded into preallocated fields
+#
+import unittest
+
+from nxswriter.TangoDataWriter import TangoDataWriter
+
+try:
+    import ClientFieldTagWriterH5PY_test
+except Exception:
+    from . import ClientFieldTagWriterH5PY_test
+
+
+# test fixture
+class ClientFieldTagPreallocH5PYTest(
+        ClientFieldTagWriterH5PY_test.ClientFieldTagWriterH5PYTest):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        ClientFieldTagWriterH5PY_test.ClientFieldTagWriterH5PYTest.__init__(
+            self, methodName)
+
+    # opens writer
+    # \param fname file name
+    # \param xml XML settings
+    # \param json JSON Record with client settings
+    # \returns Tango Data Writer instance
+    def openWriter(self, fname, xml, json=None):
+        tdw = TangoDataWriter()
+        self.setProp(tdw, "writer", "h5py")
+        tdw.fileName = fname
+        tdw.openFile()
+        tdw.xmlsettings = xml
+        if json:
+            tdw.jsonrecord = json
+        tdw.openEntry(nsteps=2)
+        return tdw
+
+
+if __name__ == '__main__':
+    unittest.main()
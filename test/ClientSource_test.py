@@ -31,6 +31,7 @@ import time
 
 from nxswriter.DataSources import DataSource
 from nxswriter.ClientSource import ClientSource
+from nxswriter.DataSourcePool import DataSourcePool
 from nxswriter.Errors import DataSourceSetupError
 from nxswriter.Types import Converters
 
@@ -514,6 +515,29 @@ class ClientSourceTest(unittest.TestCase):
         self.assertTrue(isinstance(el, object))
         self.assertEqual(el.isValid(), True)
 
+    # getData test
+    # \brief It tests reading JSON objects from the JSON context
+    def test_getData_jsoncontext(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        ds = ClientSource()
+        ds.name = "myvalue"
+        self.assertTrue(not ds.usesJSONContext())
+        ds.setJSON(json.loads('{"data":{"myvalue":1}}'))
+        pool = DataSourcePool()
+        ds.setDataSources(pool)
+        self.assertTrue(ds.usesJSONContext())
+        self.checkData(ds.getData(), "SCALAR", 1, "DevLong64", [])
+
+        pool.setJSON(json.loads('{"data":{"myvalue":2}}'))
+        self.checkData(ds.getData(), "SCALAR", 2, "DevLong64", [])
+        pool.setJSON(json.loads('{"data":{"myvalue":2}}'),
+                     json.loads('{"data":{"myvalue":3}}'))
+        self.checkData(ds.getData(), "SCALAR", 3, "DevLong64", [])
+        pool.setJSON(json.loads('{"data":{}}'))
+        self.assertEqual(ds.getData(), None)
+
 
 if __name__ == '__main__':
     unittest.main()
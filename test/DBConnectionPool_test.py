@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file DBConnectionPoolTest.py
+# unittests for the pool of database connections with a SQLite database
+#
+import unittest
+import sys
+import sqlite3
+import threading
+
+from nxswriter import DBaseSource
+from nxswriter.DBaseSource import DBConnectionPool
+from nxswriter.DataSourcePool import DataSourcePool
+
+
+# test fixture
+class DBConnectionPoolTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+        self._key = ("SQLITE", None, None, "memdb", None, None)
+        self._connections = []
+
+    # opens SQLite connection
+    # \returns connection
+    def connect(self):
+        db = sqlite3.connect(
+            "file:memdb?mode=memory&cache=shared", uri=True,
+            check_same_thread=False)
+        self._connections.append(db)
+        return db
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        self._connections = []
+        self._keeper = self.connect()
+        self._keeper.execute(
+            "CREATE TABLE IF NOT EXISTS motors (name TEXT, pos REAL)")
+        self._keeper.execute("DELETE FROM motors")
+        self._keeper.executemany(
+            "INSERT INTO motors VALUES (?, ?)",
+            [("m1", 1.5), ("m2", 2.5), ("m3", -3.0)])
+        self._keeper.commit()
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+        for db in self._connections:
+            try:
+                db.close()
+            except Exception:
+                pass
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBConnectionPool()
+        self.assertEqual(el.maxidle, 4)
+        self.assertEqual(el.validatetime, 10.)
+        self.assertEqual(el.opened, 0)
+        self.assertEqual(el.reused, 0)
+        self.assertEqual(len(el), 0)
+
+        el = DBConnectionPool(2, 0.)
+        self.assertEqual(el.maxidle, 2)
+        self.assertEqual(el.validatetime, 0.)
+
+        self.assertTrue(
+            isinstance(DataSourcePool().dbconnections, DBConnectionPool))
+
+    # acquire/release test
+    # \brief It tests reusing connections
+    def test_acquire_release(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBConnectionPool()
+        db = el.acquire(self._key, self.connect)
+        self.assertEqual(el.opened, 1)
+        self.assertEqual(len(el), 0)
+        el.release(self._key, db)
+        self.assertEqual(len(el), 1)
+
+        db2 = el.acquire(self._key, self.connect)
+        self.assertTrue(db2 is db)
+        self.assertEqual(el.opened, 1)
+        self.assertEqual(el.reused, 1)
+        self.assertEqual(len(el), 0)
+
+        other = ("SQLITE", None, None, "other", None, None)
+        db3 = el.acquire(other, self.connect)
+        self.assertTrue(db3 is not db)
+        self.assertEqual(el.opened, 2)
+        el.release(self._key, db2)
+        el.release(other, db3)
+        self.assertEqual(len(el), 2)
+        self.assertTrue(el.acquire(other, self.connect) is db3)
+
+        el.close()
+        self.assertEqual(len(el), 0)
+        self.assertRaises(sqlite3.ProgrammingError, db.cursor)
+
+    # release test
+    # \brief It tests the limit of idle connections
+    def test_release_maxidle(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBConnectionPool(maxidle=2)
+        dbs = [el.acquire(self._key, self.connect) for _ in range(3)]
+        self.assertEqual(el.opened, 3)
+        for db in dbs:
+            el.release(self._key, db)
+        self.assertEqual(len(el), 2)
+        self.assertRaises(sqlite3.ProgrammingError, dbs[2].cursor)
+
+    # release test
+    # \brief It tests that open transactions are finished
+    def test_release_rollback(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBConnectionPool()
+        db = el.acquire(self._key, self.connect)
+        db.execute("INSERT INTO motors VALUES ('m4', 4.0)")
+        self.assertTrue(db.in_transaction)
+        el.release(self._key, db)
+        self.assertTrue(not db.in_transaction)
+        self.assertEqual(
+            self._keeper.execute("SELECT COUNT(*) FROM motors").fetchone(),
+            (3,))
+
+        self.assertTrue(el.acquire(self._key, self.connect) is db)
+        db.close()
+        el.release(self._key, db)
+        self.assertEqual(len(el), 0)
+
+    # acquire test
+    # \brief It tests validation of idle connections
+    def test_acquire_validate(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBConnectionPool(validatetime=0.)
+        db = el.acquire(self._key, self.connect)
+        el.release(self._key, db)
+        self.assertTrue(el.acquire(self._key, self.connect) is db)
+        self.assertEqual(el.opened, 1)
+        el.release(self._key, db)
+
+        db.close()
+        db2 = el.acquire(self._key, self.connect)
+        self.assertTrue(db2 is not db)
+        self.assertEqual(el.opened, 2)
+        self.assertEqual(
+            db2.execute("SELECT COUNT(*) FROM motors").fetchone(), (3,))
+
+    # discard test
+    # \brief It tests closing failed connections
+    def test_discard(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBConnectionPool()
+        db = el.acquire(self._key, self.connect)
+        el.discard(db)
+        el.discard(db)
+        self.assertEqual(len(el), 0)
+        self.assertRaises(sqlite3.ProgrammingError, db.cursor)
+
+    # thread test
+    # \brief It tests concurrent use of the pool
+    def test_threads(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBConnectionPool(maxidle=8)
+        results = []
+
+        def query():
+            for _ in range(20):
+                db = el.acquire(self._key, self.connect)
+                cursor = db.cursor()
+                cursor.execute("SELECT pos FROM motors WHERE name = 'm2'")
+                results.append(cursor.fetchone()[0])
+                cursor.close()
+                el.release(self._key, db)
+
+        threads = [threading.Thread(target=query) for _ in range(4)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        self.assertEqual(results, [2.5] * 80)
+        self.assertTrue(el.opened <= 4)
+        self.assertEqual(el.opened + el.reused, 80)
+        self.assertEqual(len(el), el.opened)
+
+    # getData test
+    # \brief It tests DB datasources with the datasource pool
+    def test_getData_pool(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        pool = DataSourcePool()
+        available = list(DBaseSource.DB_AVAILABLE)
+        DBaseSource.DB_AVAILABLE.append("SQLITE")
+        try:
+            sources = []
+            for query, fmt in [
+                    ("SELECT pos FROM motors WHERE name = 'm1'", "SCALAR"),
+                    ("SELECT pos FROM motors ORDER BY name", "SPECTRUM"),
+                    ("SELECT name, pos FROM motors ORDER BY name", "IMAGE")]:
+                ds = DBaseSource.DBaseSource()
+                ds._DBaseSource__dbConnect["SQLITE"] = self.connect
+                ds.dbtype = "SQLITE"
+                ds.dbname = "memdb"
+                ds.query = query
+                ds.format = fmt
+                ds.setDataSources(pool)
+                sources.append(ds)
+
+            for _ in range(3):
+                pool.startRun()
+                dt = sources[0].getData()
+                self.assertEqual(dt["value"], 1.5)
+                self.assertEqual(dt["rank"], "SCALAR")
+                dt = sources[1].getData()
+                self.assertEqual(dt["value"], [1.5, 2.5, -3.0])
+                self.assertEqual(dt["shape"], [3, 0])
+                dt = sources[2].getData()
+                self.assertEqual(
+                    dt["value"], [["m1", 1.5], ["m2", 2.5], ["m3", -3.0]])
+            self.assertEqual(pool.dbconnections.opened, 1)
+            self.assertEqual(pool.dbconnections.reused, 8)
+
+            sources[0].query = "SELECT pos FROM nothing"
+            self.assertRaises(sqlite3.OperationalError, sources[0].getData)
+            self.assertEqual(len(pool.dbconnections), 0)
+            sources[0].query = "SELECT pos FROM motors WHERE name = 'm3'"
+            self.assertEqual(sources[0].getData()["value"], -3.0)
+            self.assertEqual(pool.dbconnections.opened, 2)
+            self.assertEqual(len(pool.dbconnections), 1)
+
+            pool.closeConnections()
+            self.assertEqual(len(pool.dbconnections), 0)
+        finally:
+            DBaseSource.DB_AVAILABLE[:] = available
+
+
+if __name__ == '__main__':
+    unittest.main()
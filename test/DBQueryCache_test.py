@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file DBQueryCacheTest.py
+# unittests for the cache of database query results
+#
+import unittest
+import sys
+import sqlite3
+import threading
+import time
+
+from nxswriter import DBaseSource
+from nxswriter.DBaseSource import DBQueryCache
+from nxswriter.DataSourcePool import DataSourcePool
+
+
+# test fixture
+class DBQueryCacheTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+        self._calls = 0
+
+    # query counting its calls
+    # \returns data dictionary
+    def query(self):
+        self._calls += 1
+        return {"rank": "SCALAR", "value": self._calls,
+                "tangoDType": "DevLong64", "shape": [1, 0]}
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        self._calls = 0
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBQueryCache()
+        self.assertEqual(el.ttl, 0.)
+        self.assertEqual(el.executed, 0)
+        self.assertEqual(el.reused, 0)
+        self.assertEqual(DBQueryCache(2.).ttl, 2.)
+        self.assertTrue(
+            isinstance(DataSourcePool().dbqueries, DBQueryCache))
+
+    # fetch test
+    # \brief It tests sharing results within one run
+    def test_fetch_run(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBQueryCache()
+        for counter in [-1, 1, 2, -2]:
+            el.start()
+            dt = el.fetch(("db", "q1", "SCALAR"), self.query, counter)
+            dt2 = el.fetch(("db", "q1", "SCALAR"), self.query, counter)
+            self.assertEqual(dt, dt2)
+            self.assertTrue(dt is not dt2)
+            self.assertEqual(dt["value"], self._calls)
+            el.fetch(("db", "q2", "SCALAR"), self.query, counter)
+        self.assertEqual(self._calls, 8)
+        self.assertEqual(el.executed, 8)
+        self.assertEqual(el.reused, 4)
+
+    # fetch test
+    # \brief It tests reusing INIT and FINAL results in next entries
+    def test_fetch_ttl(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBQueryCache(ttl=0.2)
+        key = ("db", "q1", "SCALAR")
+        for _ in range(2):
+            el.start()
+            self.assertEqual(el.fetch(key, self.query, -1)["value"], 1)
+            el.start()
+            self.assertEqual(el.fetch(key, self.query, -2)["value"], 2)
+        el.start()
+        self.assertEqual(el.fetch(key, self.query, 1)["value"], 3)
+        el.start()
+        self.assertEqual(el.fetch(key, self.query, 1)["value"], 4)
+
+        time.sleep(0.25)
+        el.start()
+        self.assertEqual(el.fetch(key, self.query, -1)["value"], 5)
+        el.clear()
+        self.assertEqual(el.fetch(key, self.query, -1)["value"], 6)
+
+        el.ttl = 0
+        el.start()
+        self.assertEqual(el.fetch(key, self.query, -1)["value"], 7)
+
+    # fetch test
+    # \brief It tests failing queries
+    def test_fetch_error(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        def fail():
+            self._calls += 1
+            raise ValueError("lost")
+
+        el = DBQueryCache(ttl=10.)
+        key = ("db", "q1", "SCALAR")
+        self.assertRaises(ValueError, el.fetch, key, fail, -1)
+        self.assertRaises(ValueError, el.fetch, key, fail, -1)
+        self.assertEqual(self._calls, 2)
+        self.assertEqual(el.fetch(key, self.query, -1)["value"], 3)
+
+    # fetch test
+    # \brief It tests concurrent fetches of one query
+    def test_fetch_threads(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DBQueryCache()
+        results = []
+
+        def slow():
+            time.sleep(0.1)
+            return self.query()
+
+        def fetch():
+            results.append(el.fetch(("db", "q1", "SCALAR"), slow, 1))
+
+        threads = [threading.Thread(target=fetch) for _ in range(6)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        self.assertEqual(self._calls, 1)
+        self.assertEqual([dt["value"] for dt in results], [1] * 6)
+
+    # getData test
+    # \brief It tests DB datasources with the same query
+    def test_getData_pool(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        keeper = sqlite3.connect(
+            "file:querydb?mode=memory&cache=shared", uri=True,
+            check_same_thread=False)
+        keeper.execute("CREATE TABLE scan (name TEXT, nsteps INTEGER)")
+        keeper.execute("INSERT INTO scan VALUES ('ascan', 10)")
+        keeper.commit()
+        connections = []
+
+        def connect():
+            db = sqlite3.connect(
+                "file:querydb?mode=memory&cache=shared", uri=True,
+                check_same_thread=False)
+            connections.append(db)
+            return db
+
+        pool = DataSourcePool()
+        available = list(DBaseSource.DB_AVAILABLE)
+        DBaseSource.DB_AVAILABLE.append("SQLITE")
+        try:
+            sources = []
+            for _ in range(3):
+                ds = DBaseSource.DBaseSource()
+                ds._DBaseSource__dbConnect["SQLITE"] = connect
+                ds.dbtype = "SQLITE"
+                ds.dbname = "querydb"
+                ds.query = "SELECT nsteps FROM scan"
+                ds.format = "SCALAR"
+                ds.setDataSources(pool)
+                sources.append(ds)
+
+            pool.counter = 1
+            pool.startRun()
+            self.assertEqual(
+                [ds.getData()["value"] for ds in sources], [10] * 3)
+            self.assertEqual(pool.dbqueries.executed, 1)
+            self.assertEqual(pool.dbqueries.reused, 2)
+
+            keeper.execute("UPDATE scan SET nsteps = 20")
+            keeper.commit()
+            self.assertEqual(sources[0].getData()["value"], 10)
+            pool.startRun()
+            self.assertEqual(sources[0].getData()["value"], 20)
+            self.assertEqual(pool.dbqueries.executed, 2)
+            self.assertEqual(len(connections), 1)
+        finally:
+            DBaseSource.DB_AVAILABLE[:] = available
+            pool.closeConnections()
+            keeper.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
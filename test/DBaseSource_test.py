@@ -26,9 +26,11 @@ import random
 import struct
 import binascii
 import time
+import numpy
 
 
 from nxswriter.DataSources import DataSource
+from nxswriter import DBaseSource as DBaseSourceModule
 from nxswriter.DBaseSource import DBaseSource
 from nxswriter.Errors import DataSourceSetupError
 
@@ -39,6 +41,55 @@ if sys.version_info > (3,):
     long = int
 
 
+# DB-API cursor with given rows
+class FakeCursor(object):
+
+    # constructor
+    # \param rows fetched rows
+    # \param codes column type codes
+    # \param rowcount number of rows reported by the cursor
+    def __init__(self, rows, codes, rowcount=-1):
+        self.rows = list(rows)
+        self.description = [("c%s" % i, code, None, None, None, None, None)
+                            for i, code in enumerate(codes)]
+        self.rowcount = rowcount
+        self.fetches = []
+
+    def execute(self, query):
+        self.query = query
+
+    def fetchone(self):
+        return self.fetchmany(1)[0]
+
+    def fetchmany(self, size):
+        self.fetches.append(size)
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def fetchall(self):
+        self.fetches.append(None)
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+# DB-API connection with one cursor
+class FakeConnection(object):
+
+    # constructor
+    # \param cursor database cursor
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def close(self):
+        pass
+
+
 # test fixture
 class DBaseSourceTest(unittest.TestCase):
 
@@ -435,6 +486,81 @@ class DBaseSourceTest(unittest.TestCase):
         self.assertEqual(ds.passwd, passwd)
         self.assertEqual(ds.mycnf, '/etc/my.cnf')
 
+    # provides PGSQL datasource reading the given cursor
+    # \param cursor database cursor
+    # \param format data format
+    # \returns datasource
+    def pgsource(self, cursor, format):
+        ds = DBaseSource()
+        ds._DBaseSource__dbConnect["PGSQL"] = \
+            lambda: FakeConnection(cursor)
+        ds.dbtype = "PGSQL"
+        ds.query = "SELECT * FROM table"
+        ds.format = format
+        return ds
+
+    # getData test
+    # \brief It tests fetching typed columns into numpy arrays
+    def test_getData_numpy(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        available = list(DBaseSourceModule.DB_AVAILABLE)
+        DBaseSourceModule.DB_AVAILABLE.append("PGSQL")
+        fetchsize = DBaseSource.fetchsize
+        DBaseSource.fetchsize = 4
+        try:
+            rows = [(i, float(i) / 2) for i in range(10)]
+            cursor = FakeCursor(rows, [20, 701])
+            dt = self.pgsource(cursor, "IMAGE").getData()
+            self.assertEqual(dt["rank"], "IMAGE")
+            self.assertEqual(dt["tangoDType"], "DevDouble")
+            self.assertEqual(dt["shape"], [10, 2])
+            self.assertTrue(isinstance(dt["value"], numpy.ndarray))
+            self.assertEqual(dt["value"].dtype, numpy.float64)
+            self.assertEqual(dt["value"].tolist(), [list(r) for r in rows])
+            self.assertEqual(cursor.fetches, [4, 4, 4, 4])
+
+            cursor = FakeCursor([(i,) for i in range(7)], [21], 7)
+            dt = self.pgsource(cursor, "SPECTRUM").getData()
+            self.assertEqual(dt["rank"], "SPECTRUM")
+            self.assertEqual(dt["tangoDType"], "DevLong64")
+            self.assertEqual(dt["shape"], [7, 0])
+            self.assertEqual(dt["value"].dtype, numpy.int64)
+            self.assertEqual(dt["value"].tolist(), list(range(7)))
+
+            cursor = FakeCursor([(0.5,), (1.5,)], [700])
+            dt = self.pgsource(cursor, "SPECTRUM").getData()
+            self.assertEqual(dt["tangoDType"], "DevDouble")
+            self.assertEqual(dt["value"].dtype, numpy.float64)
+            self.assertEqual(dt["value"].tolist(), [0.5, 1.5])
+
+            cursor = FakeCursor(
+                [(1, 2), (3, 4)] + [(5, None)] * 4 + [(7, 8)], [23, 23])
+            dt = self.pgsource(cursor, "IMAGE").getData()
+            self.assertEqual(dt["tangoDType"], "DevLong64")
+            self.assertTrue(isinstance(dt["value"], list))
+            self.assertEqual(
+                dt["value"],
+                [[1, 2], [3, 4]] + [[5, None]] * 4 + [[7, 8]])
+
+            cursor = FakeCursor([(1.5, "a"), (2.5, "b")], [701, 25])
+            dt = self.pgsource(cursor, "IMAGE").getData()
+            self.assertEqual(dt["value"], [[1.5, "a"], [2.5, "b"]])
+            self.assertEqual(cursor.fetches, [None])
+
+            cursor = FakeCursor([(1.5, 2), (2.5, 3)], [701, 20])
+            dt = self.pgsource(cursor, "SPECTRUM").getData()
+            self.assertEqual(dt["value"], [1.5, 2])
+            self.assertEqual(cursor.fetches, [None])
+
+            cursor = FakeCursor([], [701])
+            self.myAssertRaise(
+                IndexError, self.pgsource(cursor, "SPECTRUM").getData)
+        finally:
+            DBaseSource.fetchsize = fetchsize
+            DBaseSourceModule.DB_AVAILABLE[:] = available
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -30,7 +30,7 @@ import time
 
 
 from nxswriter.DataHolder import DataHolder
-from nxswriter.Types import NTP, nptype
+from nxswriter.Types import NTP, Converters, nptype
 from nxswriter.DecoderPool import DecoderPool
 
 # if 64-bit machione
@@ -757,6 +757,71 @@ class DataHolderTest(unittest.TestCase):
                         else:
                             self.myAssertRaise(Exception, el.cast, it)
 
+    def test_cast_zero_copy(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        value = numpy.arange(12, dtype='float64').reshape(3, 4)
+        el = DataHolder("IMAGE", value, "DevDouble", [3, 4])
+        self.assertTrue(el.cast("float64") is value)
+        el = DataHolder("IMAGE", value, "DevLong", [3, 4])
+        self.assertTrue(el.cast("float64") is value)
+
+        swapped = value.astype('>f8')
+        el = DataHolder("IMAGE", swapped, "DevDouble", [3, 4])
+        self.assertTrue(el.cast("float64") is swapped)
+
+        el = DataHolder("IMAGE", value, "DevDouble", [3, 4])
+        res = el.cast("int32")
+        self.assertEqual(res.dtype.name, "int32")
+        self.assertEqual(res.tolist(), value.astype('int32').tolist())
+
+        res = el.cast("bool")
+        self.assertEqual(res.dtype.name, "bool")
+        self.assertEqual(res.tolist(), [[bool(e) for e in row]
+                                        for row in value.tolist()])
+
+    def test_cast_bool_strings(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        value = [" True", "false", "0", "1", "FALSE ", "", "no"]
+        expected = [True, False, False, True, False, True, True]
+        for arr in [numpy.array(value), numpy.array(value, dtype='S')]:
+            el = DataHolder("SPECTRUM", arr, "DevString", [len(value), 0])
+            res = el.cast("bool")
+            self.assertEqual(res.dtype.name, "bool")
+            self.assertEqual(
+                res.tolist(), [Converters.toBool(v) for v in arr.tolist()])
+        self.assertEqual(
+            [Converters.toBool(v) for v in value], expected)
+        el = DataHolder("SPECTRUM", value, "DevString", [len(value), 0])
+        self.assertEqual(el.cast("bool").tolist(), expected)
+        el = DataHolder("SPECTRUM", [1, 0, 2], "DevLong64", [3, 0])
+        self.assertEqual(el.cast("bool").tolist(), [True, False, True])
+
+    def test_cast_copy_counter(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        value = numpy.ones((4, 8), dtype='int32')
+        DataHolder.resetCopyCounter()
+        el = DataHolder("IMAGE", value, "DevLong", [4, 8])
+        el.cast("int32")
+        self.assertEqual(DataHolder.copyCounter["casts"], 0)
+        try:
+            DataHolder.debugCopies = True
+            el.cast("int32")
+            el.cast("int64")
+            el.cast("float64")
+            counter = DataHolder.resetCopyCounter()
+        finally:
+            DataHolder.debugCopies = False
+        self.assertEqual(
+            counter, {"casts": 3, "copies": 2, "bytes": 2 * 4 * 8 * 8})
+        self.assertEqual(
+            DataHolder.copyCounter, {"casts": 0, "copies": 0, "bytes": 0})
+
 
 if __name__ == '__main__':
     unittest.main()
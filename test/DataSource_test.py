@@ -185,6 +185,35 @@ class DataSourceTest(unittest.TestCase):
         node = et.fromstring("<node></node>")
         self.assertEqual(el._getText(node).strip(), '')
 
+    # getJSONIndex test
+    # \brief It tests normalized key indexes of JSON data
+    def test_getJSONIndex(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = DataSource()
+        self.assertEqual(el._normalizeKey("tango://Haso:10000/P/M/1"),
+                         "haso:10000/p/m/1")
+        self.assertEqual(el._normalizeKey("P/M/1/Position"),
+                         "p/m/1/position")
+        self.assertEqual(el._getJSONIndex(None), {})
+        self.assertEqual(el._getJSONIndex({}), {})
+        self.assertEqual(el._getJSONIndex({"datasources": {}}), {})
+
+        js = {"data": {"tango://Haso:10000/P/M/1": 1, "p/m/2": 2}}
+        index = el._getJSONIndex(js)
+        self.assertEqual(
+            index, {"haso:10000/p/m/1": "tango://Haso:10000/P/M/1",
+                    "p/m/2": "p/m/2"})
+        self.assertTrue(el._getJSONIndex(js) is index)
+        self.assertTrue(DataSource()._getJSONIndex(js) is index)
+        js["data"]["P/M/3"] = 3
+        index = el._getJSONIndex(js)
+        self.assertEqual(index["p/m/3"], "P/M/3")
+        self.assertEqual(el._getJSONData(index["p/m/3"], js, None),
+                         {"rank": "SCALAR", "tangoDType": "DevLong64",
+                          "value": 3, "shape": []})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -31,6 +31,7 @@ import time
 from nxswriter.FElement import FElementWithAttr
 from nxswriter.FElement import FElement
 from nxswriter.EField import EField
+from nxswriter.PreallocatedField import PreallocatedField
 from nxswriter.Element import Element
 from nxswriter.H5Elements import EFile
 from nxswriter.Types import NTP, Converters
@@ -2875,6 +2876,241 @@ class EFieldH5PYTest(unittest.TestCase):
         self._nxFile.close()
         os.remove(self._fname)
 
+    # fetch and write method tests
+    # \brief It tests if fetch does not touch the H5 object
+    def test_fetch_write_X_0d(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        FileWriter.writer = H5PYWriter
+        self._nxFile = FileWriter.create_file(
+            self._fname, overwrite=True).root()
+        eFile = EFile({}, None, self._nxFile)
+        steps = self.__rnd.randint(2, 10)
+        values = [self.__rnd.randint(-1000, 1000) for _ in range(steps)]
+        el = EField({"name": "int", "type": "NX_INT64", "units": "m"}, eFile)
+        el.strategy = 'STEP'
+        ds = TestDataSource()
+        el.source = ds
+        el.store()
+        for i in range(steps):
+            ds.value = {"rank": NTP.rTf[0], "value": values[i],
+                        "tangoDType": NTP.pTt["int64"], "shape": [0, 0]}
+            self.assertEqual(el.fetch(), None)
+            self.assertEqual(el.h5Object.shape, (i,))
+            ds.value = None
+            self.assertEqual(el.write(), None)
+            self.assertEqual(el.h5Object.shape, (i + 1,))
+            self.assertEqual(el.write(), None)
+            self.assertEqual(el.h5Object.shape, (i + 1,))
+        self.assertEqual(el.error, None)
+        self._sc.checkScalarField(
+            self._nxFile, "int", "int64", "NX_INT64", values,
+            attrs={"type": "NX_INT64", "units": "m"})
+
+        ds.valid = False
+        self.assertEqual(el.fetch(), None)
+        self.assertEqual(el.error, None)
+        self.assertEqual(el.write(), None)
+        self.assertEqual(el.error[1], 'Data without value')
+
+        self._nxFile.close()
+        os.remove(self._fname)
+
+    # write method tests
+    # \brief It tests writing steps with the write-behind buffer
+    def test_write_buffer_X_1d(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        FileWriter.writer = H5PYWriter
+        self._nxFile = FileWriter.create_file(
+            self._fname, overwrite=True).root()
+        eFile = EFile({}, None, self._nxFile)
+        size = self.__rnd.randint(2, 5)
+        steps = size * self.__rnd.randint(1, 4) + self.__rnd.randint(1, 3)
+        values = [[self.__rnd.randint(-1000, 1000) for _ in range(4)]
+                  for _ in range(steps)]
+        el = EField({"name": "spec", "type": "NX_INT64"}, eFile)
+        el.strategy = 'STEP'
+        el.rank = "1"
+        el.buffersize = size
+        ds = TestDataSource()
+        el.source = ds
+        el.store()
+        for i in range(steps):
+            ds.value = {"rank": NTP.rTf[1], "value": values[i],
+                        "tangoDType": NTP.pTt["int64"], "shape": [4, 0]}
+            el.fetch()
+            self.assertEqual(el.write(), None)
+            self.assertEqual(el.error, None)
+            self.assertEqual(el.h5Object.shape[0], (i + 1) // size * size)
+        self.assertEqual(el.flushBuffer(), None)
+        self.assertEqual(el.h5Object.shape, (steps, 4))
+        self.assertEqual(el.h5Object[...].tolist(), values)
+        self.assertEqual(el.flushBuffer(), None)
+        self.assertEqual(el.h5Object.shape, (steps, 4))
+
+        el.buffersize = 0
+        el.buffertime = 1
+        ds.value = {"rank": NTP.rTf[1], "value": values[0],
+                    "tangoDType": NTP.pTt["int64"], "shape": [4, 0]}
+        el.fetch()
+        el.write()
+        time.sleep(0.002)
+        el.fetch()
+        el.write()
+        self.assertEqual(el.h5Object.shape, (steps + 2, 4))
+
+        self._nxFile.close()
+        os.remove(self._fname)
+
+    # store method tests
+    # \brief It tests planned and requested chunk shapes
+    def test_store_chunks(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        FileWriter.writer = H5PYWriter
+        self._nxFile = FileWriter.create_file(
+            self._fname, overwrite=True).root()
+        eFile = EFile({}, None, self._nxFile)
+        nsteps = self.__rnd.randint(1, 100)
+
+        el = EField({"name": "scalar", "type": "NX_FLOAT64"}, eFile)
+        el.strategy = 'STEP'
+        el.source = TestDataSource()
+        el.store()
+        self.assertEqual(el.h5Object.h5object.chunks, (1024,))
+
+        el = EField({"name": "hint", "type": "NX_INT32"}, eFile)
+        el.strategy = 'STEP'
+        el.nsteps = nsteps
+        el.source = TestDataSource()
+        el.store()
+        self.assertEqual(el.h5Object.h5object.chunks, (nsteps,))
+
+        el = EField({"name": "image", "type": "NX_FLOAT64"}, eFile)
+        el.strategy = 'STEP'
+        el.rank = "2"
+        el.lengths = {"1": 1024, "2": 512}
+        el.source = TestDataSource()
+        el.store()
+        self.assertEqual(el.h5Object.h5object.chunks, (1, 256, 256))
+
+        el = EField({"name": "requested", "type": "NX_FLOAT64"}, eFile)
+        el.strategy = 'STEP'
+        el.rank = "1"
+        el.lengths = {"1": 10}
+        el.chunks = [nsteps, 0]
+        el.source = TestDataSource()
+        el.store()
+        self.assertEqual(el.h5Object.h5object.chunks, (nsteps, 10))
+
+        el = EField({"name": "wrong", "type": "NX_FLOAT64"}, eFile)
+        el.strategy = 'STEP'
+        el.chunks = [2, 3]
+        el.source = TestDataSource()
+        el.store()
+        self.assertEqual(el.chunks, None)
+        self.assertEqual(el.h5Object.h5object.chunks, (1024,))
+
+        self._nxFile.close()
+        os.remove(self._fname)
+
+    # write method tests
+    # \brief It tests writing steps with changing data shape
+    def test_write_plan_X_1d(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        FileWriter.writer = H5PYWriter
+        self._nxFile = FileWriter.create_file(
+            self._fname, overwrite=True).root()
+        eFile = EFile({}, None, self._nxFile)
+        lengths = [self.__rnd.randint(1, 5)
+                   for _ in range(self.__rnd.randint(2, 15))]
+        lengths.sort()
+        values = [[self.__rnd.randint(-1000, 1000) for _ in range(ln)]
+                  for ln in lengths]
+        el = EField({"name": "spec", "type": "NX_INT64"}, eFile)
+        el.strategy = 'STEP'
+        el.rank = "1"
+        ds = TestDataSource()
+        el.source = ds
+        el.canfail = True
+        el.store()
+        for i, vl in enumerate(values):
+            ds.value = {"rank": NTP.rTf[1], "value": vl,
+                        "tangoDType": NTP.pTt["int64"],
+                        "shape": [len(vl), 0]}
+            el.run()
+            self.assertEqual(el.error, None)
+            self.assertEqual(el.h5Object.shape, (i + 1, lengths[i]))
+            self.assertEqual(el.h5Object[i, 0:len(vl)].tolist(), vl)
+        for i, vl in enumerate(values):
+            self.assertEqual(el.h5Object[i, 0:len(vl)].tolist(), vl)
+
+        self._nxFile.close()
+        os.remove(self._fname)
+
+    # write method tests
+    # \brief It tests writing steps into preallocated fields
+    def test_write_nsteps_X_1d(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        self._fname = '%s/%s%s.h5' % (
+            os.getcwd(), self.__class__.__name__, fun)
+
+        FileWriter.writer = H5PYWriter
+        self._nxFile = FileWriter.create_file(
+            self._fname, overwrite=True).root()
+        eFile = EFile({}, None, self._nxFile)
+        nsteps = self.__rnd.randint(1, 10)
+        steps = self.__rnd.randint(1, 25)
+        values = [[self.__rnd.randint(-1000, 1000) for _ in range(3)]
+                  for _ in range(steps)]
+        el = EField({"name": "spec", "type": "NX_INT64"}, eFile)
+        el.strategy = 'STEP'
+        el.rank = "1"
+        el.nsteps = nsteps
+        ds = TestDataSource()
+        el.source = ds
+        el.store()
+        self.assertTrue(isinstance(el.h5Object, PreallocatedField))
+        for i in range(steps):
+            ds.value = {"rank": NTP.rTf[1], "value": values[i],
+                        "tangoDType": NTP.pTt["int64"], "shape": [3, 0]}
+            el.run()
+            self.assertEqual(el.error, None)
+            self.assertEqual(el.h5Object.shape, (i + 1, 3))
+            self.assertEqual(
+                el.h5Object.h5object.shape[0],
+                nsteps * ((i + nsteps) // nsteps))
+        self.assertEqual(el.h5Object[...].tolist(), values)
+        self.assertEqual(el.trim(), None)
+        self.assertEqual(el.h5Object.h5object.shape, (steps, 3))
+        self.assertEqual(el.h5Object.field[...].tolist(), values)
+
+        el = EField({"name": "init", "type": "NX_INT64"}, eFile)
+        el.strategy = 'INIT'
+        el.nsteps = nsteps
+        el.source = ds
+        el.store()
+        self.assertTrue(not isinstance(el.h5Object, PreallocatedField))
+        self.assertEqual(el.trim(), None)
+
+        self._nxFile.close()
+        os.remove(self._fname)
+
     # run method tests
     # \brief It tests default settings
     def test_run_X_0d_markFailed(self):
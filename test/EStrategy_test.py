@@ -258,6 +258,46 @@ class EStrategyTest(unittest.TestCase):
         self.assertEqual(st.last.shuffle, Converters.toBool(attrs["shuffle"]))
         self.assertEqual(el.shuffle, Converters.toBool(attrs["shuffle"]))
 
+    # constructor test
+    # \brief It tests write-behind buffer settings
+    def test_constructor_buffer(self):
+        print("Run: %s.test_constructor_buffer() " % self.__class__.__name__)
+        el = EField(self._fattrs, None)
+        self.assertEqual(el.buffersize, 0)
+        self.assertEqual(el.buffertime, 0)
+        st = EStrategy({"mode": "STEP", "buffer": "100"}, el)
+        self.assertEqual(el.buffersize, 100)
+        self.assertEqual(el.buffertime, 0)
+        st.setBuffer(20, 500)
+        self.assertEqual(el.buffersize, 100)
+        self.assertEqual(el.buffertime, 500)
+
+        el = EField(self._fattrs, None)
+        st = EStrategy({"mode": "STEP", "buffertime": "250.5"}, el)
+        self.assertEqual(el.buffersize, 0)
+        self.assertEqual(el.buffertime, 250.5)
+        st.setBuffer(20, 500)
+        self.assertEqual(el.buffersize, 20)
+        self.assertEqual(el.buffertime, 250.5)
+
+        el = EField(self._fattrs, None)
+        st = EStrategy({"mode": "STEP", "buffer": "-3",
+                        "buffertime": "-1"}, el)
+        self.assertEqual(el.buffersize, 0)
+        self.assertEqual(el.buffertime, 0)
+
+    # constructor test
+    # \brief It tests chunk settings
+    def test_constructor_chunks(self):
+        print("Run: %s.test_constructor_chunks() " % self.__class__.__name__)
+        el = EField(self._fattrs, None)
+        self.assertEqual(el.chunks, None)
+        self.assertEqual(el.chunkbytes, 0)
+        EStrategy({"mode": "STEP", "chunks": "16, 0,256",
+                   "chunkbytes": "65536"}, el)
+        self.assertEqual(el.chunks, [16, 0, 256])
+        self.assertEqual(el.chunkbytes, 65536)
+
     # store method test
     # \brief It tests executing store method
     def test_store(self):
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file JSONDecoderTest.py
+# unittests for the decoder of JSON strings
+#
+import unittest
+import sys
+import json
+
+import numpy
+
+from nxswriter.JSONDecoder import JSONDecoder
+from nxswriter.ClientSource import ClientSource
+
+
+# test fixture
+class JSONDecoderTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        self.__fastloads = JSONDecoder.fastloads
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        JSONDecoder.fastloads = self.__fastloads
+        print("tearing down ...")
+
+    # loads test
+    # \brief It tests decoding with and without the fast decoder
+    def test_loads(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        jsons = [
+            '{"data": {"a": 1, "b": [1.5, 2.5], "c": "text"}}',
+            '{"data": {"big": -10000000000000000000000003}}',
+            '{"data": {"big": [1, 18446744073709551616]}}',
+            '{"data": {"big": {"a": [[-9223372036854775809]]}}}',
+            '{"data": {"a": 1}, "b": [12345678901234567890123]}',
+            '{"data": {"nan": NaN}}',
+            '{}',
+            'null',
+        ]
+        for fastloads in [self.__fastloads, None]:
+            JSONDecoder.fastloads = fastloads
+            for js in jsons[:5] + jsons[6:]:
+                self.assertEqual(JSONDecoder.loads(js), json.loads(js))
+                self.assertEqual(JSONDecoder.loads(js.encode()),
+                                 json.loads(js))
+            self.assertEqual(
+                JSONDecoder.loads(jsons[2])["data"]["big"][1], 2 ** 64)
+            self.assertTrue(numpy.isnan(
+                JSONDecoder.loads(jsons[5])["data"]["nan"]))
+            self.assertRaises(ValueError, JSONDecoder.loads, '{"data": ')
+
+        calls = []
+
+        def fastloads(jsonstring):
+            calls.append(jsonstring)
+            return {"data": {"fast": 1}}
+
+        JSONDecoder.fastloads = fastloads
+        self.assertEqual(JSONDecoder.loads('{}'), {"data": {"fast": 1}})
+        self.assertEqual(calls, ['{}'])
+
+    # typed array test
+    # \brief It tests decoding of typed arrays
+    def test_loads_arrays(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        arrays = [
+            numpy.arange(12, dtype="float64").reshape(3, 4),
+            numpy.arange(5, dtype=">i4"),
+            numpy.array([True, False, True]),
+            numpy.ones((2, 3, 2), dtype="uint16"),
+        ]
+        for fastloads in [self.__fastloads, None]:
+            JSONDecoder.fastloads = fastloads
+            for arr in arrays:
+                rec = JSONDecoder.encodeArray(arr)
+                js = json.dumps({"data": {"img": rec, "n": 2},
+                                 "triggers": ["t1"]})
+                obj = JSONDecoder.loads(js)
+                self.assertEqual(obj["data"]["n"], 2)
+                self.assertEqual(obj["triggers"], ["t1"])
+                self.assertTrue(isinstance(obj["data"]["img"], numpy.ndarray))
+                self.assertEqual(obj["data"]["img"].dtype, arr.dtype)
+                self.assertEqual(obj["data"]["img"].shape, arr.shape)
+                self.assertTrue(numpy.array_equal(obj["data"]["img"], arr))
+                self.assertTrue(obj["data"]["img"].flags.writeable)
+
+                obj = JSONDecoder.loads(js, arrays=False)
+                self.assertEqual(obj["data"]["img"], rec)
+
+        rec = JSONDecoder.encodeArray(numpy.arange(6, dtype="int8"))
+        rec.pop("shape")
+        obj = JSONDecoder.decodeArrays({"data": {"a": rec}})
+        self.assertEqual(obj["data"]["a"].tolist(), list(range(6)))
+
+        rec["shape"] = [4, 2]
+        self.assertRaises(ValueError, JSONDecoder.decodeArrays,
+                          {"data": {"a": rec}})
+        rec["shape"] = [6]
+        rec["dtype"] = "object"
+        self.assertRaises(ValueError, JSONDecoder.decodeArrays,
+                          {"data": {"a": rec}})
+        self.assertRaises(ValueError, JSONDecoder.decodeArrays,
+                          {"data": {"a": {"__ndarray__": "AAA"}}})
+
+    # typed array test
+    # \brief It tests typed arrays in CLIENT datasources
+    def test_client_arrays(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        arr = numpy.arange(20, dtype="int32").reshape(4, 5)
+        js = json.dumps({"data": {"img": JSONDecoder.encodeArray(arr)}})
+        ds = ClientSource()
+        ds.name = "img"
+        ds.setJSON(JSONDecoder.loads(js))
+        dt = ds.getData()
+        self.assertEqual(dt["rank"], "IMAGE")
+        self.assertEqual(dt["tangoDType"], "DevLong")
+        self.assertEqual(dt["shape"], [4, 5])
+        self.assertTrue(numpy.array_equal(dt["value"], arr))
+
+
+if __name__ == '__main__':
+    unittest.main()
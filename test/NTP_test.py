@@ -712,6 +712,45 @@ class NTPTest(unittest.TestCase):
                 self.assertEqual(
                     el.arrayRankShape(numpy.array(a[0]))[2], a[3])
 
+    # arrayRankShapeValue test
+    # \brief It tests conversion of lists to numpy arrays
+    def test_arrayRankShapeValue(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        arr = [
+            [12, 0, [], "int", False],
+            ["text", 0, [], "str", False],
+            [[], 1, [0], None, False],
+            [[[]], 2, [1, 0], None, False],
+            [[1, 2, 3], 1, [3], "int", True],
+            [[1, 2.5], 1, [2], "int", True],
+            [[2.5, 1], 1, [2], "float", True],
+            [[True, 1], 1, [2], "bool", True],
+            [[[True, False]] * 3, 2, [3, 2], "bool", True],
+            [[["a", "bcd"]] * 2, 2, [2, 2], "str", True],
+            [[2 ** 63, 2 ** 64 - 1], 1, [2], "int", True],
+            [[2 ** 70, 1], 1, [2], "int", False],
+            [[[1, 2], [3]], 2, [2, 2], "int", False],
+            [numpy.ones((2, 3), dtype="int16"), 2, [2, 3], "int16", True],
+        ]
+        el = NTP()
+        for a in arr:
+            rank, shape, dtype, value = el.arrayRankShapeValue(a[0])
+            self.assertEqual(rank, a[1])
+            self.assertEqual(shape, a[2])
+            self.assertEqual(dtype, a[3])
+            if a[4]:
+                self.assertTrue(isinstance(value, numpy.ndarray))
+                self.assertEqual(list(value.shape), a[2])
+                self.assertEqual(value.tolist(), numpy.array(a[0]).tolist())
+            else:
+                self.assertTrue(value is a[0])
+            self.assertEqual(el.arrayRankShape(a[0]), (rank, shape, dtype))
+
+        value = numpy.ones((2, 3), dtype="int16")
+        self.assertTrue(el.arrayRankShapeValue(value)[3] is value)
+
     # arrayRank test
     # \brief It tests default settings
     def test_createArray_scalar(self):
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file PreallocatedField_test.py
+# unittests for growing fields with preallocated steps
+#
+import unittest
+import sys
+
+import numpy
+
+from nxswriter.PreallocatedField import PreallocatedField
+from nxswriter.TangoDataWriter import TangoDataWriter
+from nxswriter.Errors import ThreadError
+
+
+# growing field
+class Field(object):
+
+    # constructor
+    # \param shape field shape
+    def __init__(self, shape):
+        # field data
+        self.data = numpy.zeros(shape, dtype="int64")
+
+    # field shape
+    @property
+    def shape(self):
+        return self.data.shape
+
+    # grows the field
+    # \param dim growing dimension
+    # \param ext size of the grow
+    def grow(self, dim=0, ext=1):
+        shape = list(self.data.shape)
+        shape[dim] += ext
+        data = numpy.zeros(shape, dtype=self.data.dtype)
+        rows = min(shape[0], self.data.shape[0])
+        data[:rows] = self.data[:rows]
+        self.data = data
+
+    # gets value
+    def __getitem__(self, t):
+        return self.data[t]
+
+    # sets value
+    def __setitem__(self, t, o):
+        self.data[t] = o
+
+
+# thread pool
+class Pool(object):
+
+    # constructor
+    # \param calls list of the called methods
+    def __init__(self, calls):
+        self.calls = calls
+
+    def flushBuffers(self):
+        self.calls.append("flushBuffers")
+
+    def checkErrors(self):
+        self.calls.append("checkErrors")
+        if "error" in self.calls:
+            raise ThreadError("Problems in storing data")
+
+    def trim(self):
+        self.calls.append("trim")
+
+    def close(self):
+        self.calls.append("close")
+
+
+# test fixture
+class PreallocatedFieldTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # grow test
+    # \brief It tests growing and trimming of the reserved rows
+    def test_grow_trim(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = PreallocatedField(Field((0, 2)), 4, 3)
+        el.grow()
+        self.assertEqual(el.shape, (1, 2))
+        self.assertEqual(el.reserved, 4)
+        el.grow(ext=4)
+        self.assertEqual(el.shape, (5, 2))
+        self.assertEqual(el.reserved, 7)
+        el.trim()
+        self.assertEqual(el.shape, (5, 2))
+        self.assertEqual(el.reserved, 5)
+
+    # slice test
+    # \brief It tests indices with respect to the written rows
+    def test_getitem_setitem(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = PreallocatedField(Field((0, 2)), 6)
+        for i in range(3):
+            el.grow()
+            el[i, :] = [i, 10 * i]
+        self.assertEqual(el.reserved, 6)
+        value = [[0, 0], [1, 10], [2, 20]]
+        self.assertEqual(el[...].tolist(), value)
+        self.assertEqual(el[()].tolist(), value)
+        self.assertEqual(el[:].tolist(), value)
+        self.assertEqual(el[1:].tolist(), value[1:])
+        self.assertEqual(el[-2:].tolist(), value[-2:])
+        self.assertEqual(el[:-1].tolist(), value[:-1])
+        self.assertEqual(el[::2].tolist(), value[::2])
+        self.assertEqual(el[-1].tolist(), value[-1])
+        self.assertEqual(el[-1, 1], 20)
+        self.assertEqual(el[numpy.int64(-3), 1], 0)
+        self.assertEqual(el[..., 1].tolist(), [0, 10, 20])
+
+        el[-1] = [5, 50]
+        el[1:, 0] = 7
+        self.assertEqual(el[...].tolist(), [[0, 0], [7, 10], [7, 50]])
+        el[...] = 1
+        self.assertEqual(el.field.data[:3].tolist(), [[1, 1]] * 3)
+        self.assertEqual(el.field.data[3:].tolist(), [[0, 0]] * 3)
+
+    # closeFile test
+    # \brief It tests trimming of preallocated fields in closeFile
+    def test_closeFile_trim(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        calls = []
+        tdw = TangoDataWriter()
+        tdw._TangoDataWriter__stepPool = Pool(calls)
+        tdw.closeFile()
+        self.assertEqual(
+            calls, ["flushBuffers", "checkErrors", "trim", "close"])
+
+        del calls[:]
+        tdw.closeFile()
+        self.assertEqual(calls, [])
+
+        calls = ["error"]
+        tdw._TangoDataWriter__stepPool = Pool(calls)
+        self.assertRaises(ThreadError, tdw.closeFile)
+        self.assertEqual(
+            calls, ["error", "flushBuffers", "checkErrors", "trim", "close"])
+        self.assertEqual(tdw._TangoDataWriter__stepPool, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -132,6 +132,23 @@ class TangoSourceTest(unittest.TestCase):
         self.assertEqual(dp.dev_name(), "stestp09/testss/s1r228")
         self.assertEqual(dp.state(), PyTango._PyTango.DevState.ON)
 
+    # proxySetup test
+    # \brief It tests the total setup time
+    def test_proxySetup_timeout(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        dp = ProxyTools.proxySetup("stestp09/testss/s1r228", timeout=0)
+        self.assertTrue(isinstance(dp, PyTango.DeviceProxy))
+        self.assertEqual(dp.dev_name(), "stestp09/testss/s1r228")
+
+        dp = PyTango.DeviceProxy("stestp09/testss/s1r228")
+        self.assertFalse(ProxyTools.isConnectionError(Exception("error")))
+        try:
+            dp.read_attribute("NotExistingAttribute")
+        except Exception as e:
+            self.assertFalse(ProxyTools.isConnectionError(e))
+
     # constructor test
     # \brief It tests default settings
     def test_isProxyValid(self):
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file PyEvalCodeCacheTest.py
+# unittests for the cache of compiled PyEval scripts
+#
+import unittest
+import sys
+import json
+
+from nxswriter.PyEvalSource import PyEvalCodeCache
+from nxswriter.PyEvalSource import PyEvalSource
+from nxswriter.PyEvalSource import Variables
+from nxswriter.DataSourcePool import DataSourcePool
+
+
+# test fixture
+class PyEvalCodeCacheTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = PyEvalCodeCache()
+        self.assertEqual(el.maxsize, 1024)
+        self.assertEqual(el.hits, 0)
+        self.assertEqual(el.misses, 0)
+        self.assertEqual(len(el), 0)
+        self.assertEqual(PyEvalCodeCache(3).maxsize, 3)
+        self.assertTrue(isinstance(PyEvalSource.codes, PyEvalCodeCache))
+
+    # get test
+    # \brief It tests compiling scripts once
+    def test_get(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = PyEvalCodeCache()
+        code = el.get("ds.res = ds.inp * 2")
+        self.assertTrue(el.get("\n  ds.res = ds.inp * 2\n") is code)
+        self.assertEqual(el.hits, 1)
+        self.assertEqual(el.misses, 1)
+        self.assertTrue(el.get("ds.res = ds.inp * 3") is not code)
+        self.assertEqual(len(el), 2)
+        self.assertEqual(
+            el.key("ds.res = 1"), el.key("ds.res = 1"))
+        self.assertTrue(el.key("ds.res = 1") != el.key("ds.res = 2"))
+
+        ds = Variables()
+        ds.inp = 4
+        exec(code, {}, {"ds": ds})
+        self.assertEqual(ds.res, 8)
+        self.assertRaises(SyntaxError, el.get, "ds.res = = 1")
+        self.assertEqual(len(el), 2)
+
+        el.clear()
+        self.assertEqual(len(el), 0)
+        self.assertTrue(el.get("ds.res = ds.inp * 2") is not code)
+
+    # get test
+    # \brief It tests the maximal size
+    def test_get_maxsize(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = PyEvalCodeCache(2)
+        first = el.get("ds.res = 1")
+        el.get("ds.res = 2")
+        self.assertTrue(el.get("ds.res = 1") is first)
+        el.get("ds.res = 3")
+        self.assertEqual(len(el), 2)
+        self.assertTrue(el.get("ds.res = 1") is first)
+        self.assertEqual(el.misses, 3)
+        el.get("ds.res = 2")
+        self.assertEqual(el.misses, 4)
+
+    # getData test
+    # \brief It tests sharing compiled scripts by datasources
+    def test_getData_shared(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml = """
+<datasource>
+  <datasource type='CLIENT' name='inp'>
+    <record name='inp' />
+  </datasource>
+  <result name='res'>ds.res = ds.inp * %s</result>
+</datasource>
+"""
+        codes = PyEvalSource.codes
+        PyEvalSource.codes = PyEvalCodeCache()
+        try:
+            dp = DataSourcePool()
+            gjson = json.loads('{"data":{"inp":21}}')
+            sources = []
+            for factor in [2, 2, 2, 3]:
+                ds = PyEvalSource()
+                self.assertEqual(ds.setup(xml % factor), None)
+                ds.setJSON(gjson)
+                ds.setDataSources(dp)
+                sources.append(ds)
+            self.assertEqual(PyEvalSource.codes.misses, 2)
+            self.assertEqual(PyEvalSource.codes.hits, 2)
+            self.assertEqual(
+                [ds.getData()["value"] for ds in sources],
+                [42, 42, 42, 63])
+            self.assertEqual(PyEvalSource.codes.misses, 2)
+            self.assertEqual(PyEvalSource.codes.hits, 2)
+
+            ds = PyEvalSource()
+            self.assertEqual(
+                ds.setup(xml.replace("* %s", "= = 1")), None)
+            ds.setJSON(gjson)
+            ds.setDataSources(dp)
+            self.assertRaises(SyntaxError, ds.getData)
+        finally:
+            PyEvalSource.codes = codes
+
+
+if __name__ == '__main__':
+    unittest.main()
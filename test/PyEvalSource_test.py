@@ -26,11 +26,15 @@ import random
 import struct
 import json
 import binascii
+import threading
+import time
+import numpy
 
 
 from nxswriter.DataSources import DataSource
 from nxswriter.PyEvalSource import PyEvalSource
 from nxswriter.DataSourcePool import DataSourcePool
+from nxswriter.WorkerPool import WorkerPool
 from nxswriter.Errors import DataSourceSetupError
 from nxswriter.Types import Converters, NTP
 
@@ -42,6 +46,49 @@ if sys.version_info > (3,):
     unicode = str
 
 
+# datasource with a slow read of the value given in xml
+class SlowSource(DataSource):
+
+    # threads reading the data at the same time
+    active = 0
+    # maximal number of threads reading the data at the same time
+    maxactive = 0
+    # lock
+    lock = threading.Lock()
+
+    # sets the datasource up
+    # \param xml datasource parameters
+    def setup(self, xml):
+        self.value = xml.split('value="')[1].split('"')[0]
+
+    # provides the data record
+    def getData(self):
+        with self.lock:
+            SlowSource.active += 1
+            SlowSource.maxactive = max(
+                SlowSource.maxactive, SlowSource.active)
+        time.sleep(0.1)
+        with self.lock:
+            SlowSource.active -= 1
+        if self.value == "fail":
+            raise ValueError("Slow failure")
+        return {"rank": "SCALAR", "value": float(self.value),
+                "tangoDType": "DevDouble", "shape": [1, 0]}
+
+
+# datasource with a read-only array
+class ArraySource(DataSource):
+
+    # read-only array
+    value = numpy.arange(3)
+    value.flags.writeable = False
+
+    # provides the data record
+    def getData(self):
+        return {"rank": "SPECTRUM", "value": self.value,
+                "tangoDType": "DevLong64", "shape": [3, 0]}
+
+
 # test fixture
 class PyEvalSourceTest(unittest.TestCase):
 
@@ -645,6 +692,97 @@ else:
         self.assertTrue(isinstance(el, object))
         self.assertEqual(el.isValid(), True)
 
+    # getData test
+    # \brief It tests changing read-only array inputs in place
+    def test_getData_readonly_input(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        dp = DataSourcePool()
+        dp.append(ArraySource, "ARRAY")
+        ds = PyEvalSource()
+        self.assertEqual(ds.setup(
+            "<datasource>"
+            "<datasource type='ARRAY' name='arr'/>"
+            "<result name='res'>ds.arr *= 2\nds.res = ds.arr</result>"
+            "</datasource>"), None)
+        ds.setDataSources(dp)
+        dt = ds.getData()
+        self.assertEqual(dt["value"].tolist(), [0, 2, 4])
+        self.assertEqual(ArraySource.value.tolist(), [0, 1, 2])
+
+    # getData test
+    # \brief It tests lists of nested PYEVAL inputs
+    def test_getData_nested_lists(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        ds = PyEvalSource()
+        self.assertEqual(ds.setup("""
+<datasource>
+  <datasource type='PYEVAL' name='inp'>
+    <datasource type='CLIENT' name='cl'>
+      <record name='rinp' />
+    </datasource>
+    <result name='res'>ds.res = ds.cl + [4]</result>
+  </datasource>
+  <datasource type='CLIENT' name='inp2'>
+    <record name='rinp2' />
+  </datasource>
+  <result name='res'>ds.res = ds.inp + ds.inp2</result>
+</datasource>
+"""), None)
+        ds.setJSON(json.loads('{"data":{"rinp":[1, 2, 3], "rinp2":[5]}}'))
+        ds.setDataSources(DataSourcePool())
+        dt = ds.getData()
+        self.checkData(dt, "SPECTRUM", [1, 2, 3, 4, 5], "DevLong64", [5])
+
+    # getData test
+    # \brief It tests fetching inputs by the input workers
+    def test_getData_inputworkers(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        xml = "<datasource>%s" \
+            "<datasource type='CLIENT' name='cl'><record name='cl'/>" \
+            "</datasource>" \
+            "<result name='res'>ds.res = ds.cl + %s</result>" \
+            "</datasource>"
+        inputs = "".join(
+            "<datasource type='SLOW' name='in%s'>"
+            "<slow value='%s'/></datasource>" % (i, i + 1) for i in range(4))
+        script = " + ".join("ds.in%s" % i for i in range(4))
+
+        dp = DataSourcePool()
+        dp.append(SlowSource, "SLOW")
+        gjson = json.loads('{"data":{"cl":100}}')
+        for workers in [None, WorkerPool(4)]:
+            dp.inputworkers = workers
+            SlowSource.maxactive = 0
+            ds = PyEvalSource()
+            self.assertEqual(ds.setup(xml % (inputs, script)), None)
+            ds.setJSON(gjson)
+            ds.setDataSources(dp)
+            start = time.time()
+            dt = ds.getData()
+            duration = time.time() - start
+            self.assertEqual(dt["value"], 110.)
+            if workers is None:
+                self.assertEqual(SlowSource.maxactive, 1)
+                self.assertTrue(duration >= 0.4)
+            else:
+                self.assertEqual(SlowSource.maxactive, 4)
+                self.assertTrue(duration < 0.3)
+
+            ds = PyEvalSource()
+            self.assertEqual(ds.setup(xml % (
+                inputs.replace("value='2'", "value='fail'"), script)), None)
+            ds.setJSON(gjson)
+            ds.setDataSources(dp)
+            self.myAssertRaise(ValueError, ds.getData)
+            if workers is not None:
+                workers.close()
+
 
 if __name__ == '__main__':
     unittest.main()
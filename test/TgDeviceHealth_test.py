@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file TgDeviceHealthTest.py
+# unittests for the shared connection state of tango devices
+#
+import unittest
+import sys
+import time
+
+from nxswriter.TangoSource import TgDeviceHealth
+from nxswriter.TangoSource import ProxyTools
+from nxswriter.Errors import DataSourceSetupError
+
+
+# device proxy without a connection
+class proxy(object):
+
+    # ping method
+    def ping(self):
+        raise Exception("Device not exported")
+
+
+# deferred datasource
+class source(object):
+
+    # constructor
+    def __init__(self, device):
+        self.device = device
+        self.proxy = None
+
+    # binds the proxy
+    def setProxy(self, proxy):
+        self.proxy = proxy
+
+
+# test fixture
+class TgDeviceHealthTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        ProxyTools.proxies.clear()
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgDeviceHealth("p/m/1")
+        self.assertEqual(el.device, "p/m/1")
+        self.assertEqual(el.proxy, None)
+        self.assertEqual(el.timeout, None)
+        self.assertEqual(el.failures, 0)
+        self.assertEqual(el.retrytime, 0)
+
+        dp = proxy()
+        el = TgDeviceHealth("p/m/1", dp, 2.)
+        self.assertTrue(el.proxy is dp)
+        self.assertEqual(el.timeout, 2.)
+
+    # getProxy test
+    # \brief It tests that a working proxy is not pinged
+    def test_getProxy(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        dp = proxy()
+        el = TgDeviceHealth("p/m/1", dp)
+        for _ in range(3):
+            self.assertTrue(el.getProxy() is dp)
+
+        el.markFailed(proxy())
+        self.assertTrue(el.getProxy() is dp)
+        el.markFailed(dp)
+        self.assertEqual(el.proxy, None)
+
+    # getProxy test
+    # \brief It tests failing fast during the backoff time
+    def test_getProxy_backoff(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgDeviceHealth("p/m/1")
+        el.failures = 3
+        el.retrytime = time.time() + 100
+        start = time.time()
+        self.assertRaises(DataSourceSetupError, el.getProxy)
+        self.assertTrue(time.time() - start < 0.1)
+        self.assertEqual(el.failures, 3)
+
+    # isConnectionError test
+    # \brief It tests that other errors do not cause reconnects
+    def test_isConnectionError(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertFalse(ProxyTools.isConnectionError(Exception("error")))
+        self.assertFalse(ProxyTools.isConnectionError(ValueError("error")))
+
+    # setupProxies test
+    # \brief It tests setting up devices once and in parallel
+    def test_setupProxies(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        calls = []
+
+        def proxySetup(device, streams=None, timeout=None):
+            calls.append(device)
+            time.sleep(0.2)
+            return proxy()
+
+        old = ProxyTools.__dict__["proxySetup"]
+        ProxyTools.proxySetup = staticmethod(proxySetup)
+        try:
+            srcs = [source("p/m/%s" % (i % 4)) for i in range(8)]
+            start = time.time()
+            ProxyTools.setupProxies(srcs, 4, 5.)
+            self.assertTrue(time.time() - start < 0.6)
+        finally:
+            ProxyTools.proxySetup = old
+        self.assertEqual(sorted(calls), ["p/m/%s" % i for i in range(4)])
+        for i, src in enumerate(srcs):
+            self.assertTrue(isinstance(src.proxy, proxy))
+            self.assertTrue(src.proxy is srcs[i % 4].proxy)
+
+    # setupProxies test
+    # \brief It tests failing after the common timeout
+    def test_setupProxies_timeout(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        def proxySetup(device, streams=None, timeout=None):
+            if device == "p/m/0":
+                return proxy()
+            time.sleep(timeout)
+
+        old = ProxyTools.__dict__["proxySetup"]
+        ProxyTools.proxySetup = staticmethod(proxySetup)
+        try:
+            srcs = [source("p/m/0"), source("p/m/1"), source("p/m/2")]
+            start = time.time()
+            self.assertRaises(
+                DataSourceSetupError, ProxyTools.setupProxies,
+                srcs, 2, 0.2)
+            self.assertTrue(time.time() - start < 1.)
+        finally:
+            ProxyTools.proxySetup = old
+        self.assertTrue(isinstance(srcs[0].proxy, proxy))
+        self.assertEqual(srcs[1].proxy, None)
+        self.assertEqual(srcs[2].proxy, None)
+
+    # setupProxies test
+    # \brief It tests reusing proxies of the proxy pool
+    def test_setupProxies_pool(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        calls = []
+
+        def proxySetup(device, streams=None, timeout=None):
+            calls.append(device)
+            return proxy()
+
+        old = ProxyTools.__dict__["proxySetup"]
+        ProxyTools.proxySetup = staticmethod(proxySetup)
+        try:
+            srcs = [source("p/m/0"), source("P/M/1")]
+            ProxyTools.setupProxies(srcs, 2)
+            srcs2 = [source("p/m/0"), source("tango://p/m/1")]
+            ProxyTools.setupProxies(srcs2, 2)
+        finally:
+            ProxyTools.proxySetup = old
+        self.assertEqual(sorted(calls), ["P/M/1", "p/m/0"])
+        self.assertTrue(srcs2[0].proxy is srcs[0].proxy)
+        self.assertTrue(srcs2[1].proxy is srcs[1].proxy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file TgEventCacheTest.py
+# unittests for the cache of tango attribute events
+#
+import unittest
+import sys
+import time
+import threading
+
+from nxswriter.TangoSource import TgEventCache
+from nxswriter.TangoSource import TangoSource
+
+
+# tango event
+class Event(object):
+
+    def __init__(self, value=None, err=False):
+        self.attr_value = value
+        self.err = err
+
+
+# device proxy with events
+class EventProxy(object):
+
+    def __init__(self, failing=None):
+        self.failing = failing or []
+        self.subscribed = {}
+        self.counter = 0
+
+    def subscribe_event(self, name, etype, callback):
+        if etype in self.failing:
+            raise Exception("Event properties not set")
+        self.counter += 1
+        self.subscribed[self.counter] = (name, etype, callback)
+        callback.push_event(Event("%s:%s" % (name, etype)))
+        return self.counter
+
+    def unsubscribe_event(self, eid):
+        self.subscribed.pop(eid)
+
+
+# datasource pool
+class pool(object):
+
+    def __init__(self):
+        self.common = {}
+        self.lock = threading.Lock()
+        self.counter = 1
+
+
+# test fixture
+class TgEventCacheTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgEventCache("p/m/1", "Position")
+        self.assertEqual(el.device, "p/m/1")
+        self.assertEqual(el.name, "Position")
+        self.assertEqual(el.maxage, TgEventCache.maxage)
+        self.assertEqual(el.proxy, None)
+        self.assertEqual(el.eventids, [])
+        self.assertEqual(el.getData(), None)
+        self.assertEqual(el.hits, 0)
+        self.assertEqual(el.misses, 1)
+
+        el = TgEventCache("p/m/1", "Position", 0.5)
+        self.assertEqual(el.maxage, 0.5)
+
+    # push_event test
+    # \brief It tests serving values not older than maxage
+    def test_push_event(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgEventCache("p/m/1", "Position", 0.1)
+        el.push_event(Event(12))
+        self.assertEqual(el.getData(), 12)
+        el.push_event(Event(13))
+        self.assertEqual(el.getData(), 13)
+        self.assertEqual(el.hits, 2)
+        time.sleep(0.15)
+        self.assertEqual(el.getData(), None)
+        self.assertEqual(el.misses, 1)
+        el.push_event(Event(14))
+        self.assertEqual(el.getData(), 14)
+        el.push_event(Event(15, True))
+        self.assertEqual(el.getData(), None)
+
+    # update test
+    # \brief It tests storing values of synchronous reads
+    def test_update(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgEventCache("p/m/1", "Position", 0.1)
+        el.update(11)
+        self.assertEqual(el.getData(), None)
+
+        dp = EventProxy(["periodic"])
+        self.assertTrue(el.subscribe(dp, ["change", "periodic"]))
+        self.assertEqual(el.getData(), "Position:change")
+        time.sleep(0.15)
+        self.assertEqual(el.getData(), None)
+        el.update(12)
+        self.assertEqual(el.getData(), 12)
+        el.update(None)
+        self.assertEqual(el.getData(), 12)
+        time.sleep(0.15)
+        self.assertEqual(el.getData(), None)
+        el.update(13)
+        self.assertEqual(el.getData(), 13)
+        self.assertEqual(el.hits, 4)
+        self.assertEqual(el.misses, 3)
+
+        el.push_event(Event(14))
+        self.assertEqual(el.getData(), 14)
+        el.unsubscribe()
+        el.update(15)
+        self.assertEqual(el.getData(), None)
+
+    # subscribe test
+    # \brief It tests subscribing available event types
+    def test_subscribe(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        dp = EventProxy(["change"])
+        el = TgEventCache("p/m/1", "Position")
+        self.assertTrue(el.subscribe(dp, ["change", "periodic"]))
+        self.assertTrue(el.proxy is dp)
+        self.assertEqual(el.eventids, [1])
+        self.assertEqual(dp.subscribed[1][:2], ("Position", "periodic"))
+        self.assertEqual(el.getData(), "Position:periodic")
+
+        el.unsubscribe()
+        self.assertEqual(dp.subscribed, {})
+        self.assertEqual(el.eventids, [])
+        self.assertEqual(el.proxy, None)
+        self.assertEqual(el.getData(), None)
+
+        dp = EventProxy(["change", "periodic"])
+        self.assertTrue(not el.subscribe(dp, ["change", "periodic"]))
+        self.assertEqual(el.eventids, [])
+
+    # event mode test
+    # \brief It tests the event mode of tango datasources
+    def test_eventmode(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        pl = pool()
+        ds = TangoSource()
+        ds.deferred = True
+        ds.setup(
+            "<datasource><device name='p/m/1' group='g1' mode='event' "
+            "maxage='0.5'/><record name='Position'/></datasource>")
+        self.assertTrue(ds.eventmode)
+        self.assertEqual(ds.maxage, 0.5)
+        self.assertEqual(ds.group, None)
+        ds.setDataSources(pl)
+        ds2 = TangoSource()
+        ds2.deferred = True
+        ds2.setup(
+            "<datasource><device name='p/m/1' mode='event'/>"
+            "<record name='position'/></datasource>")
+        ds2.setDataSources(pl)
+        ds2.setAutoGroup("t1")
+        self.assertEqual(ds2.group, None)
+        events = pl.common['TANGO_EVENTS']
+        self.assertEqual(list(events.keys()), [("p/m/1", "position")])
+        self.assertEqual(events[("p/m/1", "position")].maxage, 0.5)
+
+        ds3 = TangoSource()
+        ds3.deferred = True
+        ds3.setup(
+            "<datasource><device name='p/m/1' member='property' "
+            "group='g1' mode='event'/>"
+            "<record name='DeviceName'/></datasource>")
+        self.assertTrue(not ds3.eventmode)
+        self.assertEqual(ds3.group, "g1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file TgGroupIsolatedTest.py
+# unittests for automatic tango groups with isolated attribute errors
+#
+import unittest
+import sys
+
+from nxswriter.TangoSource import TgGroup
+from nxswriter.TangoSource import TgMember
+from nxswriter.TangoSource import TgInterfaceCache
+from nxswriter.Errors import DataSourceSetupError
+
+
+# device attribute
+class DeviceAttribute(object):
+
+    def __init__(self, value, failed=False):
+        self.value = value
+        self.has_failed = failed
+        self.data_format = "SCALAR"
+        self.type = "DevDouble"
+        self.dim_x = 1
+        self.dim_y = 0
+
+
+# device proxy counting its calls
+class CountingProxy(object):
+
+    def __init__(self, values):
+        self.values = values
+        self.failed = []
+        self.broken = []
+        self.calls = {}
+        self.log = []
+
+    def count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def get_attribute_list(self):
+        self.count("get_attribute_list")
+        return list(self.values.keys())
+
+    def read_attributes(self, names):
+        self.count("read_attributes")
+        if any(nm in self.broken for nm in names):
+            raise Exception("Attribute not readable")
+        return [DeviceAttribute(self.values[nm], nm in self.failed)
+                for nm in names]
+
+    def read_attribute(self, name):
+        self.count("read_attribute")
+        if name in self.broken:
+            raise Exception("Attribute %s not readable" % name)
+        return DeviceAttribute(self.values[name])
+
+    def read_attributes_asynch(self, names):
+        self.count("read_attributes_asynch")
+        self.log.append(("send", self))
+        return list(names)
+
+    def read_attributes_reply(self, rid, timeout):
+        self.count("read_attributes_reply")
+        self.log.append(("reply", self))
+        return self.read_attributes(rid)
+
+    def get_timeout_millis(self):
+        return 3000
+
+
+# test fixture
+class TgGroupIsolatedTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # creates group with members
+    # \param proxies device proxies
+    # \param names attribute names of devices
+    # \returns group and its members
+    def createGroup(self, proxies, names):
+        gr = TgGroup()
+        gr.isolated = True
+        gr.interfaces = TgInterfaceCache()
+        members = {}
+        for dv, proxy in proxies.items():
+            tdv = gr.getDevice(dv)
+            tdv.proxy = proxy
+            for nm in names[dv]:
+                members[(dv, nm)] = tdv.setMember(TgMember(nm))
+        return gr, members
+
+    # getData test
+    # \brief It tests one read_attributes call per device and step
+    def test_getData(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        p1 = CountingProxy({"A": 1., "B": 2., "C": 3.})
+        p2 = CountingProxy({"X": 4., "Y": 5.})
+        gr, members = self.createGroup(
+            {"p/m/1": p1, "p/m/2": p2},
+            {"p/m/1": ["A", "B", "C"], "p/m/2": ["X", "Y"]})
+        for step in range(1, 4):
+            for (dv, nm), mb in members.items():
+                gr.getData(step, gr.devices[dv].proxy, mb, dv)
+                self.assertEqual(mb.getValue()["value"],
+                                 gr.devices[dv].proxy.values[nm])
+        self.assertEqual(p1.calls, {"get_attribute_list": 1,
+                                    "read_attributes": 3})
+        self.assertEqual(p2.calls, {"get_attribute_list": 1,
+                                    "read_attributes": 3})
+
+    # getData test
+    # \brief It tests isolation of attribute errors
+    def test_getData_errors(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        p1 = CountingProxy({"A": 1., "B": 2., "C": 3.})
+        gr, members = self.createGroup(
+            {"p/m/1": p1}, {"p/m/1": ["A", "B", "C", "D"]})
+        p1.failed = ["B"]
+        gr.getData(1, p1, members[("p/m/1", "A")], "p/m/1")
+        self.assertEqual(members[("p/m/1", "A")].getValue()["value"], 1.)
+        self.assertEqual(members[("p/m/1", "C")].getValue()["value"], 3.)
+        self.assertRaises(DataSourceSetupError,
+                          members[("p/m/1", "B")].getValue)
+        self.assertRaises(DataSourceSetupError,
+                          members[("p/m/1", "D")].getValue)
+        gr.getData(1, p1, members[("p/m/1", "B")], "p/m/1")
+        self.assertEqual(p1.calls.get("read_attribute"), None)
+
+        p1.failed = []
+        p1.broken = ["C"]
+        gr.getData(2, p1, members[("p/m/1", "A")], "p/m/1")
+        self.assertEqual(members[("p/m/1", "A")].getValue()["value"], 1.)
+        self.assertEqual(members[("p/m/1", "B")].getValue()["value"], 2.)
+        self.assertRaises(DataSourceSetupError,
+                          members[("p/m/1", "C")].getValue)
+        self.assertEqual(p1.calls["read_attributes"], 2)
+        self.assertEqual(p1.calls["read_attribute"], 3)
+
+        gr.isolated = False
+        self.assertRaises(DataSourceSetupError, gr.getData, 3, p1,
+                          members[("p/m/1", "A")], "p/m/1")
+
+    # getData test
+    # \brief It tests sending requests to all devices before replies
+    def test_getData_asynch(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        p1 = CountingProxy({"A": 1., "B": 2.})
+        p2 = CountingProxy({"X": 4., "Y": 5.})
+        gr, members = self.createGroup(
+            {"p/m/1": p1, "p/m/2": p2},
+            {"p/m/1": ["A", "B"], "p/m/2": ["X", "Y"]})
+        gr.asynch = True
+        log = []
+        p1.log = p2.log = log
+        gr.getData(1, p1, members[("p/m/1", "A")], "p/m/1")
+        self.assertEqual([lg[0] for lg in log],
+                         ["send", "send", "reply", "reply"])
+        for (dv, nm), mb in members.items():
+            self.assertEqual(mb.getValue()["value"],
+                             gr.devices[dv].proxy.values[nm])
+
+        p2.broken = ["Y"]
+        gr.getData(2, p1, members[("p/m/1", "A")], "p/m/1")
+        self.assertEqual(members[("p/m/2", "X")].getValue()["value"], 4.)
+        self.assertRaises(DataSourceSetupError,
+                          members[("p/m/2", "Y")].getValue)
+        self.assertEqual(members[("p/m/1", "B")].getValue()["value"], 2.)
+
+
+if __name__ == '__main__':
+    unittest.main()
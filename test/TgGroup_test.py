@@ -760,6 +760,61 @@ class TgGroupTest(unittest.TestCase):
                     None, None, arr[k][4] if len(arr[k]) > 4 else 0)
             flip = not flip
 
+    # getData test
+    # \brief It tests concurrent asynchronous reads of devices
+    def test_getData_asynch(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        arr = {
+            "ScalarShort": ["int16", "DevShort", -123],
+            "ScalarLong": ["int64", "DevLong", -124],
+            "ScalarDouble": ["float64", "DevDouble", -2.456673e+02, 1e-14],
+            "ScalarString": ["string", "DevString", "MyTrue"],
+        }
+        arrb = {
+            "ScalarShort": ["int16", "DevShort", -112],
+            "ScalarLong": ["int64", "DevLong", -255],
+            "ScalarDouble": ["float64", "DevDouble", -1.414532e+02, 1e-14],
+            "ScalarString": ["string", "DevString", "MyFalse"],
+        }
+        cmds = {
+            "GetLong": ["ScalarLong", "int64", "DevLong"],
+            "GetString": ["ScalarString", "string", "DevString"],
+        }
+
+        counter = self.__rnd.randint(-2, 10)
+        dvn = 'stestp09/testss/s1r228'
+        dvn2 = 'stestp09/testss/s2r228'
+        gr = TgGroup(-100)
+        gr.asynch = True
+        dv = gr.getDevice(dvn)
+        dv2 = gr.getDevice(dvn2)
+        for k in arr:
+            dv.setMember(TgMember(k))
+            dv2.setMember(TgMember(k))
+        for k in cmds:
+            dv.setMember(TgMember(k, "command"))
+            dv2.setMember(TgMember(k, "command"))
+
+        for values, values2, step in [(arr, arrb, counter),
+                                      (arrb, arr, counter + 1)]:
+            for k in values:
+                self._simps.dp.write_attribute(k, values[k][2])
+                self._simps2.dp.write_attribute(k, values2[k][2])
+            gr.getData(step)
+            for dname, vals in [(dvn, values), (dvn2, values2)]:
+                for k in vals:
+                    dt = gr.getDevice(dname).members[k].getValue()
+                    self.checkData(
+                        dt, "SCALAR", vals[k][2], vals[k][1], [1, 0],
+                        None, None, vals[k][3] if len(vals[k]) > 3 else 0)
+                for k in cmds:
+                    dt = gr.getDevice(dname).members[k].getValue()
+                    self.checkData(
+                        dt, "SCALAR", vals[cmds[k][0]][2], cmds[k][2],
+                        [1, 0], None, None)
+
     # getData test
     # \brief It tests default settings
     def test_getData_dev_prop(self):
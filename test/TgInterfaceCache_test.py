@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file TgInterfaceCacheTest.py
+# unittests for the cache of tango device member lists
+#
+import unittest
+import sys
+
+from nxswriter.TangoSource import TgInterfaceCache
+from nxswriter.TangoSource import TgMember
+
+
+# command info
+class CommandInfo(object):
+
+    def __init__(self, name):
+        self.cmd_name = name
+
+
+# device proxy counting its calls
+class CountingProxy(object):
+
+    def __init__(self):
+        self.attributes = ["Position", "Counts"]
+        self.properties = ["DeviceName"]
+        self.commands = ["State", "GetValue"]
+        self.calls = {}
+        self.fail = False
+
+    def count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def get_attribute_list(self):
+        self.count("get_attribute_list")
+        return list(self.attributes)
+
+    def get_property_list(self, pattern):
+        self.count("get_property_list")
+        return list(self.properties)
+
+    def command_list_query(self):
+        self.count("command_list_query")
+        return [CommandInfo(cm) for cm in self.commands]
+
+    def read_attribute(self, name):
+        self.count("read_attribute")
+        if self.fail:
+            raise Exception("Device not exported")
+        return name
+
+
+# test fixture
+class TgInterfaceCacheTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgInterfaceCache()
+        self.assertEqual(el.hits, 0)
+        self.assertEqual(el.misses, 0)
+        self.assertEqual(el.hitRatio(), 0.)
+
+    # fetchNames test
+    # \brief It tests fetching lowercase member lists
+    def test_fetchNames(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        proxy = CountingProxy()
+        self.assertEqual(TgInterfaceCache.fetchNames(proxy, "attribute"),
+                         set(["position", "counts"]))
+        self.assertEqual(TgInterfaceCache.fetchNames(proxy, "property"),
+                         set(["devicename"]))
+        self.assertEqual(TgInterfaceCache.fetchNames(proxy, "command"),
+                         set(["state", "getvalue"]))
+        self.assertEqual(TgInterfaceCache.fetchNames(proxy, "other"), set())
+
+    # hasMember test
+    # \brief It tests cached lookups
+    def test_hasMember(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        proxy = CountingProxy()
+        el = TgInterfaceCache()
+        for _ in range(10):
+            self.assertTrue(
+                el.hasMember("p/m/1", proxy, "attribute", "POSITION"))
+            self.assertTrue(el.hasMember("p/m/1", proxy, "command", "state"))
+        self.assertEqual(proxy.calls, {"get_attribute_list": 1,
+                                       "command_list_query": 1})
+        self.assertEqual(el.hits, 18)
+        self.assertEqual(el.misses, 2)
+        self.assertEqual(el.hitRatio(), 0.9)
+
+        proxy.attributes.append("Energy")
+        self.assertTrue(el.hasMember("p/m/1", proxy, "attribute", "energy"))
+        self.assertFalse(el.hasMember("p/m/1", proxy, "attribute", "temp"))
+        self.assertEqual(proxy.calls["get_attribute_list"], 3)
+
+        self.assertTrue(el.hasMember("p/m/2", proxy, "attribute", "counts"))
+        self.assertEqual(proxy.calls["get_attribute_list"], 4)
+        el.invalidate("p/m/1")
+        self.assertTrue(el.hasMember("p/m/2", proxy, "attribute", "counts"))
+        self.assertTrue(el.hasMember("p/m/1", proxy, "attribute", "counts"))
+        self.assertEqual(proxy.calls["get_attribute_list"], 5)
+        el.invalidate()
+        self.assertTrue(el.hasMember("p/m/2", proxy, "attribute", "counts"))
+        self.assertEqual(proxy.calls["get_attribute_list"], 6)
+
+    # TgMember.getData test
+    # \brief It tests reading members with the cache
+    def test_member_getData(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        proxy = CountingProxy()
+        el = TgInterfaceCache()
+        mb = TgMember("Position")
+        for _ in range(5):
+            mb.getData(proxy, el, "p/m/1")
+            self.assertTrue(mb.isDataSet())
+        self.assertEqual(proxy.calls, {"get_attribute_list": 1,
+                                       "read_attribute": 5})
+
+        proxy.fail = True
+        self.assertRaises(Exception, mb.getData, proxy, el, "p/m/1")
+        proxy.fail = False
+        mb.getData(proxy, el, "p/m/1")
+        self.assertEqual(proxy.calls["get_attribute_list"], 2)
+
+        mb = TgMember("Position")
+        mb.getData(proxy)
+        self.assertTrue(mb.isDataSet())
+        self.assertEqual(proxy.calls["get_attribute_list"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
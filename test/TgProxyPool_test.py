@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file TgProxyPoolTest.py
+# unittests for the process-wide pool of tango device proxies
+#
+import unittest
+import sys
+import time
+
+from nxswriter.TangoSource import TgProxyPool
+from nxswriter.TangoSource import TgDeviceHealth
+
+
+# test fixture
+class TgProxyPoolTest(unittest.TestCase):
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgProxyPool()
+        self.assertEqual(el.maxsize, 256)
+        self.assertEqual(el.idletime, 3600.)
+        self.assertEqual(len(el), 0)
+
+        el = TgProxyPool(3, 2.)
+        self.assertEqual(el.maxsize, 3)
+        self.assertEqual(el.idletime, 2.)
+
+    # normalize test
+    # \brief It tests keys of device names
+    def test_normalize(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        self.assertEqual(TgProxyPool.normalize("p/m/1"), "p/m/1")
+        self.assertEqual(TgProxyPool.normalize("P/M/1 "), "p/m/1")
+        self.assertEqual(
+            TgProxyPool.normalize("tango://Haso:10000/p/m/1"),
+            "haso:10000/p/m/1")
+        self.assertEqual(TgProxyPool.normalize(b"p/M/1"), "p/m/1")
+
+    # get/put test
+    # \brief It tests storing proxies
+    def test_get_put(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgProxyPool()
+        dp = object()
+        self.assertEqual(el.get("p/m/1"), None)
+        el.put("p/m/1", dp)
+        self.assertTrue(el.get("P/M/1") is dp)
+        self.assertTrue(el.get("tango://p/m/1") is dp)
+        dp2 = object()
+        el.put("p/m/1", dp2)
+        self.assertTrue(el.get("p/m/1") is dp2)
+        self.assertEqual(len(el), 1)
+
+        el.remove("p/m/1", dp)
+        self.assertTrue(el.get("p/m/1") is dp2)
+        el.remove("p/m/1", dp2)
+        self.assertEqual(el.get("p/m/1"), None)
+        el.put("p/m/1", dp)
+        el.remove("p/m/1")
+        self.assertEqual(len(el), 0)
+
+    # eviction test
+    # \brief It tests removing the least recently used proxies
+    def test_maxsize(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgProxyPool(2)
+        dps = [object() for _ in range(3)]
+        el.put("p/m/0", dps[0])
+        el.put("p/m/1", dps[1])
+        self.assertTrue(el.get("p/m/0") is dps[0])
+        el.put("p/m/2", dps[2])
+        self.assertEqual(len(el), 2)
+        self.assertEqual(el.get("p/m/1"), None)
+        self.assertTrue(el.get("p/m/0") is dps[0])
+        self.assertTrue(el.get("p/m/2") is dps[2])
+
+    # eviction test
+    # \brief It tests removing idle proxies
+    def test_idletime(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgProxyPool(idletime=0.1)
+        dp = object()
+        el.put("p/m/0", dp)
+        el.put("p/m/1", object())
+        time.sleep(0.06)
+        self.assertTrue(el.get("p/m/0") is dp)
+        time.sleep(0.06)
+        self.assertTrue(el.get("p/m/0") is dp)
+        self.assertEqual(len(el), 1)
+        time.sleep(0.12)
+        self.assertEqual(el.get("p/m/0"), None)
+
+    # markFailed test
+    # \brief It tests removing failed proxies from the process pool
+    def test_markFailed(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        from nxswriter.TangoSource import ProxyTools
+        ProxyTools.proxies.clear()
+        dp = object()
+        ProxyTools.proxies.put("p/m/1", dp)
+        hl = TgDeviceHealth("p/m/1", dp)
+        hl.markFailed(object())
+        self.assertTrue(ProxyTools.proxies.get("p/m/1") is dp)
+        hl.markFailed(dp)
+        self.assertEqual(ProxyTools.proxies.get("p/m/1"), None)
+        self.assertEqual(hl.proxy, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
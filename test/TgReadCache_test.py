@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file TgReadCacheTest.py
+# unittests for tango reads shared by datasources of one pool run
+#
+import unittest
+import sys
+import threading
+import time
+
+import numpy
+
+from nxswriter.TangoSource import TgReadCache
+from nxswriter.DataSourcePool import DataSourcePool
+
+
+# test fixture
+class TgReadCacheTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+        self._calls = 0
+
+    # read counting its calls
+    # \returns data dictionary
+    def read(self):
+        self._calls += 1
+        return {"rank": "SCALAR", "value": self._calls,
+                "tangoDType": "DevLong64", "shape": [1, 0]}
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        self._calls = 0
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgReadCache()
+        self.assertEqual(el.reads, 0)
+        self.assertEqual(el.shared, 0)
+        dp = DataSourcePool()
+        self.assertTrue(isinstance(dp.tangoreads, TgReadCache))
+        self.assertEqual(dp.inputworkers, None)
+
+    # fetch test
+    # \brief It tests sharing reads within one run
+    def test_fetch(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgReadCache()
+        key = ("p/m/1", "attribute", "Position", None)
+        dt = el.fetch(key, self.read)
+        dt2 = el.fetch(key, self.read)
+        self.assertEqual(dt, dt2)
+        self.assertTrue(dt is not dt2)
+        self.assertEqual(
+            el.fetch(("p/m/2", "attribute", "Position", None),
+                     self.read)["value"], 2)
+        self.assertEqual(self._calls, 2)
+        self.assertEqual(el.reads, 2)
+        self.assertEqual(el.shared, 1)
+
+        el.start()
+        self.assertEqual(el.fetch(key, self.read)["value"], 3)
+
+        dp = DataSourcePool()
+        dp.tangoreads.fetch(key, self.read)
+        dp.startRun()
+        self.assertEqual(dp.tangoreads.fetch(key, self.read)["value"], 5)
+
+    # fetch test
+    # \brief It tests sharing of array values
+    def test_fetch_array(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgReadCache()
+        key = ("p/m/1", "attribute", "Spectrum", None)
+        dt = el.fetch(key, lambda: {"rank": "SPECTRUM",
+                                    "value": numpy.arange(3),
+                                    "tangoDType": "DevLong64",
+                                    "shape": [3, 0]})
+        dt2 = el.fetch(key, self.read)
+        self.assertTrue(dt["value"] is dt2["value"])
+        self.assertFalse(dt["value"].flags.writeable)
+
+        def double():
+            dt2["value"] *= 2
+
+        self.assertRaises(ValueError, double)
+        self.assertEqual(dt["value"].tolist(), [0, 1, 2])
+
+    # fetch test
+    # \brief It tests failing reads
+    def test_fetch_error(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        def fail():
+            self._calls += 1
+            raise ValueError("lost")
+
+        el = TgReadCache()
+        key = ("p/m/1", "attribute", "Position", None)
+        self.assertRaises(ValueError, el.fetch, key, fail)
+        self.assertRaises(ValueError, el.fetch, key, fail)
+        self.assertEqual(self._calls, 2)
+        self.assertEqual(el.fetch(key, self.read)["value"], 3)
+        self.assertEqual(el.fetch(key, fail)["value"], 3)
+        key = ("p/m/1", "property", "Pos", None)
+        self.assertEqual(el.fetch(key, lambda: None), None)
+        self.assertEqual(el.fetch(key, self.read), None)
+
+    # fetch test
+    # \brief It tests concurrent reads of one member
+    def test_fetch_threads(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = TgReadCache()
+        results = []
+
+        def slow():
+            time.sleep(0.1)
+            return self.read()
+
+        def fetch():
+            results.append(el.fetch(("p/m/1", "attribute", "Pos", None),
+                                    slow))
+
+        threads = [threading.Thread(target=fetch) for _ in range(6)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        self.assertEqual(self._calls, 1)
+        self.assertEqual([dt["value"] for dt in results], [1] * 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
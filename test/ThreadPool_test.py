@@ -29,6 +29,7 @@ import time
 import json
 
 from nxswriter.ThreadPool import ThreadPool
+from nxswriter.WorkerPool import WorkerPool
 from nxswriter.Errors import ThreadError
 
 
@@ -135,6 +136,22 @@ class SOJob(object):
         self.counter += 1
 
 
+# class job writing blocks of steps
+class BJob(Job):
+
+    # writeBatch method
+    def writeBatch(self):
+        self.counter += 10
+
+
+# class job with a write-behind buffer
+class FJob(Job):
+
+    # flushBuffer method
+    def flushBuffer(self):
+        self.counter += 100
+
+
 # job without run method
 class WJob(object):
     # contructor
@@ -243,6 +260,87 @@ class ThreadPoolTest(unittest.TestCase):
         for c in jlist:
             self.assertEqual(c.counter, 5)
 
+    # workers test
+    # \brief It tests running with long-lived workers
+    def test_run_workers(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        nth = self.__rnd.randint(1, 10)
+        workers = WorkerPool(nth)
+        el = ThreadPool(nth)
+        el2 = ThreadPool(nth)
+        self.assertEqual(el.workers, None)
+        el.workers = workers
+        el2.workers = workers
+
+        jlist = [Job() for c in range(self.__rnd.randint(1, 20))]
+        jlist2 = [SOJob() for c in range(self.__rnd.randint(1, 20))]
+        for jb in jlist:
+            self.assertEqual(el.append(jb), None)
+        for jb in jlist2:
+            self.assertEqual(el2.append(jb), None)
+
+        for i in range(5):
+            self.assertEqual(el.runAndWait(), None)
+            self.assertEqual(el2.run(), None)
+            self.assertEqual(el2.join(), None)
+            for c in jlist + jlist2:
+                self.assertEqual(c.counter, i + 1)
+        self.assertTrue(workers.size <= nth)
+
+        ejlist = [EJob() for c in range(self.__rnd.randint(1, 20))]
+        el3 = ThreadPool(nth)
+        el3.workers = workers
+        for jb in ejlist:
+            self.assertEqual(el3.append(jb), None)
+        self.assertEqual(el3.runAndWait(), None)
+        self.myAssertRaise(ThreadError, el3.checkErrors)
+        for jb in ejlist:
+            jb.canfail = True
+        self.assertEqual(el3.runAndWait(), None)
+        el3.checkErrors()
+        for jb in ejlist:
+            self.assertEqual(jb.counter, 2)
+            self.assertEqual(jb.markfail, 1)
+
+        workers.close()
+        self.assertEqual(el.runAndWait(), None)
+        for c in jlist:
+            self.assertEqual(c.counter, 6)
+
+    # split test
+    # \brief It tests splitting of the pool
+    def test_split(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        nth = self.__rnd.randint(1, 10)
+        workers = WorkerPool(nth)
+        el = ThreadPool(nth)
+        el.workers = workers
+        el.serialWrite = False
+        jlist = [BJob() if self.__rnd.randint(0, 1) else Job()
+                 for c in range(self.__rnd.randint(1, 20))]
+        for jb in jlist:
+            el.append(jb)
+
+        sel, oth = el.split(lambda jb: isinstance(jb, BJob))
+        for pl in [sel, oth]:
+            self.assertTrue(isinstance(pl, ThreadPool))
+            self.assertEqual(pl.numberOfThreads, nth)
+            self.assertEqual(pl.workers, workers)
+            self.assertEqual(pl.serialWrite, False)
+        self.assertEqual(oth.runAndWait(), None)
+        self.assertEqual(sel.writeBatch(), None)
+        sel.checkErrors()
+        for jb in jlist:
+            self.assertEqual(jb.counter, 10 if isinstance(jb, BJob) else 1)
+        self.assertEqual(el.runAndWait(), None)
+        for jb in jlist:
+            self.assertEqual(jb.counter, 11 if isinstance(jb, BJob) else 2)
+        workers.close()
+
     # constructor test
     # \brief It tests default settings
     def test_errors(self):
@@ -317,6 +415,28 @@ class ThreadPoolTest(unittest.TestCase):
         for jb in jlist:
             self.assertEqual(jb.markfail, 1)
 
+    # flushBuffers test
+    # \brief It tests that only errors of the flush are reported
+    def test_flushBuffers_errors(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = ThreadPool(2)
+        ejob = EJob()
+        ejob.canfail = True
+        fjob = FJob()
+        el.append(ejob)
+        el.append(fjob)
+        el.runAndWait()
+        el.checkErrors()
+        self.assertEqual(ejob.markfail, 1)
+
+        el.flushBuffers()
+        self.assertEqual(fjob.counter, 101)
+        self.assertEqual(ejob.error, None)
+        el.checkErrors()
+        self.assertEqual(ejob.markfail, 1)
+
     # constructor test
     # \brief It tests default settings
     def test_setJSON(self):
@@ -361,6 +481,34 @@ class ThreadPoolTest(unittest.TestCase):
             self.assertEqual(jb.source.gjson, gjson)
             self.assertEqual(jb.source.ljson, ljson)
 
+    # updateJSON test
+    # \brief It tests skipping datasources reading the JSON context
+    def test_updateJSON(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+        gjson = json.loads('{"data":{"a":"1"}}')
+        ljson = json.loads('{"data":{"n":2}}')
+
+        el = ThreadPool(4)
+        jlist = [SOJob() for c in range(6)]
+        for i, jb in enumerate(jlist):
+            if i % 2:
+                jb.source.usesJSONContext = lambda: True
+            self.assertEqual(el.append(jb), None)
+
+        self.assertEqual(el.updateJSON(gjson, ljson), el)
+        for i, jb in enumerate(jlist):
+            self.assertEqual(jb.source.gjson, None if i % 2 else gjson)
+            self.assertEqual(jb.source.ljson, None if i % 2 else ljson)
+
+        jb = SOJob()
+        el.append(jb)
+        self.assertEqual(el.updateJSON(gjson), el)
+        self.assertEqual(jb.source.gjson, gjson)
+        self.assertEqual(jb.source.ljson, None)
+        self.assertEqual(jlist[0].source.ljson, None)
+        self.assertEqual(jlist[1].source.gjson, None)
+
     # constructor test
     # \brief It tests default settings
     def test_close(self):
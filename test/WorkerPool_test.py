@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+#   This file is part of nexdatas - Tango Server for NeXus data writer
+#
+#    Copyright (C) 2012-2017 DESY, Jan Kotanski <jkotan@mail.desy.de>
+#
+#    nexdatas is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    nexdatas is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with nexdatas.  If not, see <http://www.gnu.org/licenses/>.
+# \package test nexdatas
+# \file WorkerPoolTest.py
+# unittests for long-lived worker threads
+#
+import unittest
+import os
+import sys
+import random
+import binascii
+import time
+import threading
+
+from nxswriter.WorkerPool import WorkerPool, WorkerBatch, WorkerThread
+
+
+if sys.version_info > (3,):
+    long = int
+
+
+# class job
+class Job(object):
+    # contructor
+
+    def __init__(self):
+        # counter
+        self.counter = 0
+        # error
+        self.error = None
+        # names of threads which run the job
+        self.threads = []
+
+    # run method
+    def run(self):
+        self.counter += 1
+        self.threads.append(threading.current_thread().name)
+
+
+# class job raising an exception
+class RJob(object):
+    # contructor
+
+    def __init__(self):
+        # counter
+        self.counter = 0
+        # error
+        self.error = None
+
+    # run method
+    def run(self):
+        self.counter += 1
+        raise Exception("My Error")
+
+
+# class slow job
+class SJob(Job):
+
+    # run method
+    def run(self):
+        time.sleep(0.01)
+        Job.run(self)
+
+
+# class job with separate fetch and write phases
+class PJob(object):
+    # contructor
+
+    def __init__(self, index, written, fail=False):
+        # index
+        self.index = index
+        # list with indices of written jobs
+        self.written = written
+        # fetch raises an exception
+        self.fail = fail
+        # error
+        self.error = None
+        # names of threads which write the job
+        self.writers = []
+
+    # run method
+    def run(self):
+        self.fetch()
+        self.write()
+
+    # fetch method
+    def fetch(self):
+        time.sleep(0.001 * (self.index % 3))
+        if self.fail:
+            raise Exception("My Error")
+
+    # write method
+    def write(self):
+        self.written.append(self.index)
+        self.writers.append(threading.current_thread().name)
+
+
+# test fixture
+class WorkerPoolTest(unittest.TestCase):
+
+    # constructor
+    # \param methodName name of the test method
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+        try:
+            self.__seed = long(binascii.hexlify(os.urandom(16)), 16)
+        except NotImplementedError:
+            self.__seed = long(time.time() * 256)  # use fractional seconds
+
+        self.__rnd = random.Random(self.__seed)
+
+    # test starter
+    # \brief Common set up
+    def setUp(self):
+        print("\nsetting up...")
+        print("SEED = %s" % self.__seed)
+
+    # test closer
+    # \brief Common tear down
+    def tearDown(self):
+        print("tearing down ...")
+
+    # constructor test
+    # \brief It tests default settings
+    def test_constructor(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        nth = self.__rnd.randint(1, 10)
+        el = WorkerPool(nth)
+        self.assertEqual(el.numberOfThreads, nth)
+        self.assertEqual(el.size, 0)
+        self.assertTrue(el.running)
+        el.close()
+        self.assertTrue(not el.running)
+
+        el = WorkerPool()
+        self.assertEqual(el.numberOfThreads, -1)
+        el.close()
+
+    # batch test
+    # \brief It tests the batch counter
+    def test_batch(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        size = self.__rnd.randint(1, 10)
+        bt = WorkerBatch(size)
+        self.assertTrue(not bt.isDone())
+        self.assertTrue(not bt.wait(0.001))
+        for _ in range(size):
+            bt.done()
+        self.assertTrue(bt.isDone())
+        self.assertTrue(bt.wait())
+        self.assertTrue(WorkerBatch(0).wait())
+
+    # submit test
+    # \brief It tests if threads are reused between runs
+    def test_submit_reuse(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        nth = self.__rnd.randint(1, 10)
+        el = WorkerPool(nth)
+        jlist = [Job() for c in range(self.__rnd.randint(1, 20))]
+        nrun = self.__rnd.randint(2, 10)
+        for i in range(nrun):
+            bt = el.submit(jlist)
+            self.assertTrue(isinstance(bt, WorkerBatch))
+            self.assertTrue(bt.wait())
+            for c in jlist:
+                self.assertEqual(c.counter, i + 1)
+
+        size = el.size
+        self.assertEqual(size, min(nth, len(jlist)))
+        threads = set()
+        for c in jlist:
+            threads.update(c.threads)
+        self.assertTrue(len(threads) <= size)
+        el.close()
+        self.assertEqual(el.size, 0)
+        self.myAssertRaise(RuntimeError, el.submit, jlist)
+
+    # submit test
+    # \brief It tests unlimited number of threads
+    def test_submit_unlimited(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = WorkerPool()
+        jlist = [SJob() for c in range(self.__rnd.randint(1, 20))]
+        self.assertTrue(el.submit(jlist).wait())
+        self.assertTrue(el.size <= len(jlist))
+        for c in jlist:
+            self.assertEqual(c.counter, 1)
+        el.close()
+
+    # submit test
+    # \brief It tests if exceptions do not stop worker threads
+    def test_submit_exception(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = WorkerPool(1)
+        jlist = [RJob() for c in range(self.__rnd.randint(1, 20))]
+        self.assertTrue(el.submit(jlist).wait())
+        for c in jlist:
+            self.assertEqual(c.counter, 1)
+            self.assertEqual(c.error, "My Error")
+        jlist = [Job() for c in range(self.__rnd.randint(1, 20))]
+        self.assertTrue(el.submit(jlist).wait())
+        for c in jlist:
+            self.assertEqual(c.counter, 1)
+            self.assertEqual(c.error, None)
+        el.close()
+
+    # submit test
+    # \brief It tests fetching in workers and serialized writing
+    def test_submit_serial_write(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        el = WorkerPool(self.__rnd.randint(2, 10))
+        for _ in range(self.__rnd.randint(2, 5)):
+            written = []
+            njobs = self.__rnd.randint(2, 30)
+            failed = set(self.__rnd.sample(range(njobs),
+                                           self.__rnd.randint(0, njobs)))
+            jlist = [PJob(i, written, i in failed) for i in range(njobs)]
+            jlist.append(Job())
+            self.assertTrue(el.submit(jlist, serialWrite=True).wait())
+            self.assertEqual(
+                written, [i for i in range(njobs) if i not in failed])
+            writers = set()
+            for c in jlist[:-1]:
+                writers.update(c.writers)
+                if c.index in failed:
+                    self.assertEqual(c.error, "My Error")
+                else:
+                    self.assertEqual(c.error, None)
+            self.assertTrue(len(writers) <= 1)
+            self.assertEqual(jlist[-1].counter, 1)
+        el.close()
+
+    # thread test
+    # \brief It tests the worker thread
+    def test_thread(self):
+        fun = sys._getframe().f_code.co_name
+        print("Run: %s.%s() " % (self.__class__.__name__, fun))
+
+        index = self.__rnd.randint(1, 1000)
+        el = WorkerThread(index, None)
+        self.assertEqual(el.index, index)
+        self.assertTrue(isinstance(el, threading.Thread))
+        self.assertTrue(el.daemon)
+
+    # Exception tester
+    # \param exception expected exception
+    # \param method called method
+    # \param args list with method arguments
+    # \param kwargs dictionary with method arguments
+    def myAssertRaise(self, exception, method, *args, **kwargs):
+        try:
+            error = False
+            method(*args, **kwargs)
+        except exception:
+            error = True
+        self.assertEqual(error, True)
+
+
+if __name__ == '__main__':
+    unittest.main()
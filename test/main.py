@@ -78,6 +78,19 @@ import DecoderPool_test
 import DataHolder_test
 import ElementThread_test
 import ThreadPool_test
+import WorkerPool_test
+import ChunkPlanner_test
+import TgInterfaceCache_test
+import TgDeviceHealth_test
+import TgGroupIsolated_test
+import TgProxyPool_test
+import DBConnectionPool_test
+import DBQueryCache_test
+import PyEvalCodeCache_test
+import TgReadCache_test
+import TgEventCache_test
+import JSONDecoder_test
+import PreallocatedField_test
 import FetchNameHandler_test
 import InnerXMLParser_test
 import TNObject_test
@@ -123,6 +136,9 @@ if H5PY_AVAILABLE:
     import EDocH5PY_test
     import NexusXMLHandlerH5PY_test
     import ClientFieldTagWriterH5PY_test
+    import ClientFieldTagBatchH5PY_test
+    import ClientFieldTagBufferH5PY_test
+    import ClientFieldTagPreallocH5PY_test
     import XMLFieldTagWriterH5PY_test
     import EDimH5PY_test
     import ESymbolH5PY_test
@@ -290,6 +306,7 @@ if PYTANGO_AVAILABLE:
         import XMLFieldTagServerH5PY_test
         import TangoFieldTagAsynchH5PY_test
         import ClientFieldTagAsynchH5PY_test
+        import ClientFieldTagPipelineH5PY_test
         import XMLFieldTagAsynchH5PY_test
         import NXSDataWriterH5PY_test
         import PyEvalTangoSourceH5PY_test
@@ -377,6 +394,32 @@ def main():
         unittest.defaultTestLoader.loadTestsFromModule(ElementThread_test))
     suite.addTests(
         unittest.defaultTestLoader.loadTestsFromModule(ThreadPool_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(WorkerPool_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(ChunkPlanner_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(TgInterfaceCache_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(TgDeviceHealth_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(TgGroupIsolated_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(TgProxyPool_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(DBConnectionPool_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(DBQueryCache_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(PyEvalCodeCache_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(TgReadCache_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(TgEventCache_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(JSONDecoder_test))
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromModule(PreallocatedField_test))
     suite.addTests(
         unittest.defaultTestLoader.loadTestsFromModule(FetchNameHandler_test))
     suite.addTests(
@@ -465,6 +508,15 @@ def main():
         suite.addTests(
             unittest.defaultTestLoader.loadTestsFromModule(
                 ClientFieldTagWriterH5PY_test))
+        suite.addTests(
+            unittest.defaultTestLoader.loadTestsFromModule(
+                ClientFieldTagBatchH5PY_test))
+        suite.addTests(
+            unittest.defaultTestLoader.loadTestsFromModule(
+                ClientFieldTagBufferH5PY_test))
+        suite.addTests(
+            unittest.defaultTestLoader.loadTestsFromModule(
+                ClientFieldTagPreallocH5PY_test))
         suite.addTests(
             unittest.defaultTestLoader.loadTestsFromModule(
                 XMLFieldTagWriterH5PY_test))
@@ -644,6 +696,9 @@ def main():
             suite.addTests(
                 unittest.defaultTestLoader.loadTestsFromModule(
                     ClientFieldTagAsynchH5PY_test))
+            suite.addTests(
+                unittest.defaultTestLoader.loadTestsFromModule(
+                    ClientFieldTagPipelineH5PY_test))
             suite.addTests(
                 unittest.defaultTestLoader.loadTestsFromModule(
                     XMLFieldTagServerH5PY_test))